@@ -0,0 +1,53 @@
+# accounts/authentication.py
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .models import AuthToken
+from .users import USER_RELATED, cached_user
+
+
+class BearerTokenAuthentication(TokenAuthentication):
+    """Authenticate ``Authorization: Bearer <key>`` against ``AuthToken``.
+
+    Unlike ``BasicAuthentication`` this never runs the password hasher: the
+    key is resolved with one indexed lookup on its SHA-256 digest, which
+    also joins in the user and their profiles.
+    """
+
+    keyword = "Bearer"
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        try:
+            token = AuthToken.objects.select_related(
+                "user", *(f"user__{name}" for name in USER_RELATED)
+            ).get(digest=AuthToken.digest_for(key))
+        except AuthToken.DoesNotExist:
+            raise exceptions.AuthenticationFailed("Invalid token.")
+
+        if token.revoked_at is not None:
+            raise exceptions.AuthenticationFailed("Token has been revoked.")
+        if token.expires_at <= timezone.now():
+            raise exceptions.AuthenticationFailed("Token has expired.")
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+
+        return (token.user, token)
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose per-request user load comes from accounts.users.
+
+    Session requests get the user and profiles from the short-lived user
+    cache instead of querying on every request.
+    """
+
+    def get_user(self, user_id):
+        user = cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        return await sync_to_async(self.get_user)(user_id)
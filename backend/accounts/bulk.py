@@ -0,0 +1,133 @@
+# accounts/bulk.py
+"""Bulk registration, used to onboard a whole cooperative in one call.
+
+Compared to calling ``RegisterView`` once per member this does the
+uniqueness checks with two set-based queries, hashes passwords in a process
+pool and inserts ``User`` / ``UserProfile`` rows with ``bulk_create``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from .hashing import hash_passwords
+from .models import UserProfile
+from .serializers import RegisterSerializer
+
+PROFILE_FIELDS = [
+    "identity_number",
+    "npwp",
+    "full_address",
+    "phone",
+    "mother_name",
+    "domicile",
+    "birth_place",
+]
+
+
+class BulkRegisterRowSerializer(RegisterSerializer):
+    """Field validation only; uniqueness is checked for the whole batch."""
+
+    def validate(self, attrs):
+        return attrs
+
+
+def bulk_register(rows: list[dict[str, Any]], workers: int | None = None) -> list[dict[str, Any]]:
+    """Register every valid row and return one result dict per input row."""
+    results: list[dict[str, Any] | None] = [None] * len(rows)
+    valid: list[tuple[int, dict[str, Any]]] = []
+    for index, row in enumerate(rows):
+        serializer = BulkRegisterRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {"index": index, "status": "error", "errors": serializer.errors}
+
+    taken_usernames = set(
+        User.objects.filter(username__in=[data["username"] for _, data in valid])
+        .values_list("username", flat=True)
+    )
+    taken_emails = set(
+        User.objects.filter(email__in=[data["email"] for _, data in valid])
+        .values_list("email", flat=True)
+    )
+
+    accepted: list[tuple[int, dict[str, Any]]] = []
+    for index, data in valid:
+        errors = []
+        if data["username"] in taken_usernames:
+            errors.append("Username already taken.")
+        if data["email"] in taken_emails:
+            errors.append("Email already registered.")
+        if errors:
+            results[index] = {"index": index, "status": "error", "errors": {"non_field_errors": errors}}
+            continue
+        # later duplicates inside the same payload lose
+        taken_usernames.add(data["username"])
+        taken_emails.add(data["email"])
+        accepted.append((index, data))
+
+    if accepted:
+        hashed = hash_passwords([data["password"] for _, data in accepted], workers=workers)
+        try:
+            users = _insert(accepted, hashed)
+        except IntegrityError:
+            # someone registered one of these names between our check and insert
+            for index, _ in accepted:
+                results[index] = {
+                    "index": index,
+                    "status": "error",
+                    "errors": {"non_field_errors": ["Conflicting registration, please retry."]},
+                }
+        else:
+            for (index, data), user in zip(accepted, users):
+                results[index] = {
+                    "index": index,
+                    "status": "created",
+                    "id": user.pk,
+                    "username": user.username,
+                    "role": data["role"],
+                }
+    return results
+
+
+def _insert(accepted, hashed) -> list[User]:
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=data["username"],
+                    email=data["email"],
+                    password=password_hash,
+                    first_name=data["full_name"],
+                )
+                for (_, data), password_hash in zip(accepted, hashed)
+            ],
+            batch_size=500,
+        )
+        if users and users[0].pk is None:
+            # backends without RETURNING support (MySQL): look the ids up
+            ids = dict(
+                User.objects.filter(username__in=[user.username for user in users])
+                .values_list("username", "pk")
+            )
+            for user in users:
+                user.pk = ids[user.username]
+
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(
+                    user=user,
+                    role=data["role"],
+                    identity_type=data.get("identity_type"),
+                    birth_date=data.get("birth_date"),
+                    **{field: data.get(field, "") for field in PROFILE_FIELDS},
+                )
+                for (_, data), user in zip(accepted, users)
+            ],
+            batch_size=500,
+        )
+    return users
@@ -0,0 +1,50 @@
+# accounts/hashing.py
+"""Password hashing spread over a process pool.
+
+PBKDF2 is deliberately CPU-bound and holds the GIL, so threads do not help;
+separate processes do. This module imports nothing from the ORM so it stays
+cheap to load in spawned workers.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+
+def _init_worker(settings_module: str) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+
+def _hash(raw_password: str) -> str:
+    from django.contrib.auth.hashers import make_password
+
+    return make_password(raw_password)
+
+
+def hash_passwords(passwords: list[str], workers: int | None = None) -> list[str]:
+    """Return ``make_password`` for each password, in order.
+
+    Falls back to hashing inline when only one worker is available or the
+    batch is too small to pay for starting the pool.
+    """
+    if workers is None:
+        workers = getattr(settings, "BULK_REGISTER_HASH_WORKERS", None) or os.cpu_count() or 1
+    min_rows = getattr(settings, "BULK_REGISTER_POOL_MIN_ROWS", 8)
+    if workers <= 1 or len(passwords) < min_rows:
+        return [_hash(password) for password in passwords]
+
+    settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings")
+    # spawn, not fork: the parent may already run threads (session sweeper)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(passwords)),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(settings_module,),
+    ) as pool:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(_hash, passwords, chunksize=chunksize))
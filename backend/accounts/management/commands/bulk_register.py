@@ -0,0 +1,38 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk import bulk_register
+
+
+class Command(BaseCommand):
+    help = "Register many users from a JSON (list of objects) or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSON or CSV file with one user per row")
+        parser.add_argument("--workers", type=int, default=None, help="password hashing processes")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+
+        if path.suffix.lower() == ".csv":
+            with path.open(newline="", encoding="utf-8") as handle:
+                rows = [
+                    {key: value for key, value in row.items() if value not in (None, "")}
+                    for row in csv.DictReader(handle)
+                ]
+        else:
+            rows = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(rows, list):
+                raise CommandError("JSON file must contain a list of users")
+
+        results = bulk_register(rows, workers=options["workers"])
+        created = sum(1 for result in results if result["status"] == "created")
+        for result in results:
+            if result["status"] != "created":
+                self.stderr.write(f"row {result['index']}: {json.dumps(result['errors'])}")
+        self.stdout.write(self.style.SUCCESS(f"Created {created} of {len(results)} users"))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:50
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_authtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=blobs.storage.get_blob_storage, upload_to='profile_photos/'),
+        ),
+    ]
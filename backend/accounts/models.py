@@ -1,6 +1,13 @@
 # accounts/models.py
+import hashlib
+import secrets
+from datetime import timedelta
+
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from blobs.storage import get_blob_storage
 
 class UserProfile(models.Model):
     ROLE_CHOICES = [
@@ -31,7 +38,66 @@ class UserProfile(models.Model):
     domicile = models.CharField(max_length=100, blank=True)
     birth_place = models.CharField(max_length=100, blank=True)
     birth_date = models.DateField(null=True, blank=True)
-    photo = models.ImageField(upload_to="profile_photos/", null=True, blank=True)
+    photo = models.ImageField(
+        upload_to="profile_photos/",
+        storage=get_blob_storage,
+        null=True,
+        blank=True,
+    )
 
     def __str__(self):
         return f"{self.user.username} ({self.role})"
+
+
+class AuthToken(models.Model):
+    """Bearer token issued by ``LoginView``.
+
+    Only the SHA-256 digest of the key is stored, so a leaked table does not
+    leak usable credentials. Keys are 256-bit random strings, which is why a
+    single indexed digest lookup is enough (no slow password hash needed).
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="auth_tokens",
+    )
+    digest = models.CharField(max_length=64, unique=True)
+    prefix = models.CharField(max_length=8)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    @staticmethod
+    def digest_for(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def issue(cls, user, ttl_seconds: int | None = None) -> tuple["AuthToken", str]:
+        """Create a token for ``user`` and return it with the raw key (shown once)."""
+        if ttl_seconds is None:
+            ttl_seconds = getattr(settings, "AUTH_TOKEN_TTL_SECONDS", 7 * 24 * 3600)
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(
+            user=user,
+            digest=cls.digest_for(key),
+            prefix=key[:8],
+            expires_at=timezone.now() + timedelta(seconds=ttl_seconds),
+        )
+        return token, key
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at <= timezone.now()
+
+    @property
+    def is_revoked(self) -> bool:
+        return self.revoked_at is not None
+
+    def revoke(self) -> None:
+        if self.revoked_at is None:
+            self.revoked_at = timezone.now()
+            self.save(update_fields=["revoked_at"])
+
+    def __str__(self):
+        return f"{self.prefix}… ({self.user_id})"
@@ -0,0 +1,171 @@
+# accounts/photos.py
+"""Profile photo handling: size cap and resized avatar variants.
+
+Uploads are handed to storage as the ``UploadedFile`` itself, which storage
+writes chunk by chunk (large uploads are already spooled to a temp file by
+Django), so a photo is never read into memory in one piece.
+
+The size cap is enforced twice: ``check_request_size`` rejects a too-large
+``Content-Length`` up front, and :class:`SizeLimitUploadHandler` stops
+parsing as soon as a file grows past the cap, which also covers chunked
+bodies that have no ``Content-Length``.
+
+Square thumbnails in WebP and JPEG are rendered by a small thread pool after
+the upload returns. Their URLs are deterministic, so the response can list
+them straight away; until a variant exists the client should fall back to
+``photoUrl``.
+"""
+
+from __future__ import annotations
+
+import logging
+import posixpath
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+logger = logging.getLogger(__name__)
+
+VARIANT_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class PhotoTooLarge(Exception):
+    pass
+
+
+def max_photo_bytes() -> int:
+    return getattr(settings, "PROFILE_PHOTO_MAX_BYTES", 5 * 1024 * 1024)
+
+
+def variant_sizes() -> list[int]:
+    return list(getattr(settings, "PROFILE_PHOTO_VARIANT_SIZES", [40, 96, 256]))
+
+
+def check_request_size(request) -> None:
+    """Reject obviously oversized bodies before Django parses the upload."""
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    # multipart framing adds a little on top of the file itself
+    if length > max_photo_bytes() + 64 * 1024:
+        raise PhotoTooLarge()
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """First upload handler: aborts the upload once a file passes the cap."""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.exceeded = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > max_photo_bytes():
+            self.exceeded = True
+            # stop reading the body instead of spooling the rest of it
+            raise StopUpload(connection_reset=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def limit_upload_size(request) -> SizeLimitUploadHandler:
+    """Install the size cap on ``request``; call before its body is parsed."""
+    handler = SizeLimitUploadHandler(request)
+    request.upload_handlers.insert(0, handler)
+    return handler
+
+
+def check_upload_size(uploaded_file) -> None:
+    if uploaded_file.size is not None and uploaded_file.size > max_photo_bytes():
+        raise PhotoTooLarge()
+
+
+def variant_name(name: str, size: int, fmt: str) -> str:
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, "variants", f"{stem}_{size}.{fmt}")
+
+
+def variant_urls(storage, name: str, build_url=None) -> dict[str, dict[str, str]]:
+    """``{"40": {"webp": url, "jpeg": url}, ...}`` for a stored photo name."""
+    build_url = build_url or (lambda url: url)
+    storage = _variant_storage(storage)
+    return {
+        str(size): {
+            fmt: build_url(storage.url(variant_name(name, size, fmt)))
+            for fmt in VARIANT_FORMATS
+        }
+        for size in variant_sizes()
+    }
+
+
+def generate_variants(storage, name: str) -> list[str]:
+    """Render every size/format variant of ``name``; return the stored names."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with storage.open(name, "rb") as source:
+            image = Image.open(source)
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (UnidentifiedImageError, OSError):
+        logger.warning("Cannot build variants for %s: not a readable image", name)
+        return []
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    saved = []
+    storage = _variant_storage(storage)
+    for size in variant_sizes():
+        thumb = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for fmt, pil_format in VARIANT_FORMATS.items():
+            target = variant_name(name, size, fmt)
+            frame = thumb.convert("RGB") if pil_format == "JPEG" else thumb
+            buffer = BytesIO()
+            frame.save(buffer, pil_format, quality=82, optimize=True)
+            if storage.exists(target):
+                storage.delete(target)
+            saved.append(storage.save(target, ContentFile(buffer.getvalue())))
+    return saved
+
+
+def _variant_storage(storage):
+    # content-addressed storage would rename variants after their own digest
+    return getattr(storage, "variant_storage", storage)
+
+
+def schedule_variants(storage, name: str) -> Future | None:
+    """Queue variant generation; runs inline when PROFILE_PHOTO_VARIANTS_SYNC."""
+    if getattr(settings, "PROFILE_PHOTO_VARIANTS_SYNC", False):
+        generate_variants(storage, name)
+        return None
+    return _get_executor().submit(_generate_logged, storage, name)
+
+
+def _generate_logged(storage, name):
+    try:
+        return generate_variants(storage, name)
+    except Exception:
+        logger.exception("Variant generation failed for %s", name)
+        raise
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PROFILE_PHOTO_VARIANT_WORKERS", 2),
+                thread_name_prefix="photo-variants",
+            )
+    return _executor
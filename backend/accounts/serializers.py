@@ -1,6 +1,6 @@
 # accounts/serializers.py
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate
+from django.db.models import Q
 from rest_framework import serializers
 
 from .models import UserProfile
@@ -73,16 +73,22 @@ class LoginSerializer(serializers.Serializer):
         password = attrs["password"]
 
         # boleh login pake username atau email
-        user = (
-            User.objects.filter(username=identifier).first()
-            or User.objects.filter(email=identifier).first()
+        # single query; a username match wins over an email match
+        candidates = list(
+            User.objects.select_related("profile")
+            .filter(Q(username=identifier) | Q(email=identifier))
+            .order_by("pk")
+        )
+        user = next(
+            (candidate for candidate in candidates if candidate.username == identifier),
+            candidates[0] if candidates else None,
         )
 
         if not user:
             raise serializers.ValidationError("User not found.")
 
-        user = authenticate(username=user.username, password=password)
-        if not user:
+        # check the hash directly: authenticate() would fetch the user again
+        if not user.is_active or not user.check_password(password):
             raise serializers.ValidationError("Invalid credentials.")
 
         attrs["user"] = user
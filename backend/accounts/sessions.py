@@ -0,0 +1,218 @@
+# accounts/sessions.py
+"""Database-backed session engine with an in-process read cache.
+
+Enable with ``SESSION_ENGINE = "accounts.sessions"``. Sessions are still
+written to ``django_session`` (so every worker can read them), but each
+process keeps recently read sessions in memory for
+``SESSION_LOCAL_CACHE_TTL`` seconds. An authenticated request therefore
+usually costs zero session queries.
+
+Trade-off: a session deleted by another process (e.g. logout served by a
+different worker) stays readable here for at most the TTL. Keep the TTL short.
+
+Expired rows are removed by a daemon thread every ``SESSION_SWEEP_INTERVAL``
+seconds, in batches of ``SESSION_SWEEP_BATCH_SIZE`` rows so a large backlog
+never locks the table for long. ``manage.py clearsessions`` uses the same
+batched sweep.
+
+Sessions that recorded the plain ``ModelBackend`` are loaded as
+``CachedModelBackend`` sessions, so ``ModelBackend`` does not have to stay in
+``AUTHENTICATION_BACKENDS`` (where it would hash every failed password twice).
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.db import close_old_connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LEGACY_AUTH_BACKENDS = {
+    "django.contrib.auth.backends.ModelBackend": "accounts.authentication.CachedModelBackend",
+}
+
+
+class LocalSessionCache:
+    """Thread-safe LRU of decoded session dicts with a per-entry deadline."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_key: str | None) -> dict | None:
+        if not session_key:
+            return None
+        with self._lock:
+            entry = self._entries.get(session_key)
+            if entry is None:
+                return None
+            deadline, data = entry
+            if deadline <= time.monotonic():
+                del self._entries[session_key]
+                return None
+            self._entries.move_to_end(session_key)
+            return copy.deepcopy(data)
+
+    def set(self, session_key: str, data: dict, expire_date) -> None:
+        ttl = getattr(settings, "SESSION_LOCAL_CACHE_TTL", 30)
+        if ttl <= 0:
+            return
+        # never serve a session past its own expiry
+        remaining = (expire_date - timezone.now()).total_seconds()
+        deadline = time.monotonic() + min(ttl, remaining)
+        max_size = getattr(settings, "SESSION_LOCAL_CACHE_SIZE", 10000)
+        with self._lock:
+            self._entries[session_key] = (deadline, copy.deepcopy(data))
+            self._entries.move_to_end(session_key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, session_key: str | None) -> None:
+        with self._lock:
+            self._entries.pop(session_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalSessionCache()
+
+
+def _upgrade(data: dict) -> dict:
+    backend = data.get(BACKEND_SESSION_KEY)
+    if backend in LEGACY_AUTH_BACKENDS:
+        data[BACKEND_SESSION_KEY] = LEGACY_AUTH_BACKENDS[backend]
+    return data
+
+
+class SessionStore(DBStore):
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        ensure_sweeper_started()
+
+    def load(self):
+        data = local_cache.get(self.session_key)
+        if data is not None:
+            return _upgrade(data)
+        session = self._get_session_from_db()
+        if session is None:
+            return {}
+        data = _upgrade(self.decode(session.session_data))
+        local_cache.set(session.session_key, data, session.expire_date)
+        return data
+
+    async def aload(self):
+        data = local_cache.get(self.session_key)
+        if data is not None:
+            return _upgrade(data)
+        session = await self._aget_session_from_db()
+        if session is None:
+            return {}
+        data = _upgrade(self.decode(session.session_data))
+        local_cache.set(session.session_key, data, session.expire_date)
+        return data
+
+    def save(self, must_create=False):
+        super().save(must_create=must_create)
+        self._remember()
+
+    async def asave(self, must_create=False):
+        await super().asave(must_create=must_create)
+        self._remember()
+
+    def delete(self, session_key=None):
+        local_cache.delete(session_key or self.session_key)
+        super().delete(session_key)
+
+    async def adelete(self, session_key=None):
+        local_cache.delete(session_key or self.session_key)
+        await super().adelete(session_key)
+
+    def _remember(self):
+        if self.session_key:
+            local_cache.set(
+                self.session_key,
+                getattr(self, "_session_cache", {}),
+                self.get_expiry_date(),
+            )
+
+    @classmethod
+    def clear_expired(cls, batch_size=None, max_batches=None):
+        return clear_expired_sessions(batch_size=batch_size, max_batches=max_batches)
+
+
+def clear_expired_sessions(batch_size: int | None = None, max_batches: int | None = None) -> int:
+    """Delete expired sessions ``batch_size`` rows at a time; return the count."""
+    from django.contrib.sessions.models import Session
+
+    if batch_size is None:
+        batch_size = getattr(settings, "SESSION_SWEEP_BATCH_SIZE", 500)
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        now = timezone.now()
+        keys = list(
+            Session.objects.filter(expire_date__lt=now).values_list("session_key", flat=True)[:batch_size]
+        )
+        if not keys:
+            break
+        # a session renewed since the select keeps its row
+        count, _ = Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()
+        deleted += count
+        batches += 1
+        if len(keys) < batch_size:
+            break
+    return deleted
+
+
+class SessionSweeper(threading.Thread):
+    """Daemon thread that periodically runs :func:`clear_expired_sessions`."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="session-sweeper", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                deleted = clear_expired_sessions()
+                if deleted:
+                    logger.info("Session sweep removed %s expired sessions", deleted)
+            except Exception:  # keep sweeping on transient DB errors
+                logger.exception("Session sweep failed")
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        self.stopped.set()
+
+
+_sweeper: SessionSweeper | None = None
+_sweeper_lock = threading.Lock()
+
+
+def ensure_sweeper_started() -> SessionSweeper | None:
+    """Start the per-process sweeper on first session use (not at import time,
+    so management commands and migrations never spawn it)."""
+    global _sweeper
+    if _sweeper is not None:
+        return _sweeper
+    interval = getattr(settings, "SESSION_SWEEP_INTERVAL", 0)
+    if not interval:
+        return None
+    with _sweeper_lock:
+        if _sweeper is None:
+            _sweeper = SessionSweeper(interval)
+            _sweeper.start()
+    return _sweeper
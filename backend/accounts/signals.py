@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .users import forget_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender="accounts.UserProfile")
+@receiver(post_delete, sender="accounts.UserProfile")
+@receiver(post_save, sender="buyers.BuyerProfile")
+@receiver(post_delete, sender="buyers.BuyerProfile")
+@receiver(post_save, sender="exporter.ExporterProfile")
+@receiver(post_delete, sender="exporter.ExporterProfile")
+def profile_changed(sender, instance, **kwargs):
+    forget_user(instance.user_id)
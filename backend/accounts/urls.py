@@ -1,11 +1,13 @@
 from django.urls import path
-from .views import RegisterView, LoginView, MeView
+from .views import RegisterView, BulkRegisterView, LoginView, LogoutView, MeView
 from .views import ProfileView, ChangePasswordView
 from .views import ProfilePhotoUploadView
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
+    path("register/bulk/", BulkRegisterView.as_view(), name="register-bulk"),
     path("login/", LoginView.as_view(), name="login"),
+    path("logout/", LogoutView.as_view(), name="logout"),
     path("me/", MeView.as_view(), name="me"),
     path("profile/", ProfileView.as_view(), name="profile"),
     path("profile/photo/", ProfilePhotoUploadView.as_view(), name="profile-photo"),
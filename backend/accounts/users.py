@@ -0,0 +1,101 @@
+"""Load a user together with their role profiles in one query.
+
+:data:`USER_RELATED` joins ``UserProfile``, ``BuyerProfile`` and
+``ExporterProfile`` into the user query, so ``user.profile`` and role checks
+such as ``hasattr(user, "buyer_profile")`` never query again. A missing
+profile is remembered as missing too.
+
+Session-authenticated requests load the user through :func:`cached_user`,
+which keeps the joined user in the cache for ``AUTH_USER_CACHE_TTL`` seconds.
+Saving or deleting the user or one of their profiles drops the entry (see
+``accounts/signals.py``), so a role or ``is_active`` change applies to the
+next request.
+
+The cache holds field values, not pickled models, and never the password
+hash: a cached user comes back with ``password`` deferred (``save()`` then
+leaves it alone) and answers ``get_session_auth_hash()`` from the stored
+session hash, which is all session verification needs.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.fields.files import FieldFile
+
+USER_RELATED = ("profile", "buyer_profile", "exporter_profile")
+
+
+def cache_key(user_id) -> str:
+    return f"auth-user:{user_id}"
+
+
+def load_user(user_id):
+    """The user with every profile joined in, or None."""
+    User = get_user_model()
+    return User._default_manager.select_related(*USER_RELATED).filter(pk=user_id).first()
+
+
+def _fields(instance, exclude=()) -> dict:
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if field.attname in exclude:
+            continue
+        value = getattr(instance, field.attname)
+        values[field.attname] = value.name if isinstance(value, FieldFile) else value
+    return values
+
+
+def _build(model, values: dict):
+    return model.from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+def snapshot(user) -> dict:
+    """Cacheable, credential-free state of a user loaded by :func:`load_user`."""
+    related = {}
+    for name in USER_RELATED:
+        profile = getattr(user, name, None)
+        related[name] = None if profile is None else _fields(profile)
+    return {
+        "user": _fields(user, exclude=("password",)),
+        "session_hash": user.get_session_auth_hash(),
+        "related": related,
+    }
+
+
+def restore(state: dict):
+    """Rebuild the user (password deferred) and profiles from :func:`snapshot`."""
+    User = get_user_model()
+    user = _build(User, state["user"])
+    session_hash = state["session_hash"]
+    user.get_session_auth_hash = lambda: session_hash
+    for name, values in state["related"].items():
+        relation = User._meta.get_field(name)
+        profile = None if values is None else _build(relation.related_model, values)
+        if profile is not None:
+            relation.field.set_cached_value(profile, user)
+        relation.set_cached_value(user, profile)
+    return user
+
+
+def cached_user(user_id):
+    ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+    if ttl <= 0:
+        return load_user(user_id)
+    key = cache_key(user_id)
+    state = cache.get(key)
+    if state is not None:
+        return restore(state)
+    user = load_user(user_id)
+    if user is not None:
+        cache.set(key, snapshot(user), ttl)
+    return user
+
+
+def forget_user(user_id) -> None:
+    key = cache_key(user_id)
+    cache.delete(key)
+    # a request that read the old row before this commit may have cached it again
+    transaction.on_commit(lambda: cache.delete(key))
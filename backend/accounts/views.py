@@ -1,19 +1,34 @@
 # accounts/views.py
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
-
+from rest_framework import permissions, status
+
+from config.throttling import throttle_cost
+
+from .bulk import bulk_register
+from .photos import (
+    PhotoTooLarge,
+    check_request_size,
+    check_upload_size,
+    limit_upload_size,
+    max_photo_bytes,
+    schedule_variants,
+    variant_urls,
+)
 from .serializers import RegisterSerializer, LoginSerializer
+from django.conf import settings
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.hashers import make_password
 from django.shortcuts import get_object_or_404
-from .models import UserProfile
+from django.utils import timezone
+from .models import AuthToken, UserProfile
 from django.utils.dateparse import parse_date
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 
 
 class RegisterView(APIView):
+    @throttle_cost(5)
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
@@ -37,18 +52,53 @@ class RegisterView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkRegisterView(APIView):
+    """Staff-only: register many users in one call (cooperative onboarding).
+
+    Body is ``{"users": [<register payload>, ...]}``. Every row gets its own
+    result, so one bad row does not reject the whole batch.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        rows = request.data.get("users") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"message": "Expected a non-empty list of users"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_rows = getattr(settings, "BULK_REGISTER_MAX_ROWS", 1000)
+        if len(rows) > max_rows:
+            return Response(
+                {"message": f"At most {max_rows} users per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = bulk_register(rows)
+        created = sum(1 for result in results if result["status"] == "created")
+        return Response(
+            {"created": created, "failed": len(results) - created, "results": results},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+
 class LoginView(APIView):
+    @throttle_cost(2)
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data["user"]
             profile = user.profile
+            token, key = AuthToken.issue(user)
 
-            # Di real app, lu bakal kirim JWT / token.
-            # Buat demo cukup kirim data user.
+            # Client kirim balik token via header "Authorization: Bearer <token>".
             return Response(
                 {
                     "message": "Login success",
+                    "token": key,
+                    "token_type": "Bearer",
+                    "expires_at": token.expires_at.isoformat(),
                     "user": {
                         "id": user.id,
                         "username": user.username,
@@ -62,6 +112,30 @@ class LoginView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LogoutView(APIView):
+    """Revoke the bearer token used for this request.
+
+    With ``{"all": true}`` every token of the user is revoked (e.g. "log out
+    from all devices").
+    """
+
+    def post(self, request):
+        token = request.auth
+        if not isinstance(token, AuthToken):
+            return Response(
+                {"message": "Bearer token required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.data.get("all"):
+            AuthToken.objects.filter(user=token.user, revoked_at__isnull=True).update(
+                revoked_at=timezone.now()
+            )
+        else:
+            token.revoke()
+        return Response({"message": "Logged out"})
+
+
 class MeView(APIView):
     """Return a simple current-user representation for demo purposes.
 
@@ -150,6 +224,7 @@ class ProfileView(APIView):
                 "birth_place": profile.birth_place,
                 "birth_date": profile.birth_date.isoformat() if profile.birth_date else None,
                 "photoUrl": request.build_absolute_uri(profile.photo.url) if getattr(profile, "photo") and profile.photo.name else None,
+                "photoVariants": variant_urls(profile.photo.storage, profile.photo.name, request.build_absolute_uri) if profile.photo and profile.photo.name else None,
             })
 
         return Response({"user": out})
@@ -223,15 +298,36 @@ class ProfilePhotoUploadView(APIView):
 
     Accepts multipart/form-data with `file` and optional `user_id` (for demo). If `user_id` is
     provided, use that user; otherwise use the authenticated user or the first user as demo fallback.
-    Returns JSON with `photoUrl` absolute URL on success.
+    Returns JSON with `photoUrl` absolute URL on success, plus `photoVariants`: resized
+    thumbnails rendered in the background (see accounts/photos.py).
     """
 
+    def initialize_request(self, request, *args, **kwargs):
+        # before authentication: a CSRF check may already parse the body
+        self.upload_limit = limit_upload_size(request)
+        return super().initialize_request(request, *args, **kwargs)
+
     def post(self, request):
         User = get_user_model()
 
+        too_large = Response(
+            {"error": f"File too large (max {max_photo_bytes()} bytes)"},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+        try:
+            check_request_size(request)
+        except PhotoTooLarge:
+            return too_large
+
         file = request.FILES.get("file") or request.FILES.get("photo")
+        if self.upload_limit.exceeded:
+            return too_large
         if not file:
             return Response({"error": "No file uploaded"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            check_upload_size(file)
+        except PhotoTooLarge:
+            return too_large
 
         user = None
         user_id = request.POST.get("user_id") or request.data.get("user_id")
@@ -254,7 +350,7 @@ class ProfilePhotoUploadView(APIView):
         if not profile:
             profile = UserProfile.objects.create(user=user, role="supplier")
 
-        # Use Django's storage to save file
+        # Use Django's storage to save file; storage copies the upload in chunks
         try:
             # generate a filename in upload_to folder
             filename = file.name
@@ -262,8 +358,12 @@ class ProfilePhotoUploadView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+        schedule_variants(profile.photo.storage, profile.photo.name)
         photo_url = request.build_absolute_uri(profile.photo.url) if profile.photo and profile.photo.name else None
-        return Response({"photoUrl": photo_url})
+        return Response({
+            "photoUrl": photo_url,
+            "photoVariants": variant_urls(profile.photo.storage, profile.photo.name, request.build_absolute_uri),
+        })
 
 
 class ChangePasswordView(APIView):
@@ -293,4 +393,10 @@ class ChangePasswordView(APIView):
 
         user.set_password(new)
         user.save()
+
+        # tokens issued with the old password stop working, except the one in use
+        other_tokens = AuthToken.objects.filter(user=user, revoked_at__isnull=True)
+        if isinstance(request.auth, AuthToken):
+            other_tokens = other_tokens.exclude(pk=request.auth.pk)
+        other_tokens.update(revoked_at=timezone.now())
         return Response({"message": "Password changed"})
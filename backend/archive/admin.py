@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from .models import ArchivedDeal, ArchivedQcRecord, ArchivedQualityCheckLog, ArchivedRequirement
+
+
+class ReadOnlyArchiveAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedQcRecord)
+class ArchivedQcRecordAdmin(ReadOnlyArchiveAdmin):
+    list_display = ("id", "batch_id", "passed", "contamination_score", "created_at", "archived_at")
+
+
+@admin.register(ArchivedRequirement)
+class ArchivedRequirementAdmin(ReadOnlyArchiveAdmin):
+    list_display = ("id", "product_type", "buyer_id", "status", "created_at", "archived_at")
+    search_fields = ("product_type", "buyer_name")
+
+
+@admin.register(ArchivedQualityCheckLog)
+class ArchivedQualityCheckLogAdmin(ReadOnlyArchiveAdmin):
+    list_display = ("id", "requirement_id", "status", "created_at", "archived_at")
+
+
+@admin.register(ArchivedDeal)
+class ArchivedDealAdmin(ReadOnlyArchiveAdmin):
+    list_display = ("id", "exporter_id", "product_name", "status", "total_price", "created_at", "archived_at")
+    list_filter = ("status",)
@@ -0,0 +1,182 @@
+"""Move cold rows out of the hot tables, a bounded batch at a time.
+
+Cold means older than ``ARCHIVE_AFTER_DAYS`` and final:
+
+* ``QcRecord`` rows, except the newest record of each batch. The newest
+  record stays hot because ``QcRecord.save`` chains a new record onto it,
+  so the hash chain goes on unbroken across both tiers.
+* Completed or cancelled deals, by ``updated_at``.
+* Settled (``DONE``) requirements, by ``updated_at``, once no deal in the
+  hot table refers to them. Their ``QualityCheckLog`` chain moves with them
+  in one piece. Match and assignment-proposal rows, which are derived
+  data, are deleted with them.
+
+Each batch copies and deletes ``ARCHIVE_BATCH_SIZE`` rows in one
+transaction, so a run can stop at any point without losing or duplicating
+rows. Deal rollups are left as they are: dashboard totals keep counting
+archived deals, and ``rebuild_rollups`` reads both tiers.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from buyers.models import BuyerRequirement, QualityCheckLog
+from exporter.models import Deal
+from exporter.signals import rollups_suspended
+from suppliers.models import QcRecord
+
+from .models import ArchivedDeal, ArchivedQcRecord, ArchivedQualityCheckLog, ArchivedRequirement
+
+FINAL_DEAL_STATUSES = ("completed", "cancelled")
+
+
+def default_cutoff() -> datetime:
+    return timezone.now() - timedelta(days=getattr(settings, "ARCHIVE_AFTER_DAYS", 180))
+
+
+def cold_qc_records(cutoff: datetime):
+    newer = QcRecord.objects.filter(batch_id=OuterRef("batch_id")).filter(
+        Q(created_at__gt=OuterRef("created_at"))
+        | Q(created_at=OuterRef("created_at"), pk__gt=OuterRef("pk"))
+    )
+    return QcRecord.objects.filter(created_at__lt=cutoff).filter(Exists(newer))
+
+
+def cold_deals(cutoff: datetime):
+    return Deal.objects.filter(status__in=FINAL_DEAL_STATUSES, updated_at__lt=cutoff)
+
+
+def cold_requirements(cutoff: datetime):
+    open_deals = Deal.objects.filter(buyer_requirement_id=OuterRef("pk"))
+    return BuyerRequirement.objects.filter(
+        status=BuyerRequirement.STATUS_DONE, updated_at__lt=cutoff
+    ).exclude(Exists(open_deals))
+
+
+def _move_qc_records(ids: list[int]) -> int:
+    rows = QcRecord.objects.filter(pk__in=ids)
+    ArchivedQcRecord.objects.bulk_create(
+        ArchivedQcRecord(
+            id=record.pk,
+            batch_id=record.batch_id,
+            created_at=record.created_at,
+            passed=record.passed,
+            contamination_score=record.contamination_score,
+            details=record.details,
+            previous_hash=record.previous_hash,
+            record_hash=record.record_hash,
+        )
+        for record in rows
+    )
+    return rows.delete()[0]
+
+
+def _move_deals(ids: list[int]) -> int:
+    rows = Deal.objects.filter(pk__in=ids)
+    ArchivedDeal.objects.bulk_create(
+        ArchivedDeal(
+            id=deal.pk,
+            exporter_id=deal.exporter_id,
+            buyer_requirement_id=deal.buyer_requirement_id,
+            product_batch_id=deal.product_batch_id,
+            product_name=deal.product_batch.product_name,
+            status=deal.status,
+            quantity=deal.quantity,
+            total_price=deal.total_price,
+            notes=deal.notes,
+            created_at=deal.created_at,
+            updated_at=deal.updated_at,
+        )
+        for deal in rows.select_related("product_batch")
+    )
+    # archived deals still count towards the rollups
+    with rollups_suspended():
+        return rows.delete()[0]
+
+
+def _move_requirements(ids: list[int]) -> int:
+    logs = QualityCheckLog.objects.filter(requirement_id__in=ids)
+    ArchivedQualityCheckLog.objects.bulk_create(
+        ArchivedQualityCheckLog(
+            id=log.pk,
+            requirement_id=log.requirement_id,
+            status=log.status,
+            result=log.result,
+            hash=log.hash,
+            previous_hash=log.previous_hash,
+            created_at=log.created_at,
+        )
+        for log in logs
+    )
+    rows = BuyerRequirement.objects.filter(pk__in=ids)
+    ArchivedRequirement.objects.bulk_create(
+        ArchivedRequirement(
+            id=requirement.pk,
+            buyer_id=requirement.buyer_id,
+            buyer_name=requirement.buyer_name,
+            product_type=requirement.product_type,
+            min_volume=requirement.min_volume,
+            max_volume=requirement.max_volume,
+            volume_required=requirement.volume_required,
+            allowed_contaminants=requirement.allowed_contaminants,
+            shipping_window_start=requirement.shipping_window_start,
+            shipping_window_end=requirement.shipping_window_end,
+            destination_country=requirement.destination_country,
+            standards=requirement.standards,
+            notes=requirement.notes,
+            status=requirement.status,
+            created_at=requirement.created_at,
+            updated_at=requirement.updated_at,
+        )
+        for requirement in rows
+    )
+    logs.delete()
+    rows.delete()
+    return len(ids)
+
+
+# deals go first, so the requirements they settle can follow in the same run
+STEPS: tuple[tuple[str, Callable, Callable[[list[int]], int]], ...] = (
+    ("deals", cold_deals, _move_deals),
+    ("qc_records", cold_qc_records, _move_qc_records),
+    ("requirements", cold_requirements, _move_requirements),
+)
+
+
+def archive_cold_rows(
+    cutoff: datetime | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Archive everything colder than ``cutoff``; returns rows moved per kind.
+
+    ``max_batches`` bounds each kind separately. With ``dry_run`` nothing
+    moves and the counts say what would.
+    """
+    cutoff = cutoff or default_cutoff()
+    if batch_size is None:
+        batch_size = getattr(settings, "ARCHIVE_BATCH_SIZE", 500)
+    moved = {}
+    for name, select, move in STEPS:
+        if dry_run:
+            moved[name] = select(cutoff).count()
+            continue
+        moved[name] = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with transaction.atomic():
+                ids = list(select(cutoff).order_by("pk").values_list("pk", flat=True)[:batch_size])
+                if ids:
+                    moved[name] += move(ids)
+            batches += 1
+            if len(ids) < batch_size:
+                break
+    return moved
@@ -0,0 +1,170 @@
+"""Read history across the hot and archive tiers.
+
+Each function returns plain dicts from both tables as one ordered ``UNION
+ALL`` queryset, with ``"archived"`` telling which tier a row came from.
+The queryset is lazy, so paginating it slices the union in SQL. Callers do
+not need to know whether a row has been archived yet.
+
+:class:`ArchiveTiersMixin` does the same for a viewset's own ``list`` and
+``retrieve``: pages are cut from the union of both tiers' ids, and a detail
+lookup that misses the hot table falls back to the archive. Archived rows
+are read-only, so every other action still only sees the hot table.
+"""
+
+from __future__ import annotations
+
+from django.db.models import BooleanField, F, Value
+from django.http import Http404
+from rest_framework.response import Response
+
+from buyers.models import BuyerRequirement
+from exporter.models import Deal
+from suppliers.models import QcRecord
+
+from .models import ArchivedDeal, ArchivedQcRecord, ArchivedRequirement
+
+QC_FIELDS = ("id", "batch_id", "created_at", "passed", "contamination_score", "details", "previous_hash", "record_hash")
+REQUIREMENT_FIELDS = (
+    "id",
+    "buyer_name",
+    "product_type",
+    "min_volume",
+    "max_volume",
+    "allowed_contaminants",
+    "shipping_window_start",
+    "shipping_window_end",
+    "destination_country",
+    "standards",
+    "notes",
+    "status",
+    "created_at",
+    "updated_at",
+)
+DEAL_FIELDS = (
+    "id",
+    "buyer_requirement_id",
+    "product_batch_id",
+    "product_name",
+    "status",
+    "quantity",
+    "total_price",
+    "notes",
+    "created_at",
+    "updated_at",
+)
+
+
+def _both_tiers(hot, cold, fields, ordering):
+    archived = lambda flag: Value(flag, output_field=BooleanField())  # noqa: E731
+
+    def rows(queryset, flag):
+        # parts of a compound query may not be ordered or prefetch
+        return (
+            queryset.order_by()
+            .prefetch_related(None)
+            .annotate(archived=archived(flag))
+            .values(*fields, "archived")
+        )
+
+    return rows(hot, False).union(rows(cold, True), all=True).order_by(*ordering)
+
+
+def qc_history(batch_id: int) -> list[dict]:
+    """Every QC record of a batch, oldest first."""
+    return list(
+        _both_tiers(
+            QcRecord.objects.filter(batch_id=batch_id),
+            ArchivedQcRecord.objects.filter(batch_id=batch_id),
+            QC_FIELDS,
+            ("created_at", "id"),
+        )
+    )
+
+
+def qc_chain_intact(records: list[dict]) -> bool:
+    """True if every record of a ``qc_history`` list links to the one before it."""
+    return all(
+        later["previous_hash"] == earlier["record_hash"]
+        for earlier, later in zip(records, records[1:])
+    )
+
+
+def requirement_history(buyer_id: int):
+    """A buyer's requirements, settled and archived ones included, newest first."""
+    return _both_tiers(
+        BuyerRequirement.objects.filter(buyer_id=buyer_id),
+        ArchivedRequirement.objects.filter(buyer_id=buyer_id),
+        REQUIREMENT_FIELDS,
+        ("-created_at", "-id"),
+    )
+
+
+def deal_history(exporter_id: int):
+    """An exporter's deals from both tiers, newest first."""
+    hot = Deal.objects.filter(exporter_id=exporter_id).annotate(product_name=F("product_batch__product_name"))
+    return _both_tiers(
+        hot,
+        ArchivedDeal.objects.filter(exporter_id=exporter_id),
+        DEAL_FIELDS,
+        ("-created_at", "-id"),
+    )
+
+
+def tier_keys(hot, cold):
+    """``id`` and ``archived`` of both tiers' rows, newest first."""
+    return _both_tiers(hot, cold, ("id", "created_at"), ("-created_at", "-id"))
+
+
+def load_rows(keys, hot, cold) -> list:
+    """The model instances behind ``keys``, in order; archived ones from ``cold``."""
+    keys = list(keys)
+    found = {(False, row.pk): row for row in hot.filter(pk__in=[k["id"] for k in keys if not k["archived"]])}
+    found.update(
+        ((True, row.pk), row) for row in cold.filter(pk__in=[k["id"] for k in keys if k["archived"]])
+    )
+    return [found[key] for key in ((k["archived"], k["id"]) for k in keys) if key in found]
+
+
+class ArchiveTiersMixin:
+    """``list`` and ``retrieve`` across the hot table and its archive.
+
+    Set ``archive_serializer_class`` and implement ``get_archive_queryset``
+    (already scoped to the requesting user). Every row carries ``archived``.
+    """
+
+    archive_serializer_class = None
+
+    def get_archive_queryset(self):
+        raise NotImplementedError
+
+    def represent(self, row, archived: bool) -> dict:
+        serializer_class = self.archive_serializer_class if archived else self.get_serializer_class()
+        data = serializer_class(row, context=self.get_serializer_context()).data
+        data["archived"] = archived
+        return data
+
+    def list(self, request, *args, **kwargs):
+        hot = self.filter_queryset(self.get_queryset())
+        cold = self.get_archive_queryset()
+        keys = tier_keys(hot, cold)
+        page = self.paginate_queryset(keys)
+        rows = [
+            self.represent(row, isinstance(row, cold.model))
+            for row in load_rows(keys if page is None else page, hot, cold)
+        ]
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            try:
+                row = self.get_archive_queryset().filter(pk=lookup).first()
+            except (TypeError, ValueError):
+                row = None
+            if row is None:
+                raise
+        return Response(self.represent(row, True))
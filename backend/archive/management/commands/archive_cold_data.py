@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from archive.archiver import archive_cold_rows
+
+
+class Command(BaseCommand):
+    help = "Move settled requirements, finished deals and old QC records to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="archive rows colder than this many days (default ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--max-batches", type=int, default=None, help="per kind of row")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        cutoff = None
+        if options["days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["days"])
+        moved = archive_cold_rows(
+            cutoff,
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            dry_run=options["dry_run"],
+        )
+        prefix = "[dry run] " if options["dry_run"] else ""
+        summary = ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in moved.items())
+        self.stdout.write(self.style.SUCCESS(f"{prefix}archived {summary}"))
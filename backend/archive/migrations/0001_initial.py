@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedDeal',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('exporter_id', models.BigIntegerField(db_index=True)),
+                ('buyer_requirement_id', models.BigIntegerField()),
+                ('product_batch_id', models.BigIntegerField()),
+                ('product_name', models.CharField(max_length=255)),
+                ('status', models.CharField(max_length=50)),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedQcRecord',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('batch_id', models.BigIntegerField(db_index=True)),
+                ('created_at', models.DateTimeField()),
+                ('passed', models.BooleanField()),
+                ('contamination_score', models.FloatField()),
+                ('details', models.JSONField(blank=True, default=dict)),
+                ('previous_hash', models.CharField(blank=True, max_length=128)),
+                ('record_hash', models.CharField(blank=True, max_length=128)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedQualityCheckLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('requirement_id', models.BigIntegerField(db_index=True)),
+                ('status', models.CharField(max_length=16)),
+                ('result', models.JSONField(default=dict)),
+                ('hash', models.CharField(blank=True, max_length=64)),
+                ('previous_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedRequirement',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('buyer_id', models.BigIntegerField(blank=True, db_index=True, null=True)),
+                ('buyer_name', models.CharField(blank=True, max_length=128)),
+                ('product_type', models.CharField(max_length=64)),
+                ('min_volume', models.PositiveIntegerField(default=0)),
+                ('max_volume', models.PositiveIntegerField(default=0)),
+                ('volume_required', models.PositiveIntegerField(default=0)),
+                ('allowed_contaminants', models.JSONField(default=dict)),
+                ('shipping_window_start', models.DateField()),
+                ('shipping_window_end', models.DateField()),
+                ('destination_country', models.CharField(blank=True, max_length=64)),
+                ('standards', models.JSONField(blank=True, default=list)),
+                ('notes', models.TextField(blank=True)),
+                ('status', models.CharField(max_length=16)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
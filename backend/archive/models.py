@@ -0,0 +1,83 @@
+"""Cold copies of rows moved out of the hot tables by ``archive.archiver``.
+
+Each archive row keeps the primary key of the row it replaces, so ids in
+URLs, hash chains and webhook payloads stay valid. References to other
+tables are plain ids: the archive never cascades, and archived history
+outlives what it points at.
+"""
+
+from django.db import models
+
+
+class ArchivedQcRecord(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    batch_id = models.BigIntegerField(db_index=True)
+    created_at = models.DateTimeField()
+    passed = models.BooleanField()
+    contamination_score = models.FloatField()
+    details = models.JSONField(default=dict, blank=True)
+    previous_hash = models.CharField(max_length=128, blank=True)
+    record_hash = models.CharField(max_length=128, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Archived QC {self.pk} for batch {self.batch_id}"
+
+
+class ArchivedRequirement(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    buyer_id = models.BigIntegerField(null=True, blank=True, db_index=True)
+    buyer_name = models.CharField(max_length=128, blank=True)
+    product_type = models.CharField(max_length=64)
+    min_volume = models.PositiveIntegerField(default=0)
+    max_volume = models.PositiveIntegerField(default=0)
+    volume_required = models.PositiveIntegerField(default=0)
+    allowed_contaminants = models.JSONField(default=dict)
+    shipping_window_start = models.DateField()
+    shipping_window_end = models.DateField()
+    destination_country = models.CharField(max_length=64, blank=True)
+    standards = models.JSONField(default=list, blank=True)
+    notes = models.TextField(blank=True)
+    status = models.CharField(max_length=16)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Archived {self.product_type} requirement #{self.pk}"
+
+    def latest_quality_check(self) -> "ArchivedQualityCheckLog | None":
+        return ArchivedQualityCheckLog.objects.filter(requirement_id=self.pk).order_by("-created_at").first()
+
+
+class ArchivedQualityCheckLog(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    requirement_id = models.BigIntegerField(db_index=True)
+    status = models.CharField(max_length=16)
+    result = models.JSONField(default=dict)
+    hash = models.CharField(max_length=64, blank=True)
+    previous_hash = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+
+
+class ArchivedDeal(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    exporter_id = models.BigIntegerField(db_index=True)
+    buyer_requirement_id = models.BigIntegerField()
+    product_batch_id = models.BigIntegerField()
+    # kept from the batch so rollups can be rebuilt after the batch is gone
+    product_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=50)
+    quantity = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.DecimalField(max_digits=12, decimal_places=2)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Archived deal #{self.pk} ({self.status})"
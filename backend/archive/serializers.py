@@ -0,0 +1,38 @@
+from rest_framework import serializers
+
+from buyers.serializers import BuyerRequirementSerializer
+
+from .models import ArchivedDeal, ArchivedRequirement
+
+
+class ArchivedRequirementSerializer(BuyerRequirementSerializer):
+    """Same shape as a hot requirement; archived rows are read-only."""
+
+    class Meta(BuyerRequirementSerializer.Meta):
+        model = ArchivedRequirement
+        read_only_fields = BuyerRequirementSerializer.Meta.fields
+
+
+class ArchivedDealSerializer(serializers.ModelSerializer):
+    """A deal from the archive; related rows may be gone, so they are ids."""
+
+    exporter = serializers.IntegerField(source="exporter_id", read_only=True)
+    buyer_requirement = serializers.IntegerField(source="buyer_requirement_id", read_only=True)
+    product_batch = serializers.IntegerField(source="product_batch_id", read_only=True)
+
+    class Meta:
+        model = ArchivedDeal
+        fields = [
+            "id",
+            "exporter",
+            "buyer_requirement",
+            "product_batch",
+            "product_name",
+            "status",
+            "quantity",
+            "total_price",
+            "notes",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
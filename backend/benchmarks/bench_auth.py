@@ -0,0 +1,47 @@
+"""Basic auth vs. bearer token on an authenticated API endpoint.
+
+Basic auth runs the full PBKDF2 hash on every request; the bearer token is a
+single indexed digest lookup.
+"""
+
+from __future__ import annotations
+
+import base64
+
+from benchmarks.harness import measure, report, test_database
+
+
+def main(iterations: int = 50) -> None:
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    from accounts.models import AuthToken
+    from buyers.models import BuyerProfile
+
+    with test_database():
+        user = get_user_model().objects.create_user(username="bench", password="bench-pass-123")
+        BuyerProfile.objects.create(user=user, organization="Bench", country="ID")
+        _, key = AuthToken.issue(user)
+
+        basic = APIClient()
+        credentials = base64.b64encode(b"bench:bench-pass-123").decode()
+        basic.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+
+        bearer = APIClient()
+        bearer.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+
+        url = "/api/buyer/requirements/"
+        assert basic.get(url).status_code == 200
+        assert bearer.get(url).status_code == 200
+
+        report(
+            f"GET {url} ({iterations} requests)",
+            {
+                "basic": measure(lambda: basic.get(url), iterations=iterations),
+                "bearer": measure(lambda: bearer.get(url), iterations=iterations),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
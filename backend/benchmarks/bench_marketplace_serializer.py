@@ -0,0 +1,76 @@
+"""Marketplace list page: DRF serializer vs. the tuple fast path.
+
+Both build the same 50-row page (byte-identical JSON). "page" includes
+the queries; "serialize" times only turning already-fetched rows into
+dicts, with the latest QC records already loaded for both.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.harness import measure, report, test_database
+
+
+def main(rows: int = 50, iterations: int = 200) -> None:
+    from django.contrib.auth import get_user_model
+    from rest_framework.renderers import JSONRenderer
+
+    from buyers.models import BatchMarketInfo
+    from buyers.serializers import FastMarketplaceSerializer, MarketplaceBatchSerializer
+    from buyers.services import get_marketplace_queryset
+    from suppliers.models import ProductBatch, QcRecord
+
+    with test_database():
+        supplier = get_user_model().objects.create_user(
+            username="bench", first_name="Bench", last_name="Supplier"
+        )
+        for index in range(rows):
+            batch = ProductBatch.objects.create(
+                supplier=supplier, batch_code=f"B-{index}", product_name="Tuna",
+                quantity=100 + index, qc_status="brin_verified_pass", is_allowed_for_catalog=True,
+            )
+            BatchMarketInfo.objects.create(
+                batch=batch, species="Tuna", region="Maluku", country_of_origin="ID",
+                harvest_date=date(2025, 5, 1), ready_date=date(2025, 6, 1) + timedelta(days=index),
+                size_min_mm=Decimal("10"), size_max_mm=Decimal("30"),
+                price_per_unit=Decimal("12.50") + index, contaminant_mercury_ppm=Decimal("0.12"),
+                contaminant_cesium_ppm=Decimal("0.01"), contaminant_ecoli_cfu=Decimal("15"),
+            )
+            QcRecord.objects.create(batch=batch, passed=True, contamination_score=20.5)
+
+        queryset = get_marketplace_queryset({})
+        instances = list(queryset)
+        tuples = list(FastMarketplaceSerializer.rows(queryset))
+        latest_qc = FastMarketplaceSerializer.latest_qc(row[0] for row in tuples)
+        render = JSONRenderer().render
+        assert render(MarketplaceBatchSerializer(instances, many=True).data) == render(
+            FastMarketplaceSerializer.serialize(tuples)
+        )
+
+        report(
+            f"marketplace page of {rows} rows ({iterations} runs)",
+            {
+                "drf page": measure(
+                    lambda: MarketplaceBatchSerializer(list(get_marketplace_queryset({})), many=True).data,
+                    iterations=iterations,
+                ),
+                "fast page": measure(
+                    lambda: FastMarketplaceSerializer.serialize(
+                        list(FastMarketplaceSerializer.rows(get_marketplace_queryset({})))
+                    ),
+                    iterations=iterations,
+                ),
+                "drf serialize": measure(
+                    lambda: MarketplaceBatchSerializer(instances, many=True).data, iterations=iterations
+                ),
+                "fast serialize": measure(
+                    lambda: FastMarketplaceSerializer.serialize(tuples, latest_qc), iterations=iterations
+                ),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Response rendering: DRF's stdlib JSONRenderer vs. orjson vs. MessagePack.
+
+Payloads are already-serialized data, as a view hands them to the renderer:
+a large marketplace listing (fast-path rows) and a supplier's QC history with
+``details`` dicts and hash strings. JSON output of both JSON renderers is
+checked to be byte-identical first.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.harness import measure, report, test_database
+
+
+def main(rows: int = 2000, iterations: int = 50) -> None:
+    from django.contrib.auth import get_user_model
+    from rest_framework.renderers import JSONRenderer
+
+    from buyers.models import BatchMarketInfo
+    from buyers.serializers import FastMarketplaceSerializer
+    from buyers.services import get_marketplace_queryset
+    from config.renderers import MessagePackRenderer, ORJSONRenderer
+    from suppliers.models import ProductBatch, QcRecord
+    from suppliers.serializers import QcRecordSerializer
+
+    with test_database():
+        supplier = get_user_model().objects.create_user(
+            username="bench", first_name="Bench", last_name="Supplier"
+        )
+        for index in range(rows):
+            batch = ProductBatch.objects.create(
+                supplier=supplier, batch_code=f"B-{index}", product_name="Tuna",
+                quantity=100 + index, qc_status="brin_verified_pass", is_allowed_for_catalog=True,
+            )
+            BatchMarketInfo.objects.create(
+                batch=batch, species="Tuna", region="Maluku", country_of_origin="ID",
+                harvest_date=date(2025, 5, 1), ready_date=date(2025, 6, 1) + timedelta(days=index % 90),
+                size_min_mm=Decimal("10"), size_max_mm=Decimal("30"),
+                price_per_unit=Decimal("12.50") + index, contaminant_mercury_ppm=Decimal("0.12"),
+                contaminant_cesium_ppm=Decimal("0.01"), contaminant_ecoli_cfu=Decimal("15"),
+            )
+            QcRecord.objects.create(
+                batch=batch, passed=True, contamination_score=20.5,
+                details={"mercury_ppm": 0.12, "cesium_ppm": 0.01, "lab": "BRIN", "notes": "ok"},
+            )
+
+        payloads = {
+            "marketplace": FastMarketplaceSerializer.serialize(
+                list(FastMarketplaceSerializer.rows(get_marketplace_queryset({})))
+            ),
+            "qc records": QcRecordSerializer(QcRecord.objects.order_by("pk"), many=True).data,
+        }
+
+        renderers = {
+            "stdlib json": JSONRenderer(),
+            "orjson": ORJSONRenderer(),
+            "msgpack": MessagePackRenderer(),
+        }
+        for label, data in payloads.items():
+            assert renderers["stdlib json"].render(data) == renderers["orjson"].render(data)
+            sizes = ", ".join(
+                f"{name} {len(renderer.render(data)) / 1024:.0f} KiB" for name, renderer in renderers.items()
+            )
+            report(
+                f"{label}: {rows} rows ({iterations} runs; {sizes})",
+                {
+                    name: measure(lambda renderer=renderer: renderer.render(data), iterations=iterations)
+                    for name, renderer in renderers.items()
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
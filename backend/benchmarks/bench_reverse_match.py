@@ -0,0 +1,59 @@
+"""Reverse match (which open requirements accept this listing?) at scale.
+
+Seeds 100k requirements across a handful of species and a year of shipping
+windows, then times ``find_requirements_for_batch``. It is one SQL
+statement on the typed threshold columns and ``requirement_match_idx``.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks.harness import measure, report, test_database
+
+SPECIES = ["tuna", "shrimp", "grouper", "snapper", "squid", "crab", "octopus", "mackerel"]
+
+
+def main(requirements: int = 100_000, iterations: int = 50) -> None:
+    from buyers.models import BatchMarketInfo, BuyerRequirement
+    from buyers.services import find_requirements_for_batch
+    from suppliers.models import ProductBatch
+
+    rng = random.Random(0)
+    with test_database():
+        rows = []
+        for _ in range(requirements):
+            start = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+            limits = {"mercury": round(rng.uniform(0.1, 1.0), 2)} if rng.random() < 0.7 else {}
+            requirement = BuyerRequirement(
+                product_type=rng.choice(SPECIES).title(),
+                min_volume=rng.randrange(50, 500),
+                shipping_window_start=start,
+                shipping_window_end=start + timedelta(days=rng.randrange(7, 45)),
+                destination_country=rng.choice(["", "JP", "US", "SG"]),
+                allowed_contaminants=limits,
+            )
+            # bulk_create skips save(), so fill the typed columns here
+            requirement.sync_thresholds()
+            rows.append(requirement)
+        BuyerRequirement.objects.bulk_create(rows, batch_size=5000)
+
+        batch = ProductBatch.objects.create(
+            batch_code="BENCH-1", product_name="Tuna", quantity=400,
+            qc_status="brin_verified_pass", is_allowed_for_catalog=True,
+        )
+        info = BatchMarketInfo.objects.create(
+            batch=batch, species="Tuna", ready_date=date(2025, 6, 10),
+            destination_country="JP", contaminant_mercury_ppm=Decimal("0.3"),
+        )
+        matched = len(find_requirements_for_batch(info))
+        report(
+            f"find_requirements_for_batch over {requirements} requirements ({matched} match)",
+            {"reverse match": measure(lambda: find_requirements_for_batch(info), iterations=iterations)},
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Concurrent QC and requirement writes against an on-disk SQLite file.
+
+Several worker processes (like a multi-worker app server on one box), each
+with a few threads, hit the same database file. Half the threads run
+``process-brin`` on their own batches while the other half create buyer
+requirements. It runs twice, first with Django's default SQLite settings
+and then in ``SQLITE_PRODUCTION`` mode (WAL, busy timeout, ``BEGIN
+IMMEDIATE`` and the single-writer queue). Both runs report throughput and
+how many requests failed with "database is locked".
+
+    SQLITE_PRODUCTION=1 python -m benchmarks.bench_sqlite_writes
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from benchmarks.harness import test_database
+
+REQUIREMENT = {
+    "commodity": "tuna",
+    "min_volume": 100,
+    "shipping_window_start": "2025-06-01",
+    "shipping_window_end": "2025-06-30",
+}
+
+
+def _worker_process(supplier_id, buyer_id, batch_ids, threads, writes, start, results):
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+    from rest_framework.test import APIClient
+
+    # never reuse a connection inherited across fork
+    for conn in connections.all(initialized_only=True):
+        conn.inc_thread_sharing()
+        conn.connection = None
+    User = get_user_model()
+    supplier = User.objects.get(pk=supplier_id)
+    buyer = User.objects.get(pk=buyer_id)
+    connections.close_all()
+
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def attempt(call):
+        try:
+            outcome = call().status_code
+        except Exception as exc:  # noqa: BLE001 - counted and reported
+            outcome = "locked" if "locked" in str(exc) else type(exc).__name__
+        with lock:
+            outcomes[outcome] += 1
+
+    def qc_thread(ids):
+        client = APIClient()
+        client.force_authenticate(user=supplier)
+        start.wait()
+        for pk in ids:
+            attempt(lambda: client.post(f"/api/supplier/batches/{pk}/process-brin/"))
+        connections.close_all()
+
+    def requirement_thread():
+        client = APIClient()
+        client.force_authenticate(user=buyer)
+        start.wait()
+        for _ in range(writes):
+            attempt(lambda: client.post("/api/buyer/requirements/", REQUIREMENT, format="json"))
+        connections.close_all()
+
+    qc_threads = threads // 2
+    workers = [
+        threading.Thread(target=qc_thread, args=(batch_ids[i * writes:(i + 1) * writes],))
+        for i in range(qc_threads)
+    ] + [threading.Thread(target=requirement_thread) for _ in range(threads - qc_threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put(dict(outcomes))
+
+
+def _run(processes: int, threads: int, writes: int) -> tuple[float, Counter]:
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+
+    from buyers.models import BuyerProfile
+    from suppliers.models import ProductBatch
+
+    User = get_user_model()
+    run = f"{time.monotonic_ns()}"
+    supplier = User.objects.create_user(username=f"supplier-{run}")
+    buyer = User.objects.create_user(username=f"buyer-{run}")
+    BuyerProfile.objects.create(user=buyer, organization="Bench", country="JP")
+    per_process = threads // 2 * writes
+    batch_ids = [
+        ProductBatch.objects.create(
+            supplier=supplier,
+            batch_code=f"SAFE-{run}-{index}",
+            product_name="Tuna",
+            quantity=100,
+            qc_status="submitted",
+            brin_request_payload={"batch_code": f"SAFE-{run}-{index}"},
+        ).pk
+        for index in range(processes * per_process)
+    ]
+    connection.close()
+
+    context = multiprocessing.get_context("fork")
+    start = context.Barrier(processes * threads + 1)
+    results = context.Queue()
+    children = [
+        context.Process(
+            target=_worker_process,
+            args=(
+                supplier.pk,
+                buyer.pk,
+                batch_ids[index * per_process:(index + 1) * per_process],
+                threads,
+                writes,
+                start,
+                results,
+            ),
+        )
+        for index in range(processes)
+    ]
+    for child in children:
+        child.start()
+    start.wait()
+    began = time.perf_counter()
+    outcomes = Counter()
+    for _ in children:
+        outcomes.update(results.get())
+    elapsed = time.perf_counter() - began
+    for child in children:
+        child.join()
+    return elapsed, outcomes
+
+
+def main(processes: int = 4, threads: int = 4, writes: int = 20) -> None:
+    from django.db import connection
+    from django.test import override_settings
+
+    production_options = connection.settings_dict.get("OPTIONS", {}).copy()
+    if not production_options:
+        raise SystemExit("run with SQLITE_PRODUCTION=1 so the production pragmas are loaded")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with test_database(os.path.join(directory, "bench.sqlite3")):
+            print(f"{processes} processes x {threads} threads x {writes} writes, on-disk SQLite")
+            for mode, options, queued in [
+                ("default", {}, False),
+                ("production", production_options, True),
+            ]:
+                connection.settings_dict["OPTIONS"] = options
+                connection.close()
+                with override_settings(SQLITE_PRODUCTION=queued):
+                    elapsed, outcomes = _run(processes, threads, writes)
+                total = sum(outcomes.values())
+                ok = outcomes[200] + outcomes[201]
+                print(
+                    f"  {mode:<10}  {ok}/{total} ok  {outcomes['locked']} locked"
+                    f"  {ok / elapsed:>8.1f} successful writes/s  {dict(outcomes)}"
+                )
+
+
+if __name__ == "__main__":
+    main()
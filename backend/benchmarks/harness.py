@@ -0,0 +1,67 @@
+"""Shared setup for the benchmarks in this package.
+
+Run them from ``backend/``, for example::
+
+    python -m benchmarks.bench_auth
+
+Every benchmark runs against a throwaway test database created the same way
+``manage.py test`` does it, so ``db.sqlite3`` is never touched.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+
+@contextmanager
+def test_database(name: str | None = None):
+    """Throwaway test database; pass ``name`` for an on-disk SQLite file."""
+    if name is not None:
+        connection.settings_dict["TEST"]["NAME"] = name
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn: Callable[[], object], *, iterations: int, warmup: int = 3) -> dict[str, float]:
+    """Call ``fn`` ``iterations`` times and return throughput and latency figures."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    total = sum(samples)
+    return {
+        "ops_per_sec": iterations / total if total else float("inf"),
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": sorted(samples)[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+def report(title: str, results: dict[str, dict[str, float]]) -> None:
+    print(title)
+    width = max(len(name) for name in results)
+    for name, figures in results.items():
+        print(
+            f"  {name:<{width}}  {figures['ops_per_sec']:>10.1f} ops/s"
+            f"  p50 {figures['p50_ms']:>8.2f} ms  p95 {figures['p95_ms']:>8.2f} ms"
+        )
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class BlobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "blobs"
+    verbose_name = "Content-addressed media"
@@ -0,0 +1,111 @@
+"""Garbage collection for the content-addressed store."""
+
+from __future__ import annotations
+
+import os
+import posixpath
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .models import Blob
+from .storage import PREFIX, ContentAddressedStorage, blob_storage
+
+
+def blob_fields():
+    """Every (model, FileField) pair that stores into the content-addressed store."""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and isinstance(
+                field.storage, ContentAddressedStorage
+            ):
+                yield model, field
+
+
+def live_references() -> Counter:
+    references = Counter()
+    for model, field in blob_fields():
+        names = (
+            model._default_manager.exclude(**{field.name: ""})
+            .exclude(**{f"{field.name}__isnull": True})
+            .values_list(field.name, flat=True)
+        )
+        references.update(names.iterator())
+    return references
+
+
+def collect_garbage(grace_seconds: int | None = None, dry_run: bool = False) -> dict[str, int]:
+    """Fix refcounts, then delete unreferenced blobs and stray files.
+
+    Only blobs untouched for ``grace_seconds`` are removed, so an upload
+    whose row has not been committed yet is never collected.
+    """
+    if grace_seconds is None:
+        grace_seconds = getattr(settings, "BLOB_GC_GRACE_SECONDS", 3600)
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+    references = live_references()
+    stats = {"recounted": 0, "deleted_blobs": 0, "deleted_files": 0}
+
+    changed = []
+    for blob in Blob.objects.only("pk", "name", "refcount").iterator():
+        actual = references.get(blob.name, 0)
+        if blob.refcount != actual:
+            blob.refcount = actual
+            changed.append(blob)
+    stats["recounted"] = len(changed)
+    if not dry_run:
+        Blob.objects.bulk_update(changed, ["refcount"], batch_size=500)
+
+    doomed = list(
+        Blob.objects.filter(refcount=0, updated_at__lt=cutoff).values_list("pk", "name")
+    )
+    for pk, name in doomed:
+        if references.get(name):
+            continue
+        if dry_run:
+            stats["deleted_blobs"] += 1
+            continue
+        # the row goes first; an upload that referenced it meanwhile keeps both
+        deleted, _ = Blob.objects.filter(pk=pk, refcount=0, updated_at__lt=cutoff).delete()
+        if not deleted:
+            continue
+        blob_storage.purge(name, keep_if=lambda name=name: Blob.objects.filter(name=name).exists())
+        stats["deleted_blobs"] += 1
+
+    stats["deleted_files"] = _remove_stray_files(cutoff.timestamp(), dry_run)
+    return stats
+
+
+def _remove_stray_files(cutoff_ts: float, dry_run: bool) -> int:
+    """Delete files under ``cas/`` that no Blob row knows about (crashed
+    uploads, leftover temp files, variants of purged blobs)."""
+    root = blob_storage.path(PREFIX)
+    if not os.path.isdir(root):
+        return 0
+    known = set(Blob.objects.values_list("name", flat=True))
+    known_stems = {posixpath.splitext(posixpath.basename(name))[0] for name in known}
+    removed = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relative = posixpath.join(
+                PREFIX, *os.path.relpath(path, root).split(os.sep)
+            )
+            if os.path.basename(dirpath) == "variants":
+                if filename.rsplit("_", 1)[0] in known_stems:
+                    continue
+            elif relative in known:
+                continue
+            try:
+                if os.path.getmtime(path) >= cutoff_ts:
+                    continue
+                if not dry_run:
+                    os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+    return removed
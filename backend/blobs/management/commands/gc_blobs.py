@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blobs.gc import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Recount blob references and delete blobs and files nothing refers to."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-seconds",
+            type=int,
+            default=None,
+            help="only collect blobs untouched for this long (default BLOB_GC_GRACE_SECONDS)",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(options["grace_seconds"], dry_run=options["dry_run"])
+        prefix = "[dry run] " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}recounted {stats['recounted']} blobs, deleted "
+                f"{stats['deleted_blobs']} blobs and {stats['deleted_files']} stray files"
+            )
+        )
@@ -0,0 +1,37 @@
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class Blob(models.Model):
+    """One stored file in the content-addressed store.
+
+    ``refcount`` is bumped on every save and decremented on delete. Those
+    counts can drift (e.g. Django never deletes a replaced FileField value),
+    so ``manage.py gc_blobs`` recomputes them from the real references
+    before deleting anything.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def add_reference(cls, name: str, digest: str, size: int) -> None:
+        blob, created = cls.objects.get_or_create(
+            name=name, defaults={"digest": digest, "size": size, "refcount": 1}
+        )
+        if not created:
+            cls.objects.filter(pk=blob.pk).update(
+                refcount=F("refcount") + 1, updated_at=timezone.now()
+            )
+
+    @classmethod
+    def drop_reference(cls, name: str) -> None:
+        cls.objects.filter(name=name, refcount__gt=0).update(refcount=F("refcount") - 1)
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.refcount} refs)"
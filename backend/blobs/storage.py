@@ -0,0 +1,113 @@
+"""Content-addressed file storage.
+
+Files are stored as ``cas/<aa>/<bb>/<sha256><ext>`` whatever name they were
+uploaded under, so identical uploads share one file and a URL never changes
+meaning. That makes the URLs safe to serve with far-future cache headers
+(see ``blobs.views.serve_blob``).
+
+Derived files such as avatar thumbnails are not content-addressed: they are
+written through ``variant_storage`` under a name derived from the source
+digest, which keeps them immutable too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+PREFIX = "cas"
+
+
+def blob_name(digest: str, ext: str = "") -> str:
+    return posixpath.join(PREFIX, digest[:2], digest[2:4], f"{digest}{ext}")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.variant_storage = FileSystemStorage(*args, **kwargs)
+
+    def get_available_name(self, name, max_length=None):
+        # the final name is the digest; collisions are the whole point
+        return name
+
+    def _save(self, name, content):
+        from blobs.models import Blob
+
+        ext = posixpath.splitext(name)[1].lower()[:16]
+        tmp_dir = self.path(posixpath.join(PREFIX, "tmp"))
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            final_name = blob_name(digest.hexdigest(), ext)
+            # reference first, then look for the file: a gc_blobs purge that
+            # raced with this upload has either already moved the file away
+            # (so it is written again here) or will see the reference and
+            # put it back (see purge)
+            Blob.add_reference(final_name, digest.hexdigest(), size)
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                os.unlink(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(final_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return final_name
+
+    def delete(self, name):
+        # the file may be shared; gc_blobs removes it once nothing uses it
+        from blobs.models import Blob
+
+        Blob.drop_reference(name)
+
+    def purge(self, name, keep_if=None):
+        """Really remove ``name`` and its derived variants from disk.
+
+        The file is first moved aside. If ``keep_if()`` then says the blob is
+        wanted again (an identical upload referenced it meanwhile), it is
+        moved back instead of deleted.
+        """
+        path = self.path(name)
+        aside = f"{path}.purging"
+        try:
+            os.replace(path, aside)
+        except FileNotFoundError:
+            aside = None
+        if keep_if is not None and keep_if():
+            if aside is not None:
+                if os.path.exists(path):
+                    os.unlink(aside)
+                else:
+                    os.replace(aside, path)
+            return
+        if aside is not None:
+            os.unlink(aside)
+        stem = posixpath.splitext(posixpath.basename(name))[0]
+        variants_dir = posixpath.join(posixpath.dirname(name), "variants")
+        if self.exists(variants_dir):
+            for filename in self.listdir(variants_dir)[1]:
+                if filename.startswith(f"{stem}_"):
+                    self.variant_storage.delete(posixpath.join(variants_dir, filename))
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    return blob_storage
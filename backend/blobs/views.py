@@ -0,0 +1,33 @@
+import mimetypes
+import posixpath
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.views.decorators.http import require_safe
+
+from .storage import PREFIX, blob_storage
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@require_safe
+def serve_blob(request, path):
+    """Serve a content-addressed file with far-future cache headers.
+
+    In production the reverse proxy should serve ``MEDIA_URL/cas/`` directly
+    with the same ``Cache-Control`` header; this view keeps dev and small
+    deployments correct.
+    """
+    name = posixpath.join(PREFIX, path)
+    try:
+        if not blob_storage.exists(name) or posixpath.basename(name) == "":
+            raise Http404("Blob not found")
+        handle = blob_storage.open(name, "rb")
+    except (SuspiciousFileOperation, IsADirectoryError):
+        raise Http404("Blob not found")
+
+    content_type, _ = mimetypes.guess_type(name)
+    response = FileResponse(handle, content_type=content_type or "application/octet-stream")
+    response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response["ETag"] = f'"{posixpath.splitext(posixpath.basename(name))[0]}"'
+    return response
@@ -1,3 +1,22 @@
 from django.contrib import admin
 
-# Register your models here.
+from buyers.models import DailyPriceRollup, PriceObservation
+
+
+@admin.register(PriceObservation)
+class PriceObservationAdmin(admin.ModelAdmin):
+    list_display = ("species", "region", "price_per_unit", "previous_price", "volume", "observed_at")
+    list_filter = ("species",)
+    search_fields = ("batch_code", "species", "region")
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyPriceRollup)
+class DailyPriceRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "species", "region", "country_of_origin", "count", "min_price", "max_price")
+    list_filter = ("species",)
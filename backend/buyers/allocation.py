@@ -0,0 +1,262 @@
+"""Fill one requirement from several batches at minimum total price.
+
+Batches are bought whole, so this is a 0/1 knapsack with a volume window:
+choose batches whose total quantity lies in ``[min_volume, max_volume]``
+and whose total price (``price_per_unit * quantity``) is lowest.
+
+The solver starts from a greedy fill in unit-price order and then runs a
+local search (add, drop or swap one batch, or merge two into one) on
+``cost + penalty * volume violation`` until no move improves or the time
+budget runs out. The same search repairs a greedy start that is short or
+over. Local optima are escaped by dropping part of the best selection and
+refilling it, until several restarts in a row bring nothing. The fractional
+relaxation gives a lower bound, so callers can see how far from optimal a
+result can at most be.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from buyers.models import BuyerRequirement
+from buyers.services import find_market_matches
+
+
+@dataclass
+class Candidate:
+    listing_id: int
+    batch_id: int
+    batch_code: str
+    quantity: int
+    price_per_unit: Decimal
+
+    @property
+    def cost(self) -> Decimal:
+        return self.price_per_unit * self.quantity
+
+
+@dataclass
+class Allocation:
+    feasible: bool
+    min_volume: int
+    max_volume: int | None
+    chosen: list[Candidate] = field(default_factory=list)
+    candidates: int = 0
+    lower_bound: Decimal | None = None
+    iterations: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def total_volume(self) -> int:
+        return sum(candidate.quantity for candidate in self.chosen)
+
+    @property
+    def total_price(self) -> Decimal:
+        return sum((candidate.cost for candidate in self.chosen), Decimal("0"))
+
+    def as_dict(self) -> dict:
+        return {
+            "feasible": self.feasible,
+            "min_volume": self.min_volume,
+            "max_volume": self.max_volume,
+            "total_volume": self.total_volume if self.feasible else None,
+            "total_price": str(self.total_price) if self.feasible else None,
+            "lower_bound": str(self.lower_bound) if self.lower_bound is not None else None,
+            "candidates": self.candidates,
+            "iterations": self.iterations,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "batches": [
+                {
+                    "batch_id": candidate.batch_id,
+                    "batch_code": candidate.batch_code,
+                    "quantity": candidate.quantity,
+                    "price_per_unit": str(candidate.price_per_unit),
+                    "total_price": str(candidate.cost),
+                }
+                for candidate in self.chosen
+            ]
+            if self.feasible
+            else [],
+        }
+
+
+def volume_window(requirement: BuyerRequirement) -> tuple[int, int | None]:
+    minimum = requirement.min_volume or requirement.volume_required
+    maximum = requirement.max_volume or None
+    return minimum, maximum
+
+
+def load_candidates(requirement: BuyerRequirement) -> list[Candidate]:
+    rows = (
+        find_market_matches(requirement, per_batch_volume=False)
+        .prefetch_related(None)
+        .exclude(price_per_unit=None)
+        .filter(batch__quantity__gt=0)
+        .order_by()
+        .values_list("pk", "batch_id", "batch__batch_code", "batch__quantity", "price_per_unit")
+    )
+    return [Candidate(*row) for row in rows]
+
+
+def fractional_lower_bound(candidates: list[Candidate], minimum: int) -> Decimal | None:
+    """Cheapest cost of ``minimum`` units if batches could be split."""
+    remaining = minimum
+    bound = Decimal("0")
+    for candidate in sorted(candidates, key=lambda c: c.price_per_unit):
+        take = min(remaining, candidate.quantity)
+        bound += candidate.price_per_unit * take
+        remaining -= take
+        if remaining <= 0:
+            return bound
+    return None
+
+
+def solve(
+    candidates: list[Candidate],
+    minimum: int,
+    maximum: int | None,
+    time_budget: float = 0.5,
+    restarts: int = 30,
+) -> Allocation:
+    started = time.perf_counter()
+    deadline = started + time_budget
+    result = Allocation(
+        feasible=False, min_volume=minimum, max_volume=maximum, candidates=len(candidates)
+    )
+    result.lower_bound = fractional_lower_bound(candidates, minimum)
+    if result.lower_bound is None:
+        # not enough volume on the market, nothing to search
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    # floats inside the hot loop; exact Decimals only for the reported totals
+    order = sorted(
+        range(len(candidates)),
+        key=lambda i: (candidates[i].price_per_unit, -candidates[i].quantity),
+    )
+    quantity = [candidates[i].quantity for i in order]
+    cost = [float(candidates[i].cost) for i in order]
+    upper = maximum if maximum is not None else float("inf")
+    # any unit of violation costs more than the dearest whole selection
+    penalty = sum(cost) + 1.0
+    # seeded so the same market always gives the same answer
+    rng = random.Random(len(order))
+
+    def objective(chosen: set[int]) -> float:
+        volume = sum(quantity[i] for i in chosen)
+        violation = max(0, minimum - volume) + max(0, volume - upper)
+        return sum(cost[i] for i in chosen) + penalty * violation
+
+    def fill(chosen: set[int], skip: float = 0.0) -> set[int]:
+        volume = sum(quantity[i] for i in chosen)
+        for index, amount in enumerate(quantity):
+            if volume >= minimum:
+                break
+            if index in chosen or (skip and rng.random() < skip):
+                continue
+            if volume + amount <= upper:
+                chosen.add(index)
+                volume += amount
+        return chosen
+
+    best = local_search(fill(set()), quantity, cost, minimum, upper, penalty, deadline)
+    best_value = objective(best)
+    iterations, stale = 1, 0
+    while stale < restarts and len(best) and time.perf_counter() < deadline:
+        # perturb: drop part of the best selection, refill while skipping
+        # some of the cheapest batches, then descend again
+        kept = {i for i in best if rng.random() < 0.5}
+        trial = local_search(
+            fill(kept, skip=0.3), quantity, cost, minimum, upper, penalty, deadline
+        )
+        trial_value = objective(trial)
+        iterations += 1
+        if trial_value < best_value - 1e-9:
+            best, best_value, stale = trial, trial_value, 0
+        else:
+            stale += 1
+
+    volume = sum(quantity[i] for i in best)
+    result.iterations = iterations
+    result.feasible = minimum <= volume <= upper
+    result.chosen = sorted(
+        (candidates[order[i]] for i in best), key=lambda c: (c.price_per_unit, c.batch_id)
+    )
+    result.elapsed_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+def local_search(
+    chosen: set[int],
+    quantity: list[int],
+    cost: list[float],
+    minimum: int,
+    upper: float,
+    penalty: float,
+    deadline: float,
+) -> set[int]:
+    """Best-improvement descent over add, drop, swap and two-into-one moves."""
+
+    def objective(volume: int, spend: float) -> float:
+        violation = max(0, minimum - volume) + max(0, volume - upper)
+        return spend + penalty * violation
+
+    chosen = set(chosen)
+    volume = sum(quantity[i] for i in chosen)
+    spend = sum(cost[i] for i in chosen)
+    current = objective(volume, spend)
+    while time.perf_counter() < deadline:
+        inside = sorted(chosen)
+        outside = [i for i in range(len(quantity)) if i not in chosen]
+
+        best_move, best_value = None, current
+        for i in inside:
+            value = objective(volume - quantity[i], spend - cost[i])
+            if value < best_value - 1e-9:
+                best_move, best_value = ((i,), ()), value
+        for j in outside:
+            value = objective(volume + quantity[j], spend + cost[j])
+            if value < best_value - 1e-9:
+                best_move, best_value = ((), (j,)), value
+        for i in inside:
+            base_volume, base_spend = volume - quantity[i], spend - cost[i]
+            for j in outside:
+                value = objective(base_volume + quantity[j], base_spend + cost[j])
+                if value < best_value - 1e-9:
+                    best_move, best_value = ((i,), (j,)), value
+            if time.perf_counter() >= deadline:
+                break
+        # merge two chosen batches into one; the chosen set stays small, so
+        # this is cheap and gets past the fill that greedy picks in price order
+        for position, i in enumerate(inside):
+            if time.perf_counter() >= deadline:
+                break
+            for k in inside[position + 1 :]:
+                base_volume = volume - quantity[i] - quantity[k]
+                base_spend = spend - cost[i] - cost[k]
+                for j in outside:
+                    value = objective(base_volume + quantity[j], base_spend + cost[j])
+                    if value < best_value - 1e-9:
+                        best_move, best_value = ((i, k), (j,)), value
+
+        if best_move is None:
+            break
+        removed, added = best_move
+        for i in removed:
+            chosen.discard(i)
+            volume -= quantity[i]
+            spend -= cost[i]
+        for j in added:
+            chosen.add(j)
+            volume += quantity[j]
+            spend += cost[j]
+        current = best_value
+    return chosen
+
+
+def allocate(requirement: BuyerRequirement, time_budget: float = 0.5) -> Allocation:
+    minimum, maximum = volume_window(requirement)
+    return solve(load_candidates(requirement), minimum, maximum, time_budget)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BuyersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'buyers'
+
+    def ready(self):
+        from buyers import signals  # noqa: F401
@@ -0,0 +1,39 @@
+"""Catalog version: a counter bumped whenever anything listed may change.
+
+Derived data (facet counts, ...) is cached under the current version, so a
+bump invalidates every entry at once without scanning keys.
+"""
+
+from __future__ import annotations
+
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "catalog:version"
+
+
+def _fresh_version() -> int:
+    # seeded from the clock so a lost key never reuses an older version
+    return time.time_ns() // 1000
+
+
+def catalog_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_catalog_version() -> None:
+    """Invalidate catalog-derived caches once the current transaction commits."""
+
+    def bump():
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, _fresh_version(), timeout=None)
+
+    transaction.on_commit(bump)
@@ -0,0 +1,142 @@
+"""Facet counts for the marketplace filter sidebar.
+
+Each facet is counted under every active filter except its own (so picking
+"Tuna" still shows how many listings the other species have). Filtering
+goes through ``apply_market_filters``, so counts always agree with the
+listing. Facets whose own filter is not set share one filtered queryset,
+and their contaminant buckets share a single aggregate query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from buyers.catalog import catalog_version
+from buyers.models import BatchMarketInfo
+from buyers.services import CONTAMINANT_PARAM_MAP, apply_market_filters
+
+# facet name -> (query param that filters it, model field)
+VALUE_FACETS = {
+    "species": ("species", "species"),
+    "region": ("region", "region"),
+    "country_of_origin": ("country_of_origin", "country_of_origin"),
+    "destination_country": ("destination_country", "destination_country"),
+}
+
+# upper bounds offered in the sidebar; counts are "listings at or below"
+CONTAMINANT_BUCKETS = {
+    "mercury": ("max_mercury", "contaminant_mercury_ppm", ["0.1", "0.3", "0.5", "1.0"]),
+    "cesium": ("max_cesium", "contaminant_cesium_ppm", ["0.01", "0.05", "0.1", "0.5"]),
+    "ecoli": ("max_ecoli", "contaminant_ecoli_cfu", ["10", "100", "230", "700"]),
+}
+
+FILTER_PARAMS = (
+    *[param for param, _field in VALUE_FACETS.values()],
+    *CONTAMINANT_PARAM_MAP,
+    "min_volume",
+    "max_volume",
+)
+
+
+def _catalog_queryset():
+    return BatchMarketInfo.objects.filter(
+        batch__is_allowed_for_catalog=True,
+        batch__qc_status="brin_verified_pass",
+    )
+
+
+def _normalise(params) -> dict[str, str]:
+    normalised = {}
+    for name in FILTER_PARAMS:
+        value = params.get(name)
+        if value not in (None, ""):
+            value = str(value).strip()
+            if name in VALUE_FACETS:
+                value = value.lower()  # value filters are case-insensitive
+            normalised[name] = value
+    return normalised
+
+
+def _without(params: dict[str, str], name: str) -> dict[str, str]:
+    return {key: value for key, value in params.items() if key != name}
+
+
+def _filtered(params: dict[str, str]):
+    return apply_market_filters(_catalog_queryset(), params).order_by()
+
+
+def _value_counts(params: dict[str, str], field: str) -> list[dict]:
+    rows = (
+        _filtered(params)
+        .exclude(**{field: ""})
+        .values(field)
+        .annotate(count=Count("pk"))
+        .order_by("-count", field)
+    )
+    return [{"value": row[field], "count": row["count"]} for row in rows]
+
+
+def _contaminant_counts(params: dict[str, str], names: list[str]) -> dict[str, dict]:
+    aggregates = {}
+    for name in names:
+        _param, field, bounds = CONTAMINANT_BUCKETS[name]
+        for index, bound in enumerate(bounds):
+            aggregates[f"{name}_{index}"] = Count(
+                "pk", filter=Q(**{f"{field}__lte": Decimal(bound)})
+            )
+        aggregates[f"{name}_unknown"] = Count("pk", filter=Q(**{f"{field}__isnull": True}))
+    aggregates["total"] = Count("pk")
+    totals = _filtered(params).aggregate(**aggregates)
+
+    result = {}
+    for name in names:
+        param, _field, bounds = CONTAMINANT_BUCKETS[name]
+        result[name] = {
+            "param": param,
+            "total": totals["total"],
+            "unknown": totals[f"{name}_unknown"],
+            "buckets": [
+                {"max": bound, "count": totals[f"{name}_{index}"]}
+                for index, bound in enumerate(bounds)
+            ],
+        }
+    return result
+
+
+def compute_facets(params) -> dict:
+    params = _normalise(params)
+    facets: dict = {}
+    for name, (param, field) in VALUE_FACETS.items():
+        facets[name] = _value_counts(_without(params, param), field)
+
+    # group contaminant facets by the filters they run under
+    groups: dict[tuple, list[str]] = {}
+    for name, (param, _field, _bounds) in CONTAMINANT_BUCKETS.items():
+        effective = _without(params, param)
+        groups.setdefault(tuple(sorted(effective.items())), []).append(name)
+    contaminants: dict = {}
+    for effective, names in groups.items():
+        contaminants.update(_contaminant_counts(dict(effective), names))
+    facets["contaminants"] = {name: contaminants[name] for name in CONTAMINANT_BUCKETS}
+    return facets
+
+
+def get_facets(params) -> dict:
+    """Facets for ``params``, cached per catalog version and normalised filters."""
+    version = catalog_version()
+    normalised = _normalise(params)
+    digest = hashlib.sha1(
+        json.dumps(normalised, sort_keys=True).encode()
+    ).hexdigest()
+    key = f"market-facets:{version}:{digest}"
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(normalised)
+        cache.set(key, facets, getattr(settings, "MARKET_FACETS_CACHE_TTL", 300))
+    return {"catalog_version": version, **facets}
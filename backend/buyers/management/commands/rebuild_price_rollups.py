@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from buyers.prices import rebuild_price_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily price rollups from the price history."
+
+    def handle(self, *args, **options):
+        count = rebuild_price_rollups()
+        self.stdout.write(self.style.SUCCESS(f"rolled up {count} price observations"))
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def seed_price_history(apps, schema_editor):
+    # current prices become the first observations, dated at the listing's last edit
+    BatchMarketInfo = apps.get_model('buyers', 'BatchMarketInfo')
+    PriceObservation = apps.get_model('buyers', 'PriceObservation')
+    DailyPriceRollup = apps.get_model('buyers', 'DailyPriceRollup')
+    observations = [
+        PriceObservation(
+            listing_id=info.pk,
+            batch_code=info.batch.batch_code,
+            species=info.species,
+            region=info.region,
+            country_of_origin=info.country_of_origin,
+            price_per_unit=info.price_per_unit,
+            volume=info.batch.quantity,
+            observed_at=info.updated_at,
+        )
+        for info in BatchMarketInfo.objects.select_related('batch').exclude(price_per_unit=None)
+    ]
+    PriceObservation.objects.bulk_create(observations, batch_size=1000)
+
+    rollups = {}
+    for observation in observations:
+        key = (
+            timezone.localtime(observation.observed_at).date(),
+            observation.species.strip().lower(),
+            observation.region.strip().lower(),
+            observation.country_of_origin.strip().lower(),
+        )
+        price = observation.price_per_unit
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = DailyPriceRollup(
+                day=key[0], species=key[1], region=key[2], country_of_origin=key[3],
+                count=0, min_price=price, max_price=price,
+            )
+        rollup.count += 1
+        rollup.min_price = min(rollup.min_price, price)
+        rollup.max_price = max(rollup.max_price, price)
+        rollup.price_sum += price
+        rollup.volume_sum += observation.volume
+        rollup.value_sum += price * observation.volume
+    DailyPriceRollup.objects.bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0002_buyerrequirement_buyer_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPriceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('species', models.CharField(max_length=128)),
+                ('region', models.CharField(blank=True, max_length=128)),
+                ('country_of_origin', models.CharField(blank=True, max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('volume_sum', models.PositiveBigIntegerField(default=0)),
+                ('value_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('species', 'day', 'region', 'country_of_origin'), name='daily_price_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceObservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_code', models.CharField(max_length=64)),
+                ('species', models.CharField(max_length=128)),
+                ('region', models.CharField(blank=True, max_length=128)),
+                ('country_of_origin', models.CharField(blank=True, max_length=64)),
+                ('price_per_unit', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('previous_price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('volume', models.PositiveIntegerField(default=0)),
+                ('observed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('listing', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='price_observations', to='buyers.batchmarketinfo')),
+            ],
+            options={
+                'ordering': ['observed_at', 'pk'],
+            },
+        ),
+        migrations.RunPython(seed_price_history, migrations.RunPython.noop),
+    ]
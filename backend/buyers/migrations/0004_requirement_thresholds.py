@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:39
+
+from decimal import Decimal, InvalidOperation
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+THRESHOLD_FIELDS = {
+    'mercury': 'max_mercury_ppm',
+    'cesium': 'max_cesium_ppm',
+    'ecoli': 'max_ecoli_cfu',
+    'total_ppm': 'max_total_ppm',
+}
+
+
+def copy_thresholds(apps, schema_editor):
+    BuyerRequirement = apps.get_model('buyers', 'BuyerRequirement')
+    pending = []
+    for requirement in BuyerRequirement.objects.only('pk', 'allowed_contaminants').iterator(chunk_size=2000):
+        limits = requirement.allowed_contaminants or {}
+        for key, field in THRESHOLD_FIELDS.items():
+            raw = limits.get(key)
+            try:
+                value = None if raw is None else Decimal(str(raw))
+            except (InvalidOperation, TypeError, ValueError):
+                value = None
+            setattr(requirement, field, value)
+        pending.append(requirement)
+        if len(pending) >= 2000:
+            BuyerRequirement.objects.bulk_update(pending, THRESHOLD_FIELDS.values())
+            pending = []
+    BuyerRequirement.objects.bulk_update(pending, THRESHOLD_FIELDS.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0003_price_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='buyerrequirement',
+            name='max_cesium_ppm',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, editable=False, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='buyerrequirement',
+            name='max_ecoli_cfu',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, editable=False, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='buyerrequirement',
+            name='max_mercury_ppm',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, editable=False, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='buyerrequirement',
+            name='max_total_ppm',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=3, editable=False, max_digits=12, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='buyerrequirement',
+            index=models.Index(django.db.models.functions.text.Lower('product_type'), models.F('status'), models.F('shipping_window_start'), name='requirement_match_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='buyerrequirement',
+            index=models.Index(fields=['status', 'shipping_window_start', 'shipping_window_end'], name='requirement_window_idx'),
+        ),
+        migrations.RunPython(copy_thresholds, migrations.RunPython.noop),
+    ]
@@ -2,12 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import json
+from decimal import Decimal, InvalidOperation
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
+def _threshold(raw) -> Decimal | None:
+    if raw is None:
+        return None
+    try:
+        return Decimal(str(raw))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
 class BuyerRequirement(models.Model):
     STATUS_OPEN = "OPEN"
     STATUS_MATCHED = "MATCHED"
@@ -32,6 +43,20 @@ class BuyerRequirement(models.Model):
     max_volume = models.PositiveIntegerField(default=0)
     volume_required = models.PositiveIntegerField(default=0)
     allowed_contaminants = models.JSONField(default=dict)
+    # typed copies of allowed_contaminants, kept in sync by save() so the
+    # reverse match (which requirements accept this batch?) runs in SQL
+    max_mercury_ppm = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True, editable=False, db_index=True
+    )
+    max_cesium_ppm = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True, editable=False, db_index=True
+    )
+    max_ecoli_cfu = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True, editable=False, db_index=True
+    )
+    max_total_ppm = models.DecimalField(
+        max_digits=12, decimal_places=3, null=True, blank=True, editable=False, db_index=True
+    )
     shipping_window_start = models.DateField()
     shipping_window_end = models.DateField()
     destination_country = models.CharField(max_length=64, blank=True)
@@ -43,6 +68,32 @@ class BuyerRequirement(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    THRESHOLD_FIELDS = {
+        "mercury": "max_mercury_ppm",
+        "cesium": "max_cesium_ppm",
+        "ecoli": "max_ecoli_cfu",
+        "total_ppm": "max_total_ppm",
+    }
+
+    class Meta:
+        indexes = [
+            models.Index(
+                Lower("product_type"),
+                "status",
+                "shipping_window_start",
+                name="requirement_match_idx",
+            ),
+            models.Index(
+                fields=["status", "shipping_window_start", "shipping_window_end"],
+                name="requirement_window_idx",
+            ),
+        ]
+
+    def sync_thresholds(self) -> None:
+        limits = self.allowed_contaminants or {}
+        for key, field in self.THRESHOLD_FIELDS.items():
+            setattr(self, field, _threshold(limits.get(key)))
+
     def latest_quality_check(self) -> "QualityCheckLog | None":
         return self.quality_checks.order_by("-created_at").first()
 
@@ -51,6 +102,10 @@ class BuyerRequirement(models.Model):
             self.volume_required = self.max_volume
         elif self.min_volume:
             self.volume_required = self.min_volume
+        self.sync_thresholds()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "allowed_contaminants" in update_fields:
+            kwargs["update_fields"] = {*update_fields, *self.THRESHOLD_FIELDS.values()}
         super().save(*args, **kwargs)
 
     def __str__(self) -> str:
@@ -162,3 +217,71 @@ class BatchMarketInfo(models.Model):
 
     def __str__(self) -> str:
         return f"Marketplace info for {self.batch.batch_code}"
+
+
+class PriceObservation(models.Model):
+    """Append-only record of every listed price, taken whenever it changes.
+
+    Species/region/country are copied at observation time so history stays
+    meaningful after the listing is edited or removed.
+    """
+
+    listing = models.ForeignKey(
+        BatchMarketInfo,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="price_observations",
+    )
+    batch_code = models.CharField(max_length=64)
+    species = models.CharField(max_length=128)
+    region = models.CharField(max_length=128, blank=True)
+    country_of_origin = models.CharField(max_length=64, blank=True)
+    price_per_unit = models.DecimalField(max_digits=12, decimal_places=2)
+    previous_price = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, blank=True
+    )
+    volume = models.PositiveIntegerField(default=0)
+    observed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["observed_at", "pk"]
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Price observations are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return f"{self.species} {self.price_per_unit} @ {self.observed_at:%Y-%m-%d}"
+
+
+class DailyPriceRollup(models.Model):
+    """Per-day price aggregates by species, region and country of origin.
+
+    Keys are stored lower-cased so lookups hit the unique index. Sums rather
+    than averages are stored so each observation is a plain increment; avg
+    and VWAP are derived when read.
+    """
+
+    day = models.DateField()
+    species = models.CharField(max_length=128)
+    region = models.CharField(max_length=128, blank=True)
+    country_of_origin = models.CharField(max_length=64, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    min_price = models.DecimalField(max_digits=12, decimal_places=2)
+    max_price = models.DecimalField(max_digits=12, decimal_places=2)
+    price_sum = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    volume_sum = models.PositiveBigIntegerField(default=0)
+    value_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["species", "day", "region", "country_of_origin"],
+                name="daily_price_rollup_key",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.species} {self.day}: {self.count} prices"
@@ -0,0 +1,161 @@
+"""Price history and the daily price rollups built from it."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Min, Max, Sum
+from django.db.models.functions import Greatest, Least, TruncMonth, TruncWeek
+from django.utils import timezone
+from rest_framework import serializers
+
+from buyers.models import BatchMarketInfo, DailyPriceRollup, PriceObservation
+
+INTERVALS = {"day": None, "week": TruncWeek, "month": TruncMonth}
+CENT = Decimal("0.01")
+
+
+def _key(value: str) -> str:
+    return (value or "").strip().lower()
+
+
+def record_price(info: BatchMarketInfo, previous_price: Decimal | None) -> PriceObservation | None:
+    """Append an observation (and roll it up) if the listing's price changed."""
+    if info.price_per_unit is None or info.price_per_unit == previous_price:
+        return None
+    observation = PriceObservation.objects.create(
+        listing=info,
+        batch_code=info.batch.batch_code,
+        species=info.species,
+        region=info.region,
+        country_of_origin=info.country_of_origin,
+        price_per_unit=info.price_per_unit,
+        previous_price=previous_price,
+        volume=info.batch.quantity,
+        observed_at=timezone.now(),
+    )
+    add_to_rollup(observation)
+    return observation
+
+
+def add_to_rollup(observation: PriceObservation) -> None:
+    price = observation.price_per_unit
+    lookup = {
+        "day": timezone.localtime(observation.observed_at).date(),
+        "species": _key(observation.species),
+        "region": _key(observation.region),
+        "country_of_origin": _key(observation.country_of_origin),
+    }
+    increments = {
+        "count": F("count") + 1,
+        "min_price": Least("min_price", price),
+        "max_price": Greatest("max_price", price),
+        "price_sum": F("price_sum") + price,
+        "volume_sum": F("volume_sum") + observation.volume,
+        "value_sum": F("value_sum") + price * observation.volume,
+    }
+    if DailyPriceRollup.objects.filter(**lookup).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            DailyPriceRollup.objects.create(
+                **lookup,
+                count=1,
+                min_price=price,
+                max_price=price,
+                price_sum=price,
+                volume_sum=observation.volume,
+                value_sum=price * observation.volume,
+            )
+    except IntegrityError:
+        DailyPriceRollup.objects.filter(**lookup).update(**increments)
+
+
+def rebuild_price_rollups() -> int:
+    """Recompute every daily rollup from the observation history."""
+    with transaction.atomic():
+        DailyPriceRollup.objects.all().delete()
+        written = 0
+        for observation in PriceObservation.objects.order_by("pk").iterator(chunk_size=2000):
+            add_to_rollup(observation)
+            written += 1
+    return written
+
+
+def _parse_date(raw: str | None, field: str, default: date) -> date:
+    if not raw:
+        return default
+    try:
+        return date.fromisoformat(raw)
+    except ValueError:
+        raise serializers.ValidationError({field: "Use YYYY-MM-DD."})
+
+
+def _money(value) -> str:
+    # backends disagree on the scale of aggregated decimals; always 2 places
+    return str(Decimal(value).quantize(CENT))
+
+
+def _ratio(numerator, denominator) -> str | None:
+    if not denominator:
+        return None
+    return _money(Decimal(numerator) / Decimal(denominator))
+
+
+def price_series(params) -> dict:
+    """Time series of price stats answered from ``DailyPriceRollup`` only.
+
+    Unspecified key columns are summed over, so ``species=tuna`` alone gives
+    the national picture and adding ``region`` narrows it.
+    """
+    today = timezone.localdate()
+    end = _parse_date(params.get("end"), "end", today)
+    start = _parse_date(params.get("start"), "start", end - timedelta(days=90))
+    if start > end:
+        raise serializers.ValidationError({"start": "Must not be after end."})
+    interval = params.get("interval") or "day"
+    if interval not in INTERVALS:
+        raise serializers.ValidationError({"interval": f"One of: {', '.join(INTERVALS)}."})
+
+    rollups = DailyPriceRollup.objects.filter(day__gte=start, day__lte=end)
+    filters = {}
+    for name in ("species", "region", "country_of_origin"):
+        if params.get(name):
+            filters[name] = _key(params[name])
+    rollups = rollups.filter(**filters)
+
+    trunc = INTERVALS[interval]
+    period = trunc("day") if trunc else F("day")
+    rows = (
+        rollups.annotate(period=period)
+        .values("period")
+        .annotate(
+            count=Sum("count"),
+            min_price=Min("min_price"),
+            max_price=Max("max_price"),
+            price_sum=Sum("price_sum"),
+            volume_sum=Sum("volume_sum"),
+            value_sum=Sum("value_sum"),
+        )
+        .order_by("period")
+    )
+    points = [
+        {
+            "period": row["period"].isoformat(),
+            "count": row["count"],
+            "min": _money(row["min_price"]),
+            "max": _money(row["max_price"]),
+            "avg": _ratio(row["price_sum"], row["count"]),
+            "vwap": _ratio(row["value_sum"], row["volume_sum"]),
+        }
+        for row in rows
+    ]
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "interval": interval,
+        "filters": filters,
+        "points": points,
+    }
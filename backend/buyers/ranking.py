@@ -0,0 +1,195 @@
+"""Relevance ranking for requirement matches, computed in SQL.
+
+Every component is a 0..1 float and the score is their weighted sum:
+
+* ``contaminants`` - mean headroom under the buyer's limits (1 - value/limit)
+* ``volume`` - how close the batch quantity is to the volume required
+* ``ready_date`` - how early in the shipping window the batch is ready
+* ``price`` - position between the dearest (0) and cheapest (1) candidate
+
+Pages are keyset cursors over ``(score DESC, pk ASC)``, so deep pages cost
+the same as the first one.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import (
+    Case,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    Max,
+    Min,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
+from django.db.models.functions import Abs, Cast, Coalesce, Greatest, Least
+from rest_framework import serializers
+
+from buyers.models import BatchMarketInfo, BuyerRequirement
+
+DEFAULT_WEIGHTS = {"contaminants": 35, "volume": 25, "ready_date": 20, "price": 20}
+
+CONTAMINANT_FIELDS = {
+    "mercury": "contaminant_mercury_ppm",
+    "cesium": "contaminant_cesium_ppm",
+    "ecoli": "contaminant_ecoli_cfu",
+}
+
+
+class DaysBetween(Func):
+    """Whole days from ``start`` to ``end`` for two date expressions."""
+
+    output_field = FloatField()
+    arity = 2
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL: date - date is an integer number of days
+        return super().as_sql(
+            compiler, connection, template="(%(expressions)s)", arg_joiner=" - ", **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="(julianday(%(expressions)s))",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="DATEDIFF", **extra_context
+        )
+
+
+def _float(expression) -> ExpressionWrapper:
+    return ExpressionWrapper(expression, output_field=FloatField())
+
+
+def _clamp(expression):
+    return Greatest(Least(_float(expression), Value(1.0)), Value(0.0))
+
+
+def _contaminant_component(requirement: BuyerRequirement):
+    parts = []
+    for key, field in CONTAMINANT_FIELDS.items():
+        limit = requirement.allowed_contaminants.get(key)
+        if limit is None:
+            continue
+        limit = float(limit)
+        if limit <= 0:
+            # only zero-contaminant batches pass a zero limit: full headroom
+            parts.append(Value(1.0))
+            continue
+        parts.append(_clamp(Value(1.0) - Cast(field, FloatField()) / Value(limit)))
+    if not parts:
+        return Value(1.0)
+    total = parts[0]
+    for part in parts[1:]:
+        total = total + part
+    return _float(total / Value(float(len(parts))))
+
+
+def _volume_component(requirement: BuyerRequirement):
+    target = requirement.volume_required or requirement.max_volume or requirement.min_volume
+    if not target:
+        return Value(1.0)
+    quantity = Cast("batch__quantity", FloatField())
+    return _clamp(
+        Value(1.0)
+        - Abs(quantity - Value(float(target))) / Greatest(quantity, Value(float(target)))
+    )
+
+
+def _ready_date_component(requirement: BuyerRequirement):
+    start, end = requirement.shipping_window_start, requirement.shipping_window_end
+    if not (start and end):
+        return Value(1.0)
+    window_days = float((end - start).days + 1)
+    days_in = DaysBetween(F("ready_date"), Value(start))
+    return Coalesce(_clamp(Value(1.0) - days_in / Value(window_days)), Value(0.0))
+
+
+def _price_component(queryset: QuerySet):
+    bounds = queryset.order_by().aggregate(low=Min("price_per_unit"), high=Max("price_per_unit"))
+    low, high = bounds["low"], bounds["high"]
+    if low is None or high == low:
+        return Case(When(price_per_unit__isnull=True, then=Value(0.5)), default=Value(1.0))
+    price = Cast("price_per_unit", FloatField())
+    return Coalesce(
+        _clamp((Value(float(high)) - price) / Value(float(high - low))), Value(0.5)
+    )
+
+
+def rank_matches(queryset: QuerySet[BatchMarketInfo], requirement: BuyerRequirement):
+    """Annotate each candidate with its score components and order by score."""
+    weights = getattr(settings, "MATCH_SCORE_WEIGHTS", DEFAULT_WEIGHTS)
+    components = {
+        "contaminants": _contaminant_component(requirement),
+        "volume": _volume_component(requirement),
+        "ready_date": _ready_date_component(requirement),
+        "price": _price_component(queryset),
+    }
+    annotated = queryset.annotate(
+        **{f"score_{name}": _float(expression) for name, expression in components.items()}
+    )
+    score = sum(
+        (F(f"score_{name}") * Value(float(weights.get(name, 0))) for name in components),
+        Value(0.0),
+    )
+    return annotated.annotate(match_score=_float(score)).order_by("-match_score", "pk")
+
+
+def encode_cursor(item: BatchMarketInfo) -> str:
+    raw = json.dumps({"s": item.match_score, "id": item.pk}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        return float(data["s"]), int(data["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise serializers.ValidationError({"cursor": "Invalid cursor."})
+
+
+def top_matches(
+    queryset: QuerySet[BatchMarketInfo],
+    requirement: BuyerRequirement,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[BatchMarketInfo], str | None]:
+    """One page of ranked matches and the cursor for the next page (or None)."""
+    ranked = rank_matches(queryset, requirement)
+    if cursor:
+        score, pk = decode_cursor(cursor)
+        ranked = ranked.filter(Q(match_score__lt=score) | Q(match_score=score, pk__gt=pk))
+    page = list(ranked[: limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def explain(item: BatchMarketInfo) -> dict:
+    weights = getattr(settings, "MATCH_SCORE_WEIGHTS", DEFAULT_WEIGHTS)
+    return {
+        name: {
+            "value": round(getattr(item, f"score_{name}"), 4),
+            "weight": weights.get(name, 0),
+            "points": round(getattr(item, f"score_{name}") * weights.get(name, 0), 2),
+        }
+        for name in DEFAULT_WEIGHTS
+    }
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Any
+import decimal
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Sequence
 
+from django.db.models import QuerySet
 from django.utils import timezone
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 from buyers.models import BatchMarketInfo, BuyerRequirement
+from suppliers.models import QcRecord
 
 
 class MarketplaceBatchSerializer(serializers.ModelSerializer):
@@ -68,6 +73,196 @@ class MarketplaceBatchSerializer(serializers.ModelSerializer):
         }
 
 
+class FastMarketplaceSerializer:
+    """Tuple-based twin of ``MarketplaceBatchSerializer`` for list pages.
+
+    Rows come from ``values_list()`` and every output field has a converter
+    compiled once from the DRF field it mirrors. The rendered JSON is
+    byte-identical to the DRF serializer's; use ``columns()``/``rows()`` to
+    fetch, then ``serialize()`` the page.
+    """
+
+    # output field -> values_list() column, for the plain model fields
+    SOURCES = {
+        "batch_id": "batch_id",
+        "batch_code": "batch__batch_code",
+        "volume_available": "batch__quantity",
+        "unit": "batch__unit",
+    }
+    EXTRA_COLUMNS = [
+        "batch__supplier_id",
+        "batch__supplier__first_name",
+        "batch__supplier__last_name",
+        "batch__supplier__username",
+        "size_min_mm",
+        "size_max_mm",
+    ]
+
+    _plan: list[tuple[str, Callable[[tuple, dict], Any]]] | None = None
+    _columns: list[str] = []
+    _batch_position = 0
+
+    @classmethod
+    def columns(cls) -> list[str]:
+        cls._compile()
+        return cls._columns
+
+    @classmethod
+    def rows(cls, queryset: QuerySet[BatchMarketInfo]) -> QuerySet:
+        return queryset.select_related(None).prefetch_related(None).values_list(*cls.columns())
+
+    @classmethod
+    def serialize(
+        cls, rows: Sequence[tuple], latest_qc: dict[int, tuple] | None = None
+    ) -> list[dict[str, Any]]:
+        plan = cls._compile()
+        if latest_qc is None:
+            latest_qc = cls.latest_qc(row[cls._batch_position] for row in rows)
+        context = {"qc": latest_qc, "tz": timezone.get_current_timezone()}
+        return [{key: convert(row, context) for key, convert in plan} for row in rows]
+
+    @staticmethod
+    def latest_qc(batch_ids: Iterable[int]) -> dict[int, tuple]:
+        # same pick as the serializer's prefetch: newest record per batch
+        latest: dict[int, tuple] = {}
+        records = (
+            QcRecord.objects.filter(batch_id__in=list(batch_ids))
+            .order_by("-created_at", "-pk")
+            .values_list("batch_id", "passed", "contamination_score", "record_hash", "created_at")
+        )
+        for record in records:
+            latest.setdefault(record[0], record)
+        return latest
+
+    @classmethod
+    def _compile(cls):
+        if cls._plan is not None:
+            return cls._plan
+        fields = MarketplaceBatchSerializer().fields
+        columns: list[str] = []
+        plan = []
+        for name, field in fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                continue
+            columns.append(cls.SOURCES.get(name, field.source))
+        index = {column: position for position, column in enumerate(columns + cls.EXTRA_COLUMNS)}
+
+        for name, field in fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                plan.append((name, getattr(cls, f"_{name}")(index)))
+            else:
+                position = index[cls.SOURCES.get(name, field.source)]
+                plan.append((name, _column_converter(field, position)))
+        cls._columns = columns + cls.EXTRA_COLUMNS
+        cls._batch_position = index["batch_id"]
+        cls._plan = plan
+        return plan
+
+    @staticmethod
+    def _supplier(index: dict[str, int]):
+        get = itemgetter(
+            index["batch__supplier_id"],
+            index["batch__supplier__first_name"],
+            index["batch__supplier__last_name"],
+            index["batch__supplier__username"],
+        )
+
+        def convert(row, context):
+            supplier_id, first_name, last_name, username = get(row)
+            if supplier_id is None:
+                return {"id": None, "name": "Unassigned"}
+            # User.get_full_name() or get_username()
+            return {"id": supplier_id, "name": f"{first_name} {last_name}".strip() or username}
+
+        return convert
+
+    @staticmethod
+    def _size_range(index: dict[str, int]):
+        get = itemgetter(index["size_min_mm"], index["size_max_mm"])
+
+        def convert(row, context):
+            low, high = get(row)
+            return {
+                "min_mm": float(low) if low is not None else None,
+                "max_mm": float(high) if high is not None else None,
+            }
+
+        return convert
+
+    @staticmethod
+    def _quality_summary(index: dict[str, int]):
+        position = index["batch_id"]
+
+        def convert(row, context):
+            record = context["qc"].get(row[position])
+            if record is None:
+                return None
+            _, passed, score, record_hash, created_at = record
+            return {
+                "status": "PASS" if passed else "FAIL",
+                "contamination_score": score,
+                "record_hash": record_hash,
+                # timezone.localtime() with the zone looked up once per page
+                "created_at": created_at.astimezone(context["tz"]).isoformat(),
+            }
+
+        return convert
+
+
+def _column_converter(field: serializers.Field, position: int) -> Callable[[tuple, dict], Any]:
+    """Compile ``field.to_representation`` for one tuple column (None stays None)."""
+    if isinstance(field, serializers.DecimalField):
+        convert = _decimal_converter(field)
+    elif isinstance(field, serializers.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format is None:
+            convert = None
+        elif output_format.lower() == ISO_8601:
+            convert = _isoformat
+        else:
+            convert = lambda value: value.strftime(output_format)  # noqa: E731
+    elif isinstance(field, serializers.IntegerField):
+        convert = int
+    elif isinstance(field, serializers.CharField):
+        convert = str
+    else:
+        convert = field.to_representation
+
+    if convert is None:
+        return lambda row, context: row[position]
+
+    def column(row, context):
+        value = row[position]
+        return None if value is None else convert(value)
+
+    return column
+
+
+def _isoformat(value) -> str:
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _decimal_converter(field: serializers.DecimalField) -> Callable[[Any], Any]:
+    if field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    rounding = field.rounding
+    # DRF copies the thread's context on every call; nothing here changes it,
+    # so one copy taken when compiling gives the same quantization
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        quantized = value.quantize(exponent, rounding=rounding, context=context)
+        return f"{quantized:f}" if coerce_to_string else quantized
+
+    return convert
+
+
 class BuyerRequirementSerializer(serializers.ModelSerializer):
     commodity = serializers.CharField(source="product_type")
     quality_summary = serializers.SerializerMethodField()
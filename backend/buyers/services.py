@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from decimal import Decimal, InvalidOperation
 
-from django.db.models import Prefetch, QuerySet
+from django.db.models import Prefetch, Q, QuerySet
+from django.db.models.functions import Lower
 from rest_framework import serializers
 
 from buyers.models import BatchMarketInfo, BuyerRequirement, QualityCheckLog
@@ -38,7 +39,7 @@ def create_quality_check(requirement: BuyerRequirement) -> QualityCheckLog:
 def _prefetched_market_queryset() -> QuerySet[BatchMarketInfo]:
     latest_qc = Prefetch(
         "batch__qc_records",
-        queryset=QcRecord.objects.order_by("-created_at")[:1],
+        queryset=QcRecord.objects.order_by("-created_at", "-pk")[:1],
         to_attr="latest_qc_list",
     )
     return (
@@ -101,6 +102,10 @@ def apply_market_filters(
             raise serializers.ValidationError({"max_volume": "Invalid number"})
         filtered = filtered.filter(batch__quantity__lte=max_value)
 
+    species = params.get("species")
+    if species:
+        filtered = filtered.filter(species__iexact=species)
+
     region = params.get("region")
     if region:
         filtered = filtered.filter(region__iexact=region)
@@ -137,12 +142,19 @@ def get_marketplace_queryset(params: dict[str, str] | None = None):
 def find_market_matches(
     requirement: BuyerRequirement,
     additional_filters: dict[str, str] | None = None,
+    per_batch_volume: bool = True,
 ) -> QuerySet[BatchMarketInfo]:
+    """Listings that satisfy ``requirement``.
+
+    With ``per_batch_volume=False`` a batch no longer has to cover the whole
+    volume on its own (for allocating several batches to one requirement).
+    """
     params = {
-        "min_volume": requirement.min_volume or None,
-        "max_volume": requirement.max_volume or None,
         "destination_country": requirement.destination_country,
     }
+    if per_batch_volume:
+        params["min_volume"] = requirement.min_volume or None
+        params["max_volume"] = requirement.max_volume or None
     for contaminant_key, lookup in [
         ("mercury", "max_mercury"),
         ("cesium", "max_cesium"),
@@ -164,3 +176,51 @@ def find_market_matches(
             ready_date__lte=requirement.shipping_window_end,
         )
     return apply_market_filters(queryset, params)
+
+
+# listing field -> requirement threshold column it is checked against
+REVERSE_CONTAMINANT_MAP = {
+    "contaminant_mercury_ppm": "max_mercury_ppm",
+    "contaminant_cesium_ppm": "max_cesium_ppm",
+    "contaminant_ecoli_cfu": "max_ecoli_cfu",
+}
+
+
+def find_requirements_for_batch(info: BatchMarketInfo) -> list[BuyerRequirement]:
+    """Reverse of ``find_market_matches``: open requirements this listing satisfies.
+
+    One SQL statement against the typed threshold columns; the product
+    match uses ``LOWER(product_type)`` so it can hit ``requirement_match_idx``.
+    """
+    batch = info.batch
+    if info.ready_date is None:
+        # every requirement has a shipping window, which an undated listing can't meet
+        return []
+    queryset = (
+        BuyerRequirement.objects.alias(product_key=Lower("product_type"))
+        .filter(
+            product_key=info.species.lower(),
+            status=BuyerRequirement.STATUS_OPEN,
+            shipping_window_start__lte=info.ready_date,
+            shipping_window_end__gte=info.ready_date,
+            min_volume__lte=batch.quantity,
+        )
+        .filter(Q(max_volume=0) | Q(max_volume__gte=batch.quantity))
+    )
+    if info.destination_country:
+        queryset = queryset.filter(
+            Q(destination_country="")
+            | Q(destination_country__iexact=info.destination_country)
+        )
+    else:
+        queryset = queryset.filter(destination_country="")
+    for field, threshold in REVERSE_CONTAMINANT_MAP.items():
+        value = getattr(info, field)
+        if value is None:
+            # an unmeasured contaminant only passes requirements without a limit
+            queryset = queryset.filter(**{f"{threshold}__isnull": True})
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{threshold}__isnull": True}) | Q(**{f"{threshold}__gte": value})
+            )
+    return list(queryset)
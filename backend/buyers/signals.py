@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from buyers.catalog import bump_catalog_version
+from buyers.models import BatchMarketInfo
+from buyers.prices import record_price
+from suppliers.models import ProductBatch
+
+
+@receiver(post_save, sender=BatchMarketInfo)
+@receiver(post_delete, sender=BatchMarketInfo)
+@receiver(post_save, sender=ProductBatch)
+@receiver(post_delete, sender=ProductBatch)
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(pre_save, sender=BatchMarketInfo)
+def remember_stored_price(sender, instance, raw=False, **kwargs):
+    # the stored row, not the instance, says what the price was before
+    instance._stored_price = (
+        None
+        if raw or instance.pk is None
+        else BatchMarketInfo.objects.filter(pk=instance.pk)
+        .values_list("price_per_unit", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=BatchMarketInfo)
+def record_price_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_price(instance, instance.__dict__.pop("_stored_price", None))
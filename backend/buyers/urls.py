@@ -3,7 +3,12 @@ from __future__ import annotations
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from buyers.views import BuyerMarketplaceView, RequirementViewSet
+from buyers.views import (
+    BuyerMarketplaceFacetsView,
+    BuyerMarketplaceView,
+    PriceHistoryView,
+    RequirementViewSet,
+)
 
 router = DefaultRouter()
 router.register(
@@ -14,5 +19,15 @@ router.register(
 
 urlpatterns = [
     path("api/buyer/marketplace/", BuyerMarketplaceView.as_view(), name="buyer-marketplace"),
+    path(
+        "api/buyer/marketplace/facets/",
+        BuyerMarketplaceFacetsView.as_view(),
+        name="buyer-marketplace-facets",
+    ),
+    path(
+        "api/buyer/marketplace/prices/",
+        PriceHistoryView.as_view(),
+        name="buyer-marketplace-prices",
+    ),
     path("api/", include(router.urls)),
 ]
@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+from django.conf import settings
 from rest_framework import permissions, status, viewsets, generics
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
 
+from accounts.authentication import BearerTokenAuthentication
+from archive.history import ArchiveTiersMixin, requirement_history
+from archive.models import ArchivedRequirement
+from archive.serializers import ArchivedRequirementSerializer
+from config.replicas import ReplicaReadsMixin
+from config.sqlite import single_writer
+from config.throttling import throttle_cost
+from idempotency.middleware import idempotent
+from buyers.allocation import allocate
+from buyers.facets import get_facets
 from buyers.models import BuyerRequirement
 from buyers.permissions import IsBuyerUser
-from buyers.serializers import BuyerRequirementSerializer, MarketplaceBatchSerializer
+from buyers.prices import price_series
+from buyers.ranking import explain, top_matches
+from buyers.serializers import (
+    BuyerRequirementSerializer,
+    FastMarketplaceSerializer,
+    MarketplaceBatchSerializer,
+)
 from buyers.services import create_quality_check, find_market_matches, get_marketplace_queryset
 
 
@@ -18,7 +37,7 @@ class MarketplacePagination(PageNumberPagination):
     max_page_size = 50
 
 
-class BuyerMarketplaceView(generics.ListAPIView):
+class BuyerMarketplaceView(ReplicaReadsMixin, generics.ListAPIView):
     serializer_class = MarketplaceBatchSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = MarketplacePagination
@@ -26,12 +45,43 @@ class BuyerMarketplaceView(generics.ListAPIView):
     def get_queryset(self):
         return get_marketplace_queryset(self.request.query_params)
 
+    def list(self, request, *args, **kwargs):
+        # same JSON as serializer_class, built from tuples (FastMarketplaceSerializer)
+        rows = FastMarketplaceSerializer.rows(self.get_queryset())
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(FastMarketplaceSerializer.serialize(page))
+        return Response(FastMarketplaceSerializer.serialize(list(rows)))
 
-class RequirementViewSet(viewsets.ModelViewSet):
+
+class BuyerMarketplaceFacetsView(ReplicaReadsMixin, generics.GenericAPIView):
+    """Filter sidebar counts under the same query params as the marketplace."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(get_facets(request.query_params))
+
+
+class PriceHistoryView(ReplicaReadsMixin, generics.GenericAPIView):
+    """Daily/weekly/monthly price stats by species, region and country."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(price_series(request.query_params))
+
+
+class RequirementViewSet(ArchiveTiersMixin, viewsets.ModelViewSet):
     serializer_class = BuyerRequirementSerializer
+    archive_serializer_class = ArchivedRequirementSerializer
     permission_classes = [IsBuyerUser]
     pagination_class = MarketplacePagination
-    authentication_classes = [SessionAuthentication, BasicAuthentication]
+    authentication_classes = [
+        SessionAuthentication,
+        BearerTokenAuthentication,
+        BasicAuthentication,
+    ]
 
     def get_queryset(self):
         queryset = (
@@ -44,13 +94,96 @@ class RequirementViewSet(viewsets.ModelViewSet):
             return queryset
         return queryset.filter(buyer=user)
 
+    def get_archive_queryset(self):
+        user = self.request.user
+        if user.is_staff:
+            return ArchivedRequirement.objects.all()
+        return ArchivedRequirement.objects.filter(buyer_id=user.pk)
+
+    @idempotent
+    @single_writer
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         requirement = serializer.save()
         create_quality_check(requirement)
 
     @action(detail=True, methods=["get"])
+    @throttle_cost(5)
     def matches(self, request, pk=None):
+        """Best-fitting listings first; ``?limit=&cursor=&explain=1``.
+
+        The body stays a plain list; the next page is in the ``Link`` header.
+        """
         requirement = self.get_object()
-        matches_qs = find_market_matches(requirement)
-        serializer = MarketplaceBatchSerializer(matches_qs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        limit = self._match_limit(request.query_params.get("limit"))
+        page, next_cursor = top_matches(
+            find_market_matches(requirement),
+            requirement,
+            limit,
+            request.query_params.get("cursor"),
+        )
+        data = MarketplaceBatchSerializer(page, many=True).data
+        show_components = request.query_params.get("explain") in ("1", "true")
+        for item, row in zip(page, data):
+            row["match_score"] = round(item.match_score, 2)
+            if show_components:
+                row["score_components"] = explain(item)
+        response = Response(data, status=status.HTTP_200_OK)
+        if next_cursor:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", next_cursor
+            )
+            response["Link"] = f'<{next_url}>; rel="next"'
+            response["X-Next-Cursor"] = next_cursor
+        return response
+
+    @action(detail=True, methods=["get"])
+    @throttle_cost(10)
+    def allocation(self, request, pk=None):
+        """Cheapest set of whole batches covering the requirement's volume window."""
+        requirement = self.get_object()
+        if not (requirement.min_volume or requirement.volume_required):
+            raise ValidationError({"volume": "Requirement has no volume to allocate."})
+        budget_ms = self._time_budget_ms(request.query_params.get("time_budget_ms"))
+        result = allocate(requirement, time_budget=budget_ms / 1000)
+        return Response(result.as_dict(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def history(self, request):
+        """All of the buyer's requirements, archived ones included, newest first."""
+        rows = requirement_history(request.user.pk)
+        page = self.paginate_queryset(rows)
+        for row in rows if page is None else page:
+            row["commodity"] = row.pop("product_type")
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows)
+
+    @staticmethod
+    def _time_budget_ms(raw: str | None) -> int:
+        maximum = getattr(settings, "ALLOCATION_TIME_BUDGET_MS", 500)
+        if raw in (None, ""):
+            return maximum
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({"time_budget_ms": "Invalid number"})
+        if not 1 <= value <= maximum:
+            raise ValidationError({"time_budget_ms": f"Must be between 1 and {maximum}."})
+        return value
+
+    @staticmethod
+    def _match_limit(raw: str | None) -> int:
+        default = getattr(settings, "MATCH_PAGE_SIZE", 20)
+        maximum = getattr(settings, "MATCH_MAX_PAGE_SIZE", 100)
+        if raw in (None, ""):
+            return default
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({"limit": "Invalid number"})
+        if not 1 <= value <= maximum:
+            raise ValidationError({"limit": f"Must be between 1 and {maximum}."})
+        return value
@@ -0,0 +1,171 @@
+"""Run several API calls in one request: ``POST /api/batch/``.
+
+Body::
+
+    {"requests": [{"method": "GET", "path": "/api/auth/me/"},
+                  {"method": "POST", "path": "/api/buyer/requirements/", "body": {...}}],
+     "concurrent": false}
+
+The batch is authenticated once, and every sub-request runs as that user.
+Sub-requests skip the middleware stack. Their views still apply their own
+permission checks and throttles. They run in order on this request's
+database connection. The response holds one ``{"status", "headers",
+"body"}`` entry per sub-request, in the same order, and a failing
+sub-request does not stop the others.
+
+With ``"concurrent": true`` and nothing but GET/HEAD sub-requests, they run
+on up to ``BATCH_READ_WORKERS`` threads, each with its own connection.
+
+Once a write sub-request succeeds, the ones after it read from the primary,
+and only then does the batch response pin the client (see config/replicas.py).
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from urllib.parse import urlsplit
+
+import orjson
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from config.replicas import PIN_COOKIE
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH = "/api/batch/"
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"}
+# request headers a sub-request inherits from the batch
+INHERITED_META = ("REMOTE_ADDR", "SERVER_NAME", "SERVER_PORT", "HTTP_HOST", "HTTP_USER_AGENT", "wsgi.url_scheme")
+RETURNED_HEADERS = ("Content-Type", "Location", "Link", "Retry-After", "X-Next-Cursor")
+
+
+class SubRequestError(ValueError):
+    pass
+
+
+def _entry(status_code: int, body, headers: dict | None = None) -> dict:
+    return {"status": status_code, "headers": headers or {}, "body": body}
+
+
+def _method(spec) -> str:
+    return str(spec.get("method", "GET")).upper() if isinstance(spec, dict) else ""
+
+
+def build_subrequest(request, spec, pinned: bool = False) -> HttpRequest:
+    if not isinstance(spec, dict):
+        raise SubRequestError("Each sub-request must be an object.")
+    method = _method(spec)
+    if method not in METHODS:
+        raise SubRequestError(f"Method {method} is not allowed in a batch.")
+    parts = urlsplit(str(spec.get("path", "")))
+    if not parts.path.startswith("/api/") or parts.path.rstrip("/") == BATCH_PATH.rstrip("/"):
+        raise SubRequestError("Path must be an /api/ endpoint other than the batch endpoint.")
+    body = b"" if spec.get("body") is None else orjson.dumps(spec["body"])
+
+    sub = HttpRequest()
+    sub.method = method
+    sub.path = sub.path_info = parts.path
+    sub.META = {name: request.META[name] for name in INHERITED_META if name in request.META}
+    sub.META.update(
+        REQUEST_METHOD=method,
+        PATH_INFO=parts.path,
+        QUERY_STRING=parts.query,
+        HTTP_ACCEPT="application/json",
+        CONTENT_TYPE="application/json",
+        CONTENT_LENGTH=str(len(body)),
+    )
+    sub.GET = QueryDict(parts.query)
+    sub._stream = io.BytesIO(body)
+    sub._read_started = False
+    sub.COOKIES = {**request.COOKIES, PIN_COOKIE: "1"} if pinned else request.COOKIES
+    sub.session = request.session
+    sub.user = request.user
+    # DRF views use these instead of running their authenticators again
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def run_subrequest(request, spec, pinned: bool = False) -> dict:
+    try:
+        sub = build_subrequest(request, spec, pinned)
+        match = resolve(sub.path_info)
+    except SubRequestError as exc:
+        return _entry(status.HTTP_400_BAD_REQUEST, {"detail": str(exc)})
+    except Resolver404:
+        return _entry(status.HTTP_404_NOT_FOUND, {"detail": "Not found."})
+    sub.resolver_match = match
+
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+        if callable(getattr(response, "render", None)):
+            response = response.render()
+    except Exception:
+        logger.exception("batch sub-request %s %s failed", sub.method, sub.path)
+        return _entry(status.HTTP_500_INTERNAL_SERVER_ERROR, {"detail": "Internal server error."})
+    if response.streaming:
+        response.close()
+        return _entry(status.HTTP_400_BAD_REQUEST, {"detail": "Streaming endpoints cannot be batched."})
+
+    headers = {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)}
+    content = response.content
+    if not content:
+        body = None
+    elif headers.get("Content-Type", "").startswith("application/json"):
+        body = orjson.loads(content)
+    else:
+        body = content.decode(response.charset or "utf-8", errors="replace")
+    return _entry(response.status_code, body, headers)
+
+
+def _run_in_thread(request, spec) -> dict:
+    try:
+        return run_subrequest(request, spec)
+    finally:
+        close_old_connections()
+
+
+class BatchView(APIView):
+    def post(self, request):
+        specs = request.data.get("requests") if isinstance(request.data, dict) else None
+        if not isinstance(specs, list) or not specs:
+            return Response(
+                {"detail": "Expected a non-empty list of requests."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_requests = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+        if len(specs) > max_requests:
+            return Response(
+                {"detail": f"At most {max_requests} requests per batch."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        workers = min(getattr(settings, "BATCH_READ_WORKERS", 4), len(specs))
+        reads_only = all(_method(spec) in SAFE_METHODS for spec in specs)
+        wrote = False
+        if request.data.get("concurrent") and reads_only and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch") as pool:
+                # each worker runs in a copy of this request's context
+                futures = [pool.submit(copy_context().run, _run_in_thread, request, spec) for spec in specs]
+                responses = [future.result() for future in futures]
+        else:
+            responses = []
+            for spec in specs:
+                entry = run_subrequest(request, spec, pinned=wrote)
+                if _method(spec) not in SAFE_METHODS and entry["status"] < 400:
+                    wrote = True
+                responses.append(entry)
+        response = Response({"responses": responses})
+        # ReplicaPinMiddleware would pin every batch, since the batch itself is a POST
+        response.replica_pin = wrote
+        return response
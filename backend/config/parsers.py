@@ -0,0 +1,39 @@
+"""Request parsers matching config.renderers: orjson JSON and MessagePack."""
+
+from __future__ import annotations
+
+import codecs
+
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from config.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONParser(parsers.JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read() if stream is not None else b""
+            if codecs.lookup(encoding).name != "utf-8":
+                body = body.decode(encoding).encode("utf-8")
+            return orjson.loads(body)
+        except (orjson.JSONDecodeError, UnicodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read() if stream is not None else b"", raw=False)
+        except (msgpack.UnpackException, ValueError, TypeError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,113 @@
+"""Fast DRF renderers: orjson for JSON, plus MessagePack for machine clients.
+
+``ORJSONRenderer`` is a drop-in for DRF's ``JSONRenderer``. For compact
+UTF-8 output (the DRF defaults) it produces the same bytes. Where orjson
+would not, it hands the data to DRF's stdlib path instead: ``indent=`` or
+ASCII-only output, floats that Python writes in exponent form or that are
+not finite (DRF rejects those), and integers wider than 64 bits. orjson
+encodes dates, datetimes (UTC as ``Z``, like DRF) and UUIDs natively.
+``Decimal`` and the rest of what DRF's encoder knows go through
+``default``.
+
+``MessagePackRenderer`` serves ``Accept: application/msgpack`` (or
+``?format=msgpack``) for bulk consumers. Values MessagePack has no type for
+(decimals, dates) are encoded the same way as in JSON.
+"""
+
+from __future__ import annotations
+
+import re
+
+import msgpack
+import orjson
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def encode_default(obj):
+    """Everything orjson/msgpack can't encode natively, as DRF's encoder would.
+
+    Serializer decimal fields already hand over strings; a bare ``Decimal``
+    left in the data becomes a float, as with the stdlib renderer.
+    """
+    return _drf_encoder.default(obj)
+
+
+# a MessagePack float64 (0xcb) whose exponent bits are all set: NaN or +-inf
+_PACKED_NON_FINITE = re.compile(rb"\xcb[\x7f\xff][\xf0-\xff]")
+_DIGITS = frozenset(b"0123456789")
+
+
+def _exponent_floats(rendered: bytes) -> bool:
+    """True if orjson wrote a float Python would spell differently.
+
+    Outside [1e-4, 1e16) Python uses exponents like ``1e-07``; orjson writes
+    ``1e-7`` or ``0.00001``. Text that merely looks like this only costs a
+    slower render.
+    """
+    if b"0.0000" in rendered:
+        return True
+    for marker in (b"e-", b"e+"):
+        at = rendered.find(marker)
+        while at != -1:
+            if at and rendered[at - 1] in _DIGITS:
+                return True
+            at = rendered.find(marker, at + 2)
+    return False
+
+
+def _non_finite_floats(data) -> bool:
+    """True if ``data`` may hold a NaN or infinity (orjson writes ``null``).
+
+    Walking the data in Python costs as much as the stdlib encoder, so it is
+    packed with msgpack, in C, and the bytes are searched instead.
+    """
+    try:
+        packed = msgpack.packb(data, default=_msgpack_default, use_bin_type=True, datetime=False)
+    except (TypeError, ValueError, OverflowError):
+        return True
+    return _PACKED_NON_FINITE.search(packed) is not None
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers past 64 bits, which the stdlib encoder handles
+            return super().render(data, accepted_media_type, renderer_context)
+        if _exponent_floats(ret) or (b"null" in ret and _non_finite_floats(data)):
+            # let DRF write these floats, or raise for NaN and infinities
+            return super().render(data, accepted_media_type, renderer_context)
+        # keep DRF's guarantee that output is a strict JavaScript subset
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+def _msgpack_default(obj):
+    value = encode_default(obj)
+    if value is obj:
+        raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
+    return value
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True, datetime=False)
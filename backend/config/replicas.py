@@ -0,0 +1,178 @@
+"""Send read-only traffic to a read replica when one is configured.
+
+Enable by adding a ``REPLICA_DATABASE`` alias (``"replica"``) to
+``DATABASES``; locally, point ``DATABASE_REPLICA_NAME`` at a copy of
+``db.sqlite3``. Without that alias every query stays on ``default``.
+
+Only reads made inside :func:`replica_reads` are routed: views opt in with
+:class:`ReplicaReadsMixin` (safe methods only), and commands or exports can
+wrap any block of queryset code in the context manager. Everything else,
+including all writes, uses the primary.
+
+Reads go back to the primary when:
+
+* the request (or block) has already written, so it sees its own changes;
+* the client wrote within the last ``REPLICA_PIN_SECONDS``, tracked with a
+  cookie set by :class:`ReplicaPinMiddleware`;
+* the replica is more than ``REPLICA_MAX_LAG_SECONDS`` behind, or could
+  not be reached. Lag is probed at most once per
+  ``REPLICA_LAG_CHECK_SECONDS`` per process.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "replica_pin"
+
+
+@dataclass
+class _ReadState:
+    allowed: bool = False
+    pinned: bool = False
+
+
+_state: ContextVar[_ReadState | None] = ContextVar("replica_reads", default=None)
+
+
+@contextmanager
+def replica_reads(pinned: bool = False, allowed: bool = True):
+    """Let reads in this block use the replica (unless ``pinned``)."""
+    state = _ReadState(allowed=allowed, pinned=pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def replica_alias() -> str | None:
+    alias = getattr(settings, "REPLICA_DATABASE", "replica")
+    return alias if alias and alias in connections.settings else None
+
+
+def replica_lag(alias: str) -> float | None:
+    """Seconds the replica is behind, or None if it can't be queried."""
+    connection = connections[alias]
+    try:
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT CASE WHEN pg_is_in_recovery() THEN COALESCE("
+                    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                    "ELSE 0 END"
+                )
+                return float(cursor.fetchone()[0])
+        # a copied SQLite file has no replication stream to measure
+        connection.ensure_connection()
+        return 0.0
+    except DatabaseError:
+        logger.warning("read replica %r unreachable, reading from primary", alias)
+        return None
+
+
+class _LagProbe:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = float("-inf")
+        self._lag: float | None = None
+
+    def current(self, alias: str) -> float | None:
+        interval = getattr(settings, "REPLICA_LAG_CHECK_SECONDS", 5)
+        with self._lock:
+            if time.monotonic() - self._checked >= interval:
+                self._lag = replica_lag(alias)
+                self._checked = time.monotonic()
+            return self._lag
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checked = float("-inf")
+            self._lag = None
+
+
+lag_probe = _LagProbe()
+
+
+def healthy_replica() -> str | None:
+    alias = replica_alias()
+    if alias is None:
+        return None
+    lag = lag_probe.current(alias)
+    if lag is None or lag > getattr(settings, "REPLICA_MAX_LAG_SECONDS", 10):
+        return None
+    return alias
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.allowed or state.pinned:
+            return None
+        return healthy_replica()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # read your own writes for the rest of the block
+            state.pinned = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica is a copy of default, so objects from either can be related
+        return True
+
+
+class ReplicaReadsMixin:
+    """DRF view mixin: GET/HEAD/OPTIONS may read from the replica.
+
+    Authentication and permission checks still read from the primary, so a
+    token issued a moment ago is never rejected because of replica lag.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        pinned = PIN_COOKIE in request.COOKIES
+        with replica_reads(pinned=pinned, allowed=False) as self._replica_state:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = getattr(self, "_replica_state", None)
+        if state is not None:
+            state.allowed = True
+
+
+class ReplicaPinMiddleware:
+    """Pin a client to the primary for a few seconds after it writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # views that know better (the batch endpoint) say whether anything was written
+        wrote = getattr(response, "replica_pin", None)
+        if wrote is None:
+            wrote = request.method not in SAFE_METHODS and response.status_code < 400
+        if wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
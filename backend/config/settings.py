@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,7 +43,13 @@ INSTALLED_APPS = [
     "corsheaders",
     "buyers",
     "accounts",
-    "exporter"
+    "exporter",
+    "blobs",
+    "user_settings",
+    "realtime",
+    "webhooks",
+    "idempotency",
+    "archive",
 ]
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
@@ -50,10 +57,124 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
+        "accounts.authentication.BearerTokenAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
+    # token buckets per user and per IP, checked together; only handlers
+    # with a throttle_cost spend tokens (config/throttling.py)
+    "DEFAULT_THROTTLE_CLASSES": ["config.throttling.TokenBucketThrottle"],
+    # orjson for JSON, MessagePack on Accept: application/msgpack (config.renderers)
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.ORJSONRenderer",
+        "config.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.parsers.ORJSONParser",
+        "config.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Lifetime of bearer tokens issued by /api/auth/login/
+AUTH_TOKEN_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Idempotency-Key on POST handlers marked @idempotent
+# (idempotency/middleware.py): stored responses are replayed for this long;
+# duplicates wait up to IDEMPOTENCY_WAIT_SECONDS for the first request, and a
+# claim older than IDEMPOTENCY_LOCK_SECONDS is considered abandoned.
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+IDEMPOTENCY_WAIT_SECONDS = 5
+IDEMPOTENCY_LOCK_SECONDS = 60
+
+# Cold-data archive (archive/archiver.py, manage.py archive_cold_data): final
+# rows older than this move to the archive tables, this many per transaction.
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 500
+
+# POST /api/batch/ (config/batch.py): sub-requests per call, and threads for
+# read-only batches sent with "concurrent": true.
+BATCH_MAX_REQUESTS = 20
+BATCH_READ_WORKERS = 4
+
+# Token buckets for costed endpoints: scope -> (capacity, tokens refilled per
+# second). Costs live next to the handlers (@throttle_cost).
+THROTTLE_BUCKETS = {
+    "user": (100, 2.0),
+    "ip": (300, 5.0),
 }
 
+# Cached settings documents (user_settings/store.py) expire after this many
+# seconds, bounding how long a copy raced by a concurrent update can live.
+USER_SETTINGS_CACHE_TTL = 300
+
+# Session users are loaded with their profiles and cached per user
+# (accounts/users.py); profile and user saves drop the entry. 0 disables.
+# Sessions that recorded the plain ModelBackend are mapped to it on load
+# (accounts/sessions.py); listing both would hash failed passwords twice.
+AUTHENTICATION_BACKENDS = ["accounts.authentication.CachedModelBackend"]
+AUTH_USER_CACHE_TTL = 60
+
+# Sessions: DB-backed with a short in-process read cache (accounts/sessions.py).
+# For zero session queries at the cost of cookie size, use
+# "django.contrib.sessions.backends.signed_cookies" instead.
+SESSION_ENGINE = "accounts.sessions"
+SESSION_LOCAL_CACHE_TTL = 30
+SESSION_LOCAL_CACHE_SIZE = 10000
+SESSION_SWEEP_INTERVAL = 15 * 60
+SESSION_SWEEP_BATCH_SIZE = 500
+
+# Bulk registration (/api/auth/register/bulk/, manage.py bulk_register).
+# Hash workers default to the CPU count; small batches are hashed inline.
+BULK_REGISTER_MAX_ROWS = 1000
+BULK_REGISTER_HASH_WORKERS = None
+BULK_REGISTER_POOL_MIN_ROWS = 8
+
+# Profile photos: upload cap and avatar thumbnails (accounts/photos.py)
+PROFILE_PHOTO_MAX_BYTES = 5 * 1024 * 1024
+PROFILE_PHOTO_VARIANT_SIZES = [40, 96, 256]
+PROFILE_PHOTO_VARIANT_WORKERS = 2
+PROFILE_PHOTO_VARIANTS_SYNC = False
+
+# Content-addressed media (blobs app): unreferenced blobs younger than this
+# are never collected by manage.py gc_blobs
+BLOB_GC_GRACE_SECONDS = 60 * 60
+
+# Server-Sent Events (/api/events/stream/, served by config.asgi): comment
+# frames keep idle streams open through proxies
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+
+# Webhook outbox (webhooks app, drained by manage.py deliver_webhooks --loop)
+WEBHOOK_BATCH_SIZE = 200
+WEBHOOK_EVENTS_PER_REQUEST = 50
+WEBHOOK_DELIVERY_WORKERS = 4
+WEBHOOK_TIMEOUT_SECONDS = 5
+WEBHOOK_MAX_ATTEMPTS = 8
+WEBHOOK_BACKOFF_BASE_SECONDS = 30
+WEBHOOK_BACKOFF_MAX_SECONDS = 6 * 60 * 60
+WEBHOOK_LEASE_SECONDS = 60
+# Endpoints must resolve to public addresses (checked on save and on every
+# delivery); only enable this to point webhooks at a local receiver.
+WEBHOOK_ALLOW_PRIVATE_ADDRESSES = False
+
+# /api/exporter/deals/bulk_update_status/
+DEAL_BULK_TRANSITION_MAX_IDS = 1000
+
+# /api/buyer/marketplace/facets/: entries are keyed by catalog version, so the
+# TTL only bounds how long unused filter combinations linger
+MARKET_FACETS_CACHE_TTL = 5 * 60
+
+# /api/buyer/requirements/<id>/matches/ ranking (buyers.ranking): component
+# weights are points out of 100
+MATCH_SCORE_WEIGHTS = {"contaminants": 35, "volume": 25, "ready_date": 20, "price": 20}
+MATCH_PAGE_SIZE = 20
+MATCH_MAX_PAGE_SIZE = 100
+
+# /api/buyer/requirements/<id>/allocation/ (buyers.allocation): local search
+# budget per request; ?time_budget_ms= may lower it, never raise it
+ALLOCATION_TIME_BUDGET_MS = 500
+
 MIDDLEWARE = [
     # CORS middleware should be placed as high as possible
     "corsheaders.middleware.CorsMiddleware",
@@ -62,6 +183,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "idempotency.middleware.IdempotencyMiddleware",
+    "config.replicas.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -106,6 +229,66 @@ DATABASES = {
     }
 }
 
+# Read replica (config.replicas): marketplace, facets and analytics reads go
+# here when it is configured. Locally, copy db.sqlite3 and point
+# DATABASE_REPLICA_NAME at the copy; with Postgres, add a "replica" entry
+# for the standby with the same ENGINE.
+if os.environ.get("DATABASE_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["DATABASE_REPLICA_NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["config.replicas.ReplicaRouter"]
+REPLICA_DATABASE = "replica"
+# after a write, the client reads from the primary for this long
+REPLICA_PIN_SECONDS = 5
+# fall back to the primary when the replica is further behind than this
+REPLICA_MAX_LAG_SECONDS = 10
+REPLICA_LAG_CHECK_SECONDS = 5
+
+# Single-node SQLite hardening (config.sqlite). SQLITE_PRODUCTION=1 applies
+# the pragmas below on every connection and sends QC and requirement writes
+# through the in-process single-writer queue.
+SQLITE_PRODUCTION = bool(os.environ.get("SQLITE_PRODUCTION"))
+if SQLITE_PRODUCTION:
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": (
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA mmap_size=268435456;"
+            "PRAGMA busy_timeout=5000;"
+            "PRAGMA temp_store=MEMORY;"
+        ),
+        # take the write lock at BEGIN instead of upgrading a read lock
+        # mid-transaction, which fails at once instead of waiting
+        "transaction_mode": "IMMEDIATE",
+    }
+# attempts per queued write on "database is locked", with doubling backoff
+SQLITE_WRITE_RETRIES = 5
+SQLITE_WRITE_RETRY_DELAY = 0.05
+
+
+# Cache
+# Shared between workers when REDIS_URL is set; per-process memory otherwise
+# (fine for a single dev server).
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "indoxport",
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
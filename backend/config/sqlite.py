@@ -0,0 +1,100 @@
+"""Single-writer queue for deployments that stay on SQLite.
+
+SQLite allows one writer at a time. With ``SQLITE_PRODUCTION`` on, every
+connection runs in WAL mode with a busy timeout and ``BEGIN IMMEDIATE``
+(see settings), and view methods decorated with :func:`single_writer` take
+turns through a FIFO queue in this process. Each holder runs its write
+inside one transaction. A write that still meets "database is locked",
+usually from another worker process, is rolled back and retried with
+backoff up to ``SQLITE_WRITE_RETRIES`` times.
+
+With any other database, or with the mode off, the decorator just calls the
+function.
+"""
+
+from __future__ import annotations
+
+import functools
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+
+class WriteQueue:
+    """FIFO ticket lock: writers are served in arrival order, one at a time.
+
+    Re-entrant per thread, so a queued write may call another one.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def turn(self):
+        if getattr(self._local, "depth", 0):
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while self._serving != ticket:
+                self._condition.wait()
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._serving += 1
+                self._condition.notify_all()
+
+    @property
+    def waiting(self) -> int:
+        with self._condition:
+            return self._next_ticket - self._serving
+
+
+write_queue = WriteQueue()
+
+
+def _enabled() -> bool:
+    return getattr(settings, "SQLITE_PRODUCTION", False) and connection.vendor == "sqlite"
+
+
+def _is_lock_error(exc: OperationalError) -> bool:
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+def single_writer(func):
+    """Run ``func`` as one queued, retried write transaction."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled():
+            return func(*args, **kwargs)
+        # inside someone else's transaction a failed attempt can't be redone
+        attempts = 1 if connection.in_atomic_block else getattr(settings, "SQLITE_WRITE_RETRIES", 5)
+        delay = getattr(settings, "SQLITE_WRITE_RETRY_DELAY", 0.05)
+        for attempt in range(attempts):
+            try:
+                with write_queue.turn(), transaction.atomic():
+                    return func(*args, **kwargs)
+            except OperationalError as exc:
+                if not _is_lock_error(exc) or attempt == attempts - 1:
+                    raise
+            # out of the queue while backing off, so other writers keep moving
+            time.sleep(delay * (2 ** attempt) * (0.5 + random.random()))
+
+    return wrapper
@@ -20,6 +20,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
 from suppliers.views import ProductBatchViewSet
+from blobs.views import serve_blob
+from config.batch import BatchView
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -38,6 +40,12 @@ urlpatterns = [
     path("", include("buyers.urls")),
     path("api/auth/", include("accounts.urls")),
     path('api/exporter/', include('exporter.urls')),  
+    path("api/events/", include("realtime.urls")),
+    path("api/webhooks/", include("webhooks.urls")),
+    # several API calls in one round trip (config/batch.py)
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    # content-addressed media: immutable URLs, served with far-future caching
+    path(f"{settings.MEDIA_URL.strip('/')}/cas/<path:path>", serve_blob, name="blob"),
 ]
 
 if settings.DEBUG:
@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import AssignmentRun, DealRollup
+
+
+@admin.register(DealRollup)
+class DealRollupAdmin(admin.ModelAdmin):
+    list_display = ('exporter', 'status', 'month', 'product_name', 'deal_count', 'total_price')
+    list_filter = ('status', 'month')
+    search_fields = ('exporter__username', 'product_name')
+
+
+@admin.register(AssignmentRun)
+class AssignmentRunAdmin(admin.ModelAdmin):
+    list_display = ('id', 'created_by', 'filled_count', 'requirement_count', 'assigned_volume', 'total_price', 'elapsed_ms', 'created_at')
+    readonly_fields = ('created_at',)
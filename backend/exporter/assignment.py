@@ -0,0 +1,220 @@
+"""Global assignment of listed batches to every open buyer requirement.
+
+Each batch goes whole to at most one requirement, and a requirement is only
+proposed batches once their total reaches its minimum volume without going
+over its maximum. Cost per unit is the listing price.
+
+Compatibility (species, destination, shipping window, contaminant limits)
+is built as one requirements x batches boolean matrix with NumPy
+broadcasting. Requirements are then filled in order of scarcity (compatible
+supply over needed volume, lowest first) from the cheapest free compatible
+batches. A requirement that can't reach its minimum from what is left gets
+nothing, so its batches stay free for the next one. This is a heuristic for
+the capacitated assignment problem, not an exact solver, but every step is
+a vector operation over one matrix row and 10k x 2k runs in seconds.
+"""
+
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+
+from archive.models import ArchivedDeal
+from buyers.models import BatchMarketInfo, BuyerRequirement
+from .models import AssignmentProposal, AssignmentRun, Deal
+
+# (listing value, requirement threshold column)
+CONTAMINANTS = [
+    ('contaminant_mercury_ppm', 'max_mercury_ppm'),
+    ('contaminant_cesium_ppm', 'max_cesium_ppm'),
+    ('contaminant_ecoli_cfu', 'max_ecoli_cfu'),
+]
+
+# rows of the compatibility matrix built at a time, bounds the temporaries
+CHUNK = 256
+WRITE_BATCH_SIZE = 1000
+
+
+class _Codes(dict):
+    """Shared integer codes for case-insensitive string matching."""
+
+    def code(self, value):
+        return self.setdefault((value or '').strip().lower(), len(self))
+
+
+def _day(value):
+    return value.toordinal() if value else -1
+
+
+def load_batches(codes):
+    # a completed deal stays a commitment after it has been archived
+    committed = Deal.objects.exclude(status='cancelled').values('product_batch_id')
+    archived = ArchivedDeal.objects.exclude(status='cancelled').values('product_batch_id')
+    rows = list(
+        BatchMarketInfo.objects.filter(
+            batch__is_allowed_for_catalog=True,
+            batch__qc_status='brin_verified_pass',
+            batch__quantity__gt=0,
+            price_per_unit__isnull=False,
+        )
+        .exclude(batch_id__in=committed)
+        .exclude(batch_id__in=archived)
+        .order_by('batch_id')
+        .values_list(
+            'batch_id', 'batch__quantity', 'price_per_unit', 'species',
+            'destination_country', 'ready_date',
+            *(field for field, _ in CONTAMINANTS),
+        )
+    )
+    return {
+        'id': np.array([row[0] for row in rows], dtype=np.int64),
+        'quantity': np.array([row[1] for row in rows], dtype=np.int64),
+        'price': [row[2] for row in rows],
+        'species': np.array([codes.code(row[3]) for row in rows], dtype=np.int64),
+        'destination': np.array([codes.code(row[4]) for row in rows], dtype=np.int64),
+        'ready': np.array([_day(row[5]) for row in rows], dtype=np.int64),
+        'contaminants': np.array(
+            [[np.nan if value is None else float(value) for value in row[6:]] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(CONTAMINANTS)),
+    }
+
+
+def load_requirements(codes):
+    rows = list(
+        BuyerRequirement.objects.filter(status=BuyerRequirement.STATUS_OPEN)
+        .order_by('id')
+        .values_list(
+            'id', 'product_type', 'destination_country', 'shipping_window_start',
+            'shipping_window_end', 'min_volume', 'max_volume', 'volume_required',
+            *(threshold for _, threshold in CONTAMINANTS),
+        )
+    )
+    rows = [row for row in rows if row[5] or row[7]]
+    return {
+        'id': np.array([row[0] for row in rows], dtype=np.int64),
+        'species': np.array([codes.code(row[1]) for row in rows], dtype=np.int64),
+        # -1: any destination
+        'destination': np.array([codes.code(row[2]) if row[2] else -1 for row in rows], dtype=np.int64),
+        'start': np.array([_day(row[3]) for row in rows], dtype=np.int64),
+        'end': np.array([_day(row[4]) for row in rows], dtype=np.int64),
+        'minimum': np.array([row[5] or row[7] for row in rows], dtype=np.int64),
+        # no maximum: anything at or over the minimum will do
+        'maximum': np.array([row[6] or np.iinfo(np.int64).max for row in rows], dtype=np.int64),
+        'limits': np.array(
+            [[np.nan if value is None else float(value) for value in row[8:]] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(CONTAMINANTS)),
+    }
+
+
+def compatibility(requirements, batches):
+    """Boolean (requirements x batches) matrix, mirroring find_market_matches."""
+    size = (len(requirements['id']), len(batches['id']))
+    matrix = np.zeros(size, dtype=bool)
+    dated = batches['ready'] >= 0
+    with np.errstate(invalid='ignore'):
+        for start in range(0, size[0], CHUNK):
+            rows = slice(start, start + CHUNK)
+            block = requirements['species'][rows, None] == batches['species'][None, :]
+            block &= dated[None, :]
+            block &= batches['ready'][None, :] >= requirements['start'][rows, None]
+            block &= batches['ready'][None, :] <= requirements['end'][rows, None]
+            destination = requirements['destination'][rows, None]
+            block &= (destination == -1) | (destination == batches['destination'][None, :])
+            for column in range(len(CONTAMINANTS)):
+                limit = requirements['limits'][rows, column][:, None]
+                value = batches['contaminants'][:, column][None, :]
+                # an unset limit passes everything; a missing value fails a set one
+                block &= np.isnan(limit) | (value <= limit)
+            matrix[rows] = block
+    return matrix
+
+
+def solve(compatible, quantity, price, minimum, maximum):
+    """Requirement row assigned to each batch column, or -1."""
+    owner = np.full(len(quantity), -1, dtype=np.int64)
+    if not compatible.size:
+        return owner
+    order = np.argsort(price, kind='stable')
+    compatible = compatible[:, order]
+    quantity = quantity[order]
+    free = np.ones(len(quantity), dtype=bool)
+
+    supply = compatible @ quantity
+    scarcity = supply / np.maximum(minimum, 1)
+    for row in np.argsort(scarcity, kind='stable'):
+        if supply[row] < minimum[row]:
+            continue
+        candidates = np.flatnonzero(compatible[row] & free)
+        running = np.cumsum(quantity[candidates])
+        cut = int(np.searchsorted(running, minimum[row]))
+        if cut == len(candidates):
+            continue
+        if running[cut] <= maximum[row]:
+            taken = candidates[: cut + 1]
+        else:
+            taken = _fill_below(candidates, quantity, minimum[row], maximum[row])
+            if taken is None:
+                continue
+        free[taken] = False
+        owner[order[taken]] = row
+    return owner
+
+
+def _fill_below(candidates, quantity, minimum, maximum):
+    """Cheapest-first fill that skips batches which would overshoot."""
+    taken, volume = [], 0
+    for index in candidates:
+        amount = int(quantity[index])
+        if volume + amount > maximum:
+            continue
+        taken.append(index)
+        volume += amount
+        if volume >= minimum:
+            return np.array(taken, dtype=np.int64)
+    return None
+
+
+def propose_assignments(created_by=None):
+    started = time.perf_counter()
+    codes = _Codes()
+    batches = load_batches(codes)
+    requirements = load_requirements(codes)
+    owner = solve(
+        compatibility(requirements, batches),
+        batches['quantity'],
+        np.array([float(price) for price in batches['price']], dtype=np.float64),
+        requirements['minimum'],
+        requirements['maximum'],
+    )
+
+    assigned = np.flatnonzero(owner >= 0)
+    proposals = []
+    for column in assigned.tolist():
+        quantity = int(batches['quantity'][column])
+        price = batches['price'][column]
+        proposals.append(AssignmentProposal(
+            requirement_id=int(requirements['id'][owner[column]]),
+            batch_id=int(batches['id'][column]),
+            quantity=quantity,
+            price_per_unit=price,
+            total_price=price * quantity,
+        ))
+
+    with transaction.atomic():
+        run = AssignmentRun.objects.create(
+            created_by=created_by,
+            batch_count=len(batches['id']),
+            requirement_count=len(requirements['id']),
+            filled_count=len(np.unique(owner[assigned])),
+            assigned_volume=sum(proposal.quantity for proposal in proposals),
+            total_price=sum((proposal.total_price for proposal in proposals), Decimal('0')),
+        )
+        for proposal in proposals:
+            proposal.run = run
+        AssignmentProposal.objects.bulk_create(proposals, batch_size=WRITE_BATCH_SIZE)
+        run.elapsed_ms = int((time.perf_counter() - started) * 1000)
+        run.save(update_fields=['elapsed_ms'])
+    return run
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from exporter.assignment import propose_assignments
+
+
+class Command(BaseCommand):
+    help = "Propose batches for every open buyer requirement in one global pass."
+
+    def handle(self, *args, **options):
+        run = propose_assignments()
+        self.stdout.write(self.style.SUCCESS(
+            f"run #{run.id}: filled {run.filled_count} of {run.requirement_count} requirements "
+            f"with {run.assigned_volume} units from {run.batch_count} batches "
+            f"in {run.elapsed_ms} ms"
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from exporter.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the exporter dashboard rollups from the Deal table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--exporter",
+            type=int,
+            default=None,
+            help="only rebuild this exporter's rows (user id)",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(options["exporter"])
+        self.stdout.write(self.style.SUCCESS(f"wrote {written} rollup rows"))
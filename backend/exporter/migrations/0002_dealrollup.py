@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Deal = apps.get_model('exporter', 'Deal')
+    DealRollup = apps.get_model('exporter', 'DealRollup')
+    grouped = (
+        Deal.objects.annotate(month=TruncMonth('created_at'))
+        .values('exporter_id', 'status', 'month', 'product_batch__product_name')
+        .annotate(deal_count=Count('pk'), total_quantity=Sum('quantity'), total_price=Sum('total_price'))
+        .order_by()
+    )
+    DealRollup.objects.bulk_create(
+        [
+            DealRollup(
+                exporter_id=row['exporter_id'],
+                status=row['status'],
+                month=row['month'].date(),
+                product_name=row['product_batch__product_name'],
+                deal_count=row['deal_count'],
+                total_quantity=row['total_quantity'] or 0,
+                total_price=row['total_price'] or 0,
+            )
+            for row in grouped
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exporter', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DealRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('buyer_approved', 'Buyer Approved'), ('documents_generated', 'Documents Generated'), ('payment_processing', 'Payment Processing'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=50)),
+                ('month', models.DateField()),
+                ('product_name', models.CharField(max_length=255)),
+                ('deal_count', models.IntegerField(default=0)),
+                ('total_quantity', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('exporter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deal_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('exporter', 'status', 'month', 'product_name'), name='deal_rollup_bucket_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('buyers', '0003_price_history'),
+        ('exporter', '0002_dealrollup'),
+        ('suppliers', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_count', models.IntegerField(default=0)),
+                ('requirement_count', models.IntegerField(default=0)),
+                ('filled_count', models.IntegerField(default=0)),
+                ('assigned_volume', models.BigIntegerField(default=0)),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('elapsed_ms', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignment_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AssignmentProposal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('price_per_unit', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=18)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignment_proposals', to='suppliers.productbatch')),
+                ('requirement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignment_proposals', to='buyers.buyerrequirement')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proposals', to='exporter.assignmentrun')),
+            ],
+            options={
+                'ordering': ['requirement_id', 'price_per_unit', 'batch_id'],
+            },
+        ),
+    ]
@@ -23,6 +23,20 @@ class Deal(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+
+    # Forward-only workflow; any open deal may still be cancelled.
+    ALLOWED_TRANSITIONS = {
+        'pending': {'buyer_approved', 'cancelled'},
+        'buyer_approved': {'documents_generated', 'cancelled'},
+        'documents_generated': {'payment_processing', 'cancelled'},
+        'payment_processing': {'completed', 'cancelled'},
+        'completed': set(),
+        'cancelled': set(),
+    }
+
+    @classmethod
+    def can_transition(cls, current, target):
+        return target in cls.ALLOWED_TRANSITIONS.get(current, ())
     
     exporter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='deals')
     buyer_requirement = models.ForeignKey(BuyerRequirement, on_delete=models.CASCADE)
@@ -50,4 +64,68 @@ class BatchMatch(models.Model):
         unique_together = ['batch', 'requirement']
     
     def __str__(self):
-        return f"Match: Batch {self.batch.id} - Req {self.requirement.id} ({self.match_score}%)"
\ No newline at end of file
+        return f"Match: Batch {self.batch.id} - Req {self.requirement.id} ({self.match_score}%)"
+
+
+class DealRollup(models.Model):
+    """Pre-aggregated deal totals for the exporter dashboard.
+
+    One row per (exporter, status, month the deal was created, product).
+    Kept current by ``exporter.rollups`` on every deal write; rebuild with
+    ``manage.py rebuild_deal_rollups`` after bulk imports or raw SQL fixes.
+    """
+    exporter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='deal_rollups')
+    status = models.CharField(max_length=50, choices=Deal.STATUS_CHOICES)
+    month = models.DateField()
+    product_name = models.CharField(max_length=255)
+    deal_count = models.IntegerField(default=0)
+    total_quantity = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_price = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['exporter', 'status', 'month', 'product_name'],
+                name='deal_rollup_bucket_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.exporter_id} {self.status} {self.month:%Y-%m} {self.product_name}: {self.deal_count}"
+
+
+class AssignmentRun(models.Model):
+    """One pass of the global batch-to-requirement optimizer.
+
+    Proposals are suggestions only; nothing is reserved until an exporter
+    turns a proposal into a Deal.
+    """
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assignment_runs')
+    batch_count = models.IntegerField(default=0)
+    requirement_count = models.IntegerField(default=0)
+    filled_count = models.IntegerField(default=0)
+    assigned_volume = models.BigIntegerField(default=0)
+    total_price = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    elapsed_ms = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+
+    def __str__(self):
+        return f"Assignment run #{self.id}: {self.filled_count}/{self.requirement_count} filled"
+
+
+class AssignmentProposal(models.Model):
+    run = models.ForeignKey(AssignmentRun, on_delete=models.CASCADE, related_name='proposals')
+    requirement = models.ForeignKey(BuyerRequirement, on_delete=models.CASCADE, related_name='assignment_proposals')
+    batch = models.ForeignKey(ProductBatch, on_delete=models.CASCADE, related_name='assignment_proposals')
+    quantity = models.IntegerField()
+    price_per_unit = models.DecimalField(max_digits=12, decimal_places=2)
+    total_price = models.DecimalField(max_digits=18, decimal_places=2)
+
+    class Meta:
+        ordering = ['requirement_id', 'price_per_unit', 'batch_id']
+
+    def __str__(self):
+        return f"Run #{self.run_id}: batch {self.batch_id} -> requirement {self.requirement_id}"
@@ -0,0 +1,13 @@
+from rest_framework import exceptions, permissions
+
+
+class IsExporterUser(permissions.BasePermission):
+    message = "Exporter role is required to access this endpoint."
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            raise exceptions.NotAuthenticated("Authentication credentials were not provided.")
+        if user.is_staff or user.is_superuser:
+            return True
+        return hasattr(user, "exporter_profile")
@@ -0,0 +1,174 @@
+"""Incremental maintenance of ``DealRollup`` rows.
+
+Every deal write turns into signed deltas per bucket; ``apply_deltas``
+adds them with ``UPDATE ... SET col = col + delta`` and inserts missing
+buckets, so concurrent writers never lose increments.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from archive.models import ArchivedDeal
+
+from .models import Deal, DealRollup
+
+ZERO = Decimal("0")
+
+# (exporter_id, status, month, product_name)
+BucketKey = tuple[int, str, date, str]
+
+
+class Deltas:
+    """Accumulates (count, quantity, price) changes per bucket."""
+
+    def __init__(self):
+        self.buckets: dict[BucketKey, list] = defaultdict(lambda: [0, ZERO, ZERO])
+
+    def add(self, key: BucketKey, quantity, price, sign: int = 1) -> None:
+        bucket = self.buckets[key]
+        bucket[0] += sign
+        bucket[1] += sign * Decimal(quantity or 0)
+        bucket[2] += sign * Decimal(price or 0)
+
+    def move(self, key_from: BucketKey, key_to: BucketKey, quantity, price) -> None:
+        self.add(key_from, quantity, price, -1)
+        self.add(key_to, quantity, price, 1)
+
+    def nonzero(self):
+        return {
+            key: values
+            for key, values in self.buckets.items()
+            if values[0] or values[1] or values[2]
+        }
+
+
+def month_of(created_at: datetime) -> date:
+    # same bucketing as TruncMonth in the current time zone
+    return timezone.localtime(created_at).date().replace(day=1)
+
+
+def apply_deltas(deltas: Deltas) -> None:
+    for (exporter_id, status, month, product), (count, quantity, price) in deltas.nonzero().items():
+        lookup = {
+            "exporter_id": exporter_id,
+            "status": status,
+            "month": month,
+            "product_name": product,
+        }
+        increments = {
+            "deal_count": F("deal_count") + count,
+            "total_quantity": F("total_quantity") + quantity,
+            "total_price": F("total_price") + price,
+        }
+        if DealRollup.objects.filter(**lookup).update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                DealRollup.objects.create(
+                    **lookup, deal_count=count, total_quantity=quantity, total_price=price
+                )
+        except IntegrityError:
+            # another writer created the bucket first
+            DealRollup.objects.filter(**lookup).update(**increments)
+
+
+def _grouped(deals, product_field: str):
+    return (
+        deals.annotate(month=TruncMonth("created_at"))
+        .values_list("exporter_id", "status", "month", product_field)
+        .annotate(
+            deal_count=Count("pk"),
+            total_quantity=Sum("quantity"),
+            total_price=Sum("total_price"),
+        )
+        .order_by()
+    )
+
+
+def rebuild_rollups(exporter_id: int | None = None) -> int:
+    """Recompute rollups from live and archived deals; returns rows written."""
+    deals = Deal.objects.all()
+    archived = ArchivedDeal.objects.all()
+    rollups = DealRollup.objects.all()
+    if exporter_id is not None:
+        deals = deals.filter(exporter_id=exporter_id)
+        archived = archived.filter(exporter_id=exporter_id)
+        rollups = rollups.filter(exporter_id=exporter_id)
+    deltas = Deltas()
+    for grouped in (_grouped(deals, "product_batch__product_name"), _grouped(archived, "product_name")):
+        for exporter, status, month, product, count, quantity, price in grouped:
+            bucket = deltas.buckets[(exporter, status, month.date(), product)]
+            bucket[0] += count
+            bucket[1] += quantity or ZERO
+            bucket[2] += price or ZERO
+    rows = [
+        DealRollup(
+            exporter_id=exporter,
+            status=status,
+            month=month,
+            product_name=product,
+            deal_count=count,
+            total_quantity=quantity,
+            total_price=price,
+        )
+        for (exporter, status, month, product), (count, quantity, price) in deltas.buckets.items()
+    ]
+    with transaction.atomic():
+        rollups.delete()
+        DealRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def dashboard(exporter_id: int) -> dict:
+    """Dashboard totals read from the rollup table only."""
+    by_status: dict[str, dict] = {}
+    by_product: dict[str, dict] = {}
+    by_month: dict[date, dict] = {}
+    for row in DealRollup.objects.filter(exporter_id=exporter_id, deal_count__gt=0):
+        status_totals = by_status.setdefault(
+            row.status, {"status": row.status, "deal_count": 0, "total_price": ZERO}
+        )
+        status_totals["deal_count"] += row.deal_count
+        status_totals["total_price"] += row.total_price
+        if row.status == "cancelled":
+            continue
+        # product volume and the trend only count live and completed deals
+        product = by_product.setdefault(
+            row.product_name,
+            {"product": row.product_name, "deal_count": 0, "quantity": ZERO, "total_price": ZERO},
+        )
+        month = by_month.setdefault(
+            row.month,
+            {"month": row.month.strftime("%Y-%m"), "deal_count": 0, "quantity": ZERO, "total_price": ZERO},
+        )
+        for totals in (product, month):
+            totals["deal_count"] += row.deal_count
+            totals["quantity"] += row.total_quantity
+            totals["total_price"] += row.total_price
+
+    status_order = [code for code, _label in Deal.STATUS_CHOICES]
+    return {
+        "by_status": _as_strings(
+            sorted(by_status.values(), key=lambda item: status_order.index(item["status"]))
+        ),
+        "by_product": _as_strings(
+            sorted(by_product.values(), key=lambda item: (-item["quantity"], item["product"]))
+        ),
+        "monthly": _as_strings(by_month[key] for key in sorted(by_month)),
+    }
+
+
+def _as_strings(rows) -> list[dict]:
+    # decimals render as strings, like DecimalField does in the deal serializers
+    return [
+        {key: str(value) if isinstance(value, Decimal) else value for key, value in row.items()}
+        for row in rows
+    ]
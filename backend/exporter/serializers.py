@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import ExporterProfile, Deal, BatchMatch
+from .models import ExporterProfile, Deal, BatchMatch, AssignmentRun, AssignmentProposal
 from suppliers.serializers import ProductBatchSerializer
 from buyers.serializers import BuyerRequirementSerializer
 
@@ -31,4 +32,32 @@ class BatchMatchSerializer(serializers.ModelSerializer):
     class Meta:
         model = BatchMatch
         fields = ['id', 'batch', 'requirement', 'match_score', 
-                  'is_compatible', 'match_details', 'created_at']
\ No newline at end of file
+                  'is_compatible', 'match_details', 'created_at']
+
+
+class DealBulkTransitionSerializer(serializers.Serializer):
+    deal_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    status = serializers.ChoiceField(choices=Deal.STATUS_CHOICES)
+    expected_status = serializers.ChoiceField(choices=Deal.STATUS_CHOICES, required=False)
+
+    def validate_deal_ids(self, value):
+        limit = getattr(settings, 'DEAL_BULK_TRANSITION_MAX_IDS', 1000)
+        if len(value) > limit:
+            raise serializers.ValidationError(f'At most {limit} deals per request.')
+        return value
+
+
+class AssignmentProposalSerializer(serializers.ModelSerializer):
+    batch_code = serializers.CharField(source='batch.batch_code', read_only=True)
+
+    class Meta:
+        model = AssignmentProposal
+        fields = ['id', 'requirement', 'batch', 'batch_code', 'quantity',
+                  'price_per_unit', 'total_price']
+
+
+class AssignmentRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AssignmentRun
+        fields = ['id', 'batch_count', 'requirement_count', 'filled_count',
+                  'assigned_volume', 'total_price', 'elapsed_ms', 'created_at']
@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Deal
+from .rollups import Deltas, apply_deltas, month_of
+
+ROLLUP_FIELDS = (
+    "exporter_id",
+    "status",
+    "created_at",
+    "product_batch__product_name",
+    "quantity",
+    "total_price",
+)
+
+_suspended = ContextVar("deal_rollups_suspended", default=False)
+
+
+@contextmanager
+def rollups_suspended():
+    """Save or delete deals without touching their rollups.
+
+    For moves that keep the totals as they are, such as archiving.
+    """
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def _stored_bucket(pk):
+    # read from the row, not the instance, which may be stale or refreshed
+    row = Deal.objects.filter(pk=pk).values_list(*ROLLUP_FIELDS).first()
+    if row is None:
+        return None
+    exporter_id, status, created_at, product, quantity, price = row
+    return (exporter_id, status, month_of(created_at), product), quantity, price
+
+
+@receiver(pre_save, sender=Deal)
+def remember_rollup_bucket(sender, instance, raw=False, **kwargs):
+    if _suspended.get():
+        return
+    instance._rollup_previous = None if raw or instance.pk is None else _stored_bucket(instance.pk)
+
+
+@receiver(post_save, sender=Deal)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw or _suspended.get():
+        return
+    current = (
+        (
+            instance.exporter_id,
+            instance.status,
+            month_of(instance.created_at),
+            instance.product_batch.product_name,
+        ),
+        instance.quantity,
+        instance.total_price,
+    )
+    previous = instance.__dict__.pop("_rollup_previous", None)
+    if previous == current:
+        return
+    deltas = Deltas()
+    if previous is not None:
+        deltas.add(*previous, -1)
+    deltas.add(*current)
+    apply_deltas(deltas)
+
+
+@receiver(pre_delete, sender=Deal)
+def remember_deleted_bucket(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    instance._rollup_previous = _stored_bucket(instance.pk)
+
+
+@receiver(post_delete, sender=Deal)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    previous = instance.__dict__.pop("_rollup_previous", None)
+    if previous is not None:
+        deltas = Deltas()
+        deltas.add(*previous, -1)
+        apply_deltas(deltas)
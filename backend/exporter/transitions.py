@@ -0,0 +1,139 @@
+"""Bulk deal status transitions with optimistic concurrency.
+
+Each source status becomes one ``UPDATE ... WHERE id IN (...) AND status =
+<source>``, so a deal another operator moved in the meantime is simply not
+updated and reported as a conflict instead of being overwritten.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from webhooks.outbox import deal_status_message, enqueue_many
+
+from .models import Deal
+from .rollups import Deltas, apply_deltas, month_of
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+CONFLICT = "conflict"
+INVALID_TRANSITION = "invalid_transition"
+NOT_FOUND = "not_found"
+
+
+def bulk_transition(
+    exporter, deal_ids: list[int], target: str, expected_status: str | None = None
+) -> list[dict]:
+    """Move the exporter's deals to ``target``; returns one outcome per id, in order.
+
+    ``expected_status`` pins the status the caller saw; deals that have moved
+    on since are reported as conflicts.
+    """
+    deal_ids = list(dict.fromkeys(deal_ids))
+    with transaction.atomic():
+        rows = {
+            row[0]: row
+            for row in Deal.objects.filter(exporter=exporter, pk__in=deal_ids).values_list(
+                "pk",
+                "status",
+                "buyer_requirement_id",
+                "buyer_requirement__buyer_id",
+                "product_batch_id",
+                "created_at",
+                "quantity",
+                "total_price",
+                "product_batch__product_name",
+            )
+        }
+        outcomes: dict[int, dict] = {}
+        by_source: dict[str, list[int]] = defaultdict(list)
+        for deal_id in deal_ids:
+            if deal_id not in rows:
+                outcomes[deal_id] = {"id": deal_id, "result": NOT_FOUND}
+                continue
+            current = rows[deal_id][1]
+            if expected_status is not None and current != expected_status:
+                outcomes[deal_id] = {"id": deal_id, "result": CONFLICT, "status": current}
+            elif current == target:
+                outcomes[deal_id] = {"id": deal_id, "result": UNCHANGED, "status": current}
+            elif not Deal.can_transition(current, target):
+                outcomes[deal_id] = {
+                    "id": deal_id,
+                    "result": INVALID_TRANSITION,
+                    "status": current,
+                }
+            else:
+                by_source[current].append(deal_id)
+
+        now = timezone.now()
+        messages = []
+        deltas = Deltas()
+        for source, ids in by_source.items():
+            count = Deal.objects.filter(pk__in=ids, status=source).update(
+                status=target, updated_at=now
+            )
+            if count == len(ids):
+                applied = set(ids)
+                current_status = {}
+            else:
+                # someone else got there first for part of the group
+                current_status = dict(
+                    Deal.objects.filter(pk__in=ids).values_list("pk", "status")
+                )
+                applied = set(
+                    Deal.objects.filter(pk__in=ids, status=target, updated_at=now).values_list(
+                        "pk", flat=True
+                    )
+                )
+            for deal_id in ids:
+                if deal_id in applied:
+                    outcomes[deal_id] = {
+                        "id": deal_id,
+                        "result": UPDATED,
+                        "from": source,
+                        "status": target,
+                    }
+                    (
+                        _pk,
+                        _status,
+                        requirement_id,
+                        buyer_id,
+                        batch_id,
+                        created_at,
+                        quantity,
+                        price,
+                        product,
+                    ) = rows[deal_id]
+                    month = month_of(created_at)
+                    deltas.move(
+                        (exporter.pk, source, month, product),
+                        (exporter.pk, target, month, product),
+                        quantity,
+                        price,
+                    )
+                    messages.append(
+                        deal_status_message(
+                            deal_id,
+                            exporter.pk,
+                            buyer_id,
+                            requirement_id,
+                            batch_id,
+                            source,
+                            target,
+                            now,
+                        )
+                    )
+                else:
+                    outcomes[deal_id] = {
+                        "id": deal_id,
+                        "result": CONFLICT,
+                        "status": current_status.get(deal_id),
+                    }
+        # queryset.update() skips the Deal signals, so keep the rollups here
+        apply_deltas(deltas)
+        if messages:
+            enqueue_many(messages)
+    return [outcomes[deal_id] for deal_id in deal_ids]
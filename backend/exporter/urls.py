@@ -1,12 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ExporterProfileViewSet, MarketplaceViewSet, DealViewSet
+from .views import ExporterProfileViewSet, MarketplaceViewSet, DealViewSet, DashboardView, AssignmentRunViewSet
 
 router = DefaultRouter()
 router.register(r'profile', ExporterProfileViewSet, basename='exporter-profile')
 router.register(r'marketplace', MarketplaceViewSet, basename='marketplace')
 router.register(r'deals', DealViewSet, basename='deals')
+router.register(r'assignments', AssignmentRunViewSet, basename='assignments')
 
 urlpatterns = [
+    path('dashboard/', DashboardView.as_view(), name='exporter-dashboard'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
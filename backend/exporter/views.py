@@ -1,12 +1,27 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from django.db.models import Q
-from .models import ExporterProfile, Deal, BatchMatch
-from .serializers import ExporterProfileSerializer, DealSerializer, BatchMatchSerializer
+from .models import ExporterProfile, Deal, BatchMatch, AssignmentRun
+from .serializers import (
+    ExporterProfileSerializer, DealSerializer, BatchMatchSerializer, DealBulkTransitionSerializer,
+    AssignmentRunSerializer, AssignmentProposalSerializer,
+)
+from .assignment import propose_assignments
+from .permissions import IsExporterUser
+from .transitions import INVALID_TRANSITION, UNCHANGED, UPDATED, bulk_transition
+from .rollups import dashboard
 from suppliers.models import ProductBatch
 from buyers.models import BuyerRequirement
+from archive.history import ArchiveTiersMixin, deal_history
+from archive.models import ArchivedDeal
+from archive.serializers import ArchivedDealSerializer
+from config.replicas import ReplicaReadsMixin
+from config.throttling import throttle_cost
+from idempotency.middleware import idempotent
 
 class ExporterProfileViewSet(viewsets.ModelViewSet):
     queryset = ExporterProfile.objects.all()
@@ -16,7 +31,52 @@ class ExporterProfileViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return ExporterProfile.objects.filter(user=self.request.user)
 
-class MarketplaceViewSet(viewsets.ReadOnlyModelViewSet):
+class DashboardView(ReplicaReadsMixin, APIView):
+    """Deal totals by status, product and month, read from DealRollup"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(dashboard(request.user.pk))
+
+class AssignmentRunViewSet(viewsets.ReadOnlyModelViewSet):
+    """Global batch-to-requirement proposals; POST starts a new run"""
+    serializer_class = AssignmentRunSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return AssignmentRun.objects.filter(created_by=self.request.user)
+
+    def get_permissions(self):
+        # a run reads every open requirement and listing; only exporters start one
+        if self.action == 'create':
+            return [IsExporterUser()]
+        return super().get_permissions()
+
+    @throttle_cost(20)
+    @idempotent
+    def create(self, request):
+        run = propose_assignments(created_by=request.user)
+        return Response(AssignmentRunSerializer(run).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def proposals(self, request, pk=None):
+        run = self.get_object()
+        proposals = run.proposals.select_related('batch')
+        requirement_id = request.query_params.get('requirement')
+        if requirement_id:
+            try:
+                requirement_id = int(requirement_id)
+            except ValueError:
+                return Response({'error': 'requirement must be an integer id'},
+                              status=status.HTTP_400_BAD_REQUEST)
+            proposals = proposals.filter(requirement_id=requirement_id)
+        page = self.paginate_queryset(proposals)
+        serializer = AssignmentProposalSerializer(page if page is not None else proposals, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+class MarketplaceViewSet(ReplicaReadsMixin, viewsets.ReadOnlyModelViewSet):
     """View available batches and requirements"""
     queryset = ProductBatch.objects.filter(qc_status='passed')
     permission_classes = [IsAuthenticated]
@@ -34,6 +94,7 @@ class MarketplaceViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'])
+    @throttle_cost(10)
     def match_batches(self, request):
         """Find compatible batches for a requirement"""
         requirement_id = request.data.get('requirement_id')
@@ -106,30 +167,71 @@ class MarketplaceViewSet(viewsets.ReadOnlyModelViewSet):
         
         return score, is_compatible, details
 
-class DealViewSet(viewsets.ModelViewSet):
+class DealHistoryPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+class DealViewSet(ArchiveTiersMixin, viewsets.ModelViewSet):
     queryset = Deal.objects.all()
     serializer_class = DealSerializer
+    archive_serializer_class = ArchivedDealSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         return Deal.objects.filter(exporter=self.request.user)
     
+    def get_archive_queryset(self):
+        return ArchivedDeal.objects.filter(exporter_id=self.request.user.pk)
+    
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(exporter=self.request.user)
     
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
-        """Update deal status"""
+        """Update deal status (same workflow rules as bulk_update_status)"""
         deal = self.get_object()
         new_status = request.data.get('status')
         
-        if new_status in dict(Deal.STATUS_CHOICES):
-            deal.status = new_status
-            deal.save()
-            return Response({'status': 'Deal status updated'})
+        if new_status not in dict(Deal.STATUS_CHOICES):
+            return Response({'error': 'Invalid status'}, 
+                           status=status.HTTP_400_BAD_REQUEST)
         
-        return Response({'error': 'Invalid status'}, 
-                       status=status.HTTP_400_BAD_REQUEST)
+        [outcome] = bulk_transition(request.user, [deal.pk], new_status)
+        if outcome['result'] in (UPDATED, UNCHANGED):
+            return Response({'status': 'Deal status updated'})
+        if outcome['result'] == INVALID_TRANSITION:
+            return Response(
+                {'error': f"Cannot move a {outcome['status']} deal to {new_status}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({'error': 'Deal status changed meanwhile', 'status': outcome['status']},
+                       status=status.HTTP_409_CONFLICT)
+    
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """All of the exporter's deals, archived ones included, newest first"""
+        paginator = DealHistoryPagination()
+        page = paginator.paginate_queryset(deal_history(request.user.pk), request, view=self)
+        return paginator.get_paginated_response(page)
+
+    @action(detail=False, methods=['post'])
+    def bulk_update_status(self, request):
+        """Move many deals along the workflow; returns one outcome per deal"""
+        serializer = DealBulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_transition(
+            request.user,
+            serializer.validated_data['deal_ids'],
+            serializer.validated_data['status'],
+            serializer.validated_data.get('expected_status'),
+        )
+        updated = sum(1 for result in results if result['result'] == UPDATED)
+        return Response({'updated': updated, 'results': results})
     
     @action(detail=True, methods=['post'])
     def generate_documents(self, request, pk=None):
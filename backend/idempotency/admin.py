@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import IdempotencyKey
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("key", "owner", "response_status", "locked_at", "created_at", "expires_at")
+    search_fields = ("key", "owner")
+    readonly_fields = ("fingerprint", "response_headers", "created_at")
+    exclude = ("response_body",)
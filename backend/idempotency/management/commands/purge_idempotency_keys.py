@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from idempotency.store import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys past IDEMPOTENCY_TTL_SECONDS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"deleted {deleted} expired idempotency keys"))
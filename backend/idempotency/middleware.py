@@ -0,0 +1,147 @@
+"""Support ``Idempotency-Key`` on POST handlers marked :func:`idempotent`.
+
+Only handlers that opt in are covered, so endpoints that issue credentials
+(login, register) never have their responses stored. For a marked handler a
+client sends a unique key with the POST; if it retries (same key, same
+method, path and body) it gets the stored response back, marked with
+``Idempotent-Replayed: true``, and the view does not run again. A retry
+that arrives while the first request is still running waits up to
+``IDEMPOTENCY_WAIT_SECONDS`` for it, then gets 409 with ``Retry-After``.
+Reusing a key for a different request is a 422.
+
+Keys are scoped to the client: the session user, else the
+``Authorization`` header (bearer and basic credentials are checked later,
+by DRF), else the client address. Responses with 5xx, 409 or 429 status
+are not stored, so those retries run again. Keys expire after
+``IDEMPOTENCY_TTL_SECONDS``; ``manage.py purge_idempotency_keys`` removes
+them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpResponse, JsonResponse
+
+from . import store
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+NOT_STORED = (409, 429)
+POLL_INTERVAL = 0.05
+
+
+def idempotent(func):
+    """Let a view handler or viewset action honour ``Idempotency-Key``.
+
+    Never apply it to a handler whose response carries credentials: the
+    response body is stored as-is for replay.
+    """
+    func.idempotent = True
+    return func
+
+
+def is_idempotent(view_func, method: str) -> bool:
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return getattr(view_func, "idempotent", False)
+    actions = getattr(view_func, "actions", None) or {}
+    name = actions.get(method.lower(), method.lower())
+    return getattr(getattr(view_class, name, None), "idempotent", False)
+
+
+def request_owner(request) -> str:
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    authorization = request.headers.get("Authorization")
+    if authorization:
+        return "auth:" + hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:32]
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+def request_fingerprint(request) -> str:
+    digest = hashlib.sha256()
+    digest.update(request.method.encode("ascii"))
+    digest.update(b"\0" + request.get_full_path().encode("utf-8") + b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _error(status: int, detail: str, **headers) -> JsonResponse:
+    response = JsonResponse({"detail": detail}, status=status)
+    for name, value in headers.items():
+        response[name.replace("_", "-")] = value
+    return response
+
+
+def _replay(record: IdempotencyKey) -> HttpResponse:
+    response = HttpResponse(bytes(record.response_body), status=record.response_status)
+    for name, value in record.response_headers.items():
+        response[name] = value
+    response[REPLAY_HEADER] = "true"
+    return response
+
+
+def _storable(response) -> bool:
+    return not response.streaming and response.status_code < 500 and response.status_code not in NOT_STORED
+
+
+class IdempotencyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            record = getattr(request, "_idempotency_record", None)
+            if record is not None:
+                store.release(record)
+            raise
+        record = getattr(request, "_idempotency_record", None)
+        if record is None:
+            return response
+        if _storable(response):
+            headers = {name: value for name, value in response.items() if name != REPLAY_HEADER}
+            store.complete(record, response.status_code, headers, response.content)
+        else:
+            store.release(record)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        key = request.headers.get(HEADER)
+        if request.method != "POST" or not key or not is_idempotent(view_func, request.method):
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(400, f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.")
+        try:
+            fingerprint = request_fingerprint(request)
+        except RequestDataTooBig:
+            # large uploads are streamed to the view; they are not replayable
+            return None
+
+        record, claimed = store.claim(request_owner(request), key, fingerprint)
+        if not claimed:
+            return self._duplicate(record, fingerprint)
+        request._idempotency_record = record
+        return None
+
+    def _duplicate(self, record: IdempotencyKey | None, fingerprint: str):
+        if record is not None and record.fingerprint != fingerprint:
+            return _error(422, f"{HEADER} was already used for a different request.")
+        deadline = time.monotonic() + getattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 5)
+        while record is not None and record.locked_at is not None:
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+            record = IdempotencyKey.objects.filter(pk=record.pk).first()
+        if record is None or record.locked_at is not None:
+            # still running, or it failed and the key is free again
+            return _error(409, "A request with this key is in progress; retry shortly.", Retry_After="1")
+        return _replay(record)
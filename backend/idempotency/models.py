@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """A client's ``Idempotency-Key`` and the response it produced.
+
+    While the first request with the key runs, ``locked_at`` is set and
+    duplicates wait for it. Afterwards the stored response is replayed to
+    every retry until ``expires_at``.
+    """
+
+    # "user:<pk>", "auth:<digest of the Authorization header>" or "ip:<address>"
+    owner = models.CharField(max_length=128)
+    key = models.CharField(max_length=255)
+    # SHA-256 of method, path and body: a key may not be reused for another request
+    fingerprint = models.CharField(max_length=64)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_headers = models.JSONField(default=dict, blank=True)
+    response_body = models.BinaryField(default=b"", blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "key"], name="idempotency_owner_key_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.key} ({self.owner})"
@@ -0,0 +1,90 @@
+"""Claiming, completing and expiring idempotency keys.
+
+The unique ``(owner, key)`` row is the lock: the request that inserts it
+runs, every duplicate finds it. A claim whose request died without
+finishing (``locked_at`` older than ``IDEMPOTENCY_LOCK_SECONDS``) can be
+taken over by the next retry.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+
+def _ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_TTL_SECONDS", 24 * 60 * 60))
+
+
+def claim(owner: str, key: str, fingerprint: str) -> tuple[IdempotencyKey | None, bool]:
+    """Return ``(record, True)`` if this request should run, else the existing record.
+
+    ``(None, False)`` means another request released the key while we looked.
+    """
+    now = timezone.now()
+    record = IdempotencyKey.objects.filter(owner=owner, key=key).first()
+    if record is not None and record.expires_at <= now:
+        IdempotencyKey.objects.filter(pk=record.pk, expires_at=record.expires_at).delete()
+        record = None
+    if record is None:
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    owner=owner,
+                    key=key,
+                    fingerprint=fingerprint,
+                    locked_at=now,
+                    expires_at=now + _ttl(),
+                )
+            return record, True
+        except IntegrityError:
+            # a concurrent duplicate inserted it first
+            record = IdempotencyKey.objects.filter(owner=owner, key=key).first()
+            if record is None:
+                return None, False
+
+    stale = now - timedelta(seconds=getattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 60))
+    if record.fingerprint == fingerprint and record.locked_at is not None and record.locked_at <= stale:
+        taken = IdempotencyKey.objects.filter(pk=record.pk, locked_at=record.locked_at).update(
+            locked_at=now
+        )
+        if taken:
+            record.locked_at = now
+            return record, True
+    return record, False
+
+
+def complete(record: IdempotencyKey, status: int, headers: dict[str, str], body: bytes) -> None:
+    IdempotencyKey.objects.filter(pk=record.pk).update(
+        locked_at=None,
+        response_status=status,
+        response_headers=headers,
+        response_body=body,
+    )
+
+
+def release(record: IdempotencyKey) -> None:
+    """Forget a claim whose response should not be replayed, so a retry runs again."""
+    IdempotencyKey.objects.filter(pk=record.pk, response_status__isnull=True).delete()
+
+
+def purge_expired(batch_size: int = 1000) -> int:
+    """Delete expired keys ``batch_size`` rows at a time; return the count."""
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).values_list("pk", flat=True)[
+                :batch_size
+            ]
+        )
+        if not ids:
+            return deleted
+        count, _ = IdempotencyKey.objects.filter(pk__in=ids).delete()
+        deleted += count
+        if len(ids) < batch_size:
+            return deleted
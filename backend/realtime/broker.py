@@ -0,0 +1,105 @@
+"""In-process fan-out of events to Server-Sent Events subscribers.
+
+Each open stream owns a bounded ``asyncio.Queue`` on the event loop that
+serves it. Publishers may run in any thread (sync views run in a thread
+pool under ASGI) and hand events over with ``call_soon_threadsafe``, so an
+open stream costs one queue and no database connection.
+
+Fan-out is per process: run the ASGI app as a single process (many
+coroutines) or put a pub/sub bridge in front of ``publish`` when scaling
+out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from django.db import transaction
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict[str, Any]
+
+    def encode(self) -> str:
+        payload = json.dumps(self.data, separators=(",", ":"), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(repr=False)
+    dropped: int = 0
+
+    def offer(self, event: Event) -> None:
+        # runs on the subscriber's loop; a slow reader loses its oldest events
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(
+            user_id=user_id,
+            loop=asyncio.get_running_loop(),
+            queue=asyncio.Queue(maxsize=self.queue_size),
+        )
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self, user_id: int | None = None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(user_id, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, user_ids: Iterable[int | None], event_type: str, data: dict[str, Any]) -> Event:
+        event = Event(id=next(self._ids), type=event_type, data=data)
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in set(user_ids)
+                if user_id is not None
+                for subscription in self._subscribers.get(user_id, ())
+            ]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # loop already closed; the stream is going away anyway
+                self.unsubscribe(subscription)
+        return event
+
+    def publish_on_commit(self, user_ids: Iterable[int | None], event_type: str, data: dict[str, Any]) -> None:
+        """Publish once the surrounding transaction commits (immediately if none)."""
+        user_ids = list(user_ids)
+        transaction.on_commit(lambda: self.publish(user_ids, event_type, data))
+
+
+broker = EventBroker()
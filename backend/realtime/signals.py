@@ -0,0 +1,81 @@
+"""Turn model changes into stream events.
+
+Events are published after commit so subscribers never see a transition
+that was rolled back.
+"""
+
+from __future__ import annotations
+
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from buyers.models import BatchMarketInfo
+from buyers.services import find_requirements_for_batch
+from suppliers.models import ProductBatch
+
+from .broker import broker
+
+QC_EVENT = "qc_status"
+MATCH_EVENT = "match"
+
+
+@receiver(post_init, sender=ProductBatch)
+def remember_qc_status(sender, instance, **kwargs):
+    instance._loaded_qc_status = instance.qc_status
+
+
+def _is_listed(batch: ProductBatch) -> bool:
+    return batch.qc_status == "brin_verified_pass" and batch.is_allowed_for_catalog
+
+
+def publish_matches(info: BatchMarketInfo) -> None:
+    for requirement in find_requirements_for_batch(info):
+        broker.publish_on_commit(
+            [requirement.buyer_id],
+            MATCH_EVENT,
+            {
+                "requirement_id": requirement.pk,
+                "batch_id": info.batch_id,
+                "batch_code": info.batch.batch_code,
+                "species": info.species,
+                "ready_date": info.ready_date,
+                "price_per_unit": info.price_per_unit,
+            },
+        )
+
+
+@receiver(post_save, sender=ProductBatch)
+def publish_qc_transition(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None if created else instance._loaded_qc_status
+    current = instance.qc_status
+    instance._loaded_qc_status = current
+    if previous == current:
+        return
+    broker.publish_on_commit(
+        [instance.supplier_id],
+        QC_EVENT,
+        {
+            "batch_id": instance.pk,
+            "batch_code": instance.batch_code,
+            "from": previous,
+            "to": current,
+            "at": timezone.now(),
+        },
+    )
+    if _is_listed(instance):
+        try:
+            info = instance.market_info
+        except BatchMarketInfo.DoesNotExist:
+            return
+        publish_matches(info)
+
+
+@receiver(post_save, sender=BatchMarketInfo)
+def publish_new_listing(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    if _is_listed(instance.batch):
+        publish_matches(instance)
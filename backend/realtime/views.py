@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import exceptions
+
+from accounts.authentication import BearerTokenAuthentication
+
+from .broker import broker
+
+
+def _heartbeat_seconds() -> float:
+    return getattr(settings, "EVENT_STREAM_HEARTBEAT_SECONDS", 15)
+
+
+@sync_to_async
+def _token_user(raw_key: str):
+    try:
+        user, _token = BearerTokenAuthentication().authenticate_credentials(raw_key)
+    except exceptions.AuthenticationFailed:
+        return None
+    return user
+
+
+async def _authenticate(request):
+    # EventSource cannot send headers, so the token may also come as ?access_token=
+    header = request.headers.get("Authorization", "")
+    keyword, _, raw_key = header.partition(" ")
+    if keyword == BearerTokenAuthentication.keyword and raw_key:
+        return await _token_user(raw_key.strip())
+    if request.GET.get("access_token"):
+        return await _token_user(request.GET["access_token"])
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+async def _event_source(subscription):
+    heartbeat = _heartbeat_seconds()
+    try:
+        yield f"retry: {int(heartbeat * 1000)}\n\n"
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield event.encode()
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def event_stream(request):
+    """Server-Sent Events: QC transitions and new marketplace matches for the caller.
+
+    Authentication is the only database work; after that the stream just
+    awaits its in-memory queue, so open streams hold no DB connection.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed."}, status=405)
+    if not isinstance(request, ASGIRequest):
+        # WSGI would buffer the never-ending body; serve this through config.asgi
+        return JsonResponse(
+            {"detail": "Event stream requires the ASGI server."}, status=501
+        )
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    subscription = broker.subscribe(user.pk)
+    response = StreamingHttpResponse(
+        _event_source(subscription), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
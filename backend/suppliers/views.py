@@ -1,8 +1,15 @@
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from archive import history
+from config.sqlite import single_writer
+from config.throttling import throttle_cost
+from idempotency.middleware import idempotent
+from webhooks.outbox import enqueue_batch_verified
+
 from .brin_stub import simulate_brin_qc
 from .models import ProductBatch, QcRecord
 from .serializers import ProductBatchSerializer, QcRecordSerializer
@@ -31,9 +38,15 @@ class ProductBatchViewSet(viewsets.ModelViewSet):
         ctx["request"] = self.request
         return ctx
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     # ---------- BRIN QC FLOW ----------
 
     @action(detail=True, methods=["post"], url_path="submit-qc")
+    @idempotent
+    @single_writer
     def submit_qc(self, request, pk=None):
         """
         Supplier 'mengirim' form QC ke BRIN (stub).
@@ -70,7 +83,22 @@ class ProductBatchViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    @action(detail=True, methods=["get"], url_path="qc-history")
+    def qc_history(self, request, pk=None):
+        """
+        Semua QcRecord batch ini (termasuk yang sudah diarsip), paling lama dulu.
+        """
+        batch = self.get_object()
+        records = history.qc_history(batch.pk)
+        return Response(
+            {"records": records, "chain_intact": history.qc_chain_intact(records)},
+            status=status.HTTP_200_OK,
+        )
+
     @action(detail=True, methods=["post"], url_path="process-brin")
+    @throttle_cost(5)
+    @idempotent
+    @single_writer
     def process_brin(self, request, pk=None):
         """
         Simulasi BRIN memproses QC.
@@ -84,40 +112,44 @@ class ProductBatchViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # set status verifying
-        batch.qc_status = "brin_verifying"
-        batch.save(update_fields=["qc_status"])
-
-        # run stub simulator
-        response = simulate_brin_qc(batch.brin_request_payload or {})
-        passed = bool(response.get("passed"))
-
-        # update batch
-        batch.brin_response_payload = response
-        batch.last_qc_at = timezone.now()
-        if passed:
-            batch.qc_status = "brin_verified_pass"
-            batch.is_allowed_for_catalog = True
-        else:
-            batch.qc_status = "brin_verified_fail"
-        batch.save(
-            update_fields=[
-                "brin_response_payload",
-                "last_qc_at",
-                "qc_status",
-                "is_allowed_for_catalog",
-            ]
-        )
+        # status change, ledger row and outbox events commit together
+        with transaction.atomic():
+            # set status verifying
+            batch.qc_status = "brin_verifying"
+            batch.save(update_fields=["qc_status"])
+
+            # run stub simulator
+            response = simulate_brin_qc(batch.brin_request_payload or {})
+            passed = bool(response.get("passed"))
+
+            # update batch
+            batch.brin_response_payload = response
+            batch.last_qc_at = timezone.now()
+            if passed:
+                batch.qc_status = "brin_verified_pass"
+                batch.is_allowed_for_catalog = True
+            else:
+                batch.qc_status = "brin_verified_fail"
+            batch.save(
+                update_fields=[
+                    "brin_response_payload",
+                    "last_qc_at",
+                    "qc_status",
+                    "is_allowed_for_catalog",
+                ]
+            )
 
-        # simpan ke ledger QcRecord
-        results = response.get("results", {}) or {}
-        contamination_score = float(results.get("lcms_score", 0.0))
-        qc_record = QcRecord.objects.create(
-            batch=batch,
-            passed=passed,
-            contamination_score=contamination_score,
-            details=response,
-        )
+            # simpan ke ledger QcRecord
+            results = response.get("results", {}) or {}
+            contamination_score = float(results.get("lcms_score", 0.0))
+            qc_record = QcRecord.objects.create(
+                batch=batch,
+                passed=passed,
+                contamination_score=contamination_score,
+                details=response,
+            )
+            if passed:
+                enqueue_batch_verified(batch)
 
         batch_data = self.get_serializer(batch).data
         qc_data = QcRecordSerializer(qc_record).data
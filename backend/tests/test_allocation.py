@@ -0,0 +1,127 @@
+import random
+from datetime import date
+from decimal import Decimal
+from itertools import combinations, count
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from buyers.allocation import Candidate, solve
+from buyers.models import BatchMarketInfo, BuyerProfile, BuyerRequirement
+from suppliers.models import ProductBatch
+
+
+User = get_user_model()
+
+
+def _candidates(rows):
+    return [
+        Candidate(index, index, f"B-{index}", quantity, Decimal(price))
+        for index, (quantity, price) in enumerate(rows, start=1)
+    ]
+
+
+class AllocationSolverTests(SimpleTestCase):
+    def test_merges_two_cheap_batches_into_one_that_fits(self):
+        # greedy takes the two cheapest (126 for 120 units); one batch is cheaper
+        candidates = _candidates([(60, "1.00"), (60, "1.10"), (100, "1.20")])
+        result = solve(candidates, 100, 150)
+        self.assertTrue(result.feasible)
+        self.assertEqual([c.batch_id for c in result.chosen], [3])
+        self.assertEqual(result.total_price, Decimal("120.00"))
+        self.assertEqual(result.lower_bound, Decimal("104.00"))
+
+    def test_matches_brute_force_on_small_instances(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            rows = [(rng.randint(10, 120), f"{rng.uniform(1, 5):.2f}") for _ in range(8)]
+            candidates = _candidates(rows)
+            best = None
+            for size in range(1, len(candidates) + 1):
+                for subset in combinations(candidates, size):
+                    volume = sum(c.quantity for c in subset)
+                    if 150 <= volume <= 220:
+                        price = sum(c.cost for c in subset)
+                        best = price if best is None else min(best, price)
+            result = solve(candidates, 150, 220)
+            self.assertEqual(result.feasible, best is not None)
+            if best is not None:
+                self.assertLessEqual(result.lower_bound, best)
+                self.assertEqual(result.total_price, best)
+
+    def test_short_market_is_infeasible(self):
+        result = solve(_candidates([(40, "1"), (50, "1")]), 100, None)
+        self.assertFalse(result.feasible)
+        self.assertIsNone(result.lower_bound)
+        self.assertEqual(result.as_dict()["batches"], [])
+
+    def test_thousands_of_candidates_stay_within_budget(self):
+        rng = random.Random(1)
+        candidates = _candidates(
+            [(rng.randint(50, 2000), f"{rng.uniform(1, 9):.2f}") for _ in range(3000)]
+        )
+        result = solve(candidates, 20000, 24000, time_budget=0.3)
+        self.assertTrue(result.feasible)
+        self.assertLess(result.elapsed_ms, 1500)
+        self.assertGreaterEqual(result.total_price, result.lower_bound)
+
+
+class AllocationEndpointTests(TestCase):
+    codes = count(1)
+
+    def setUp(self):
+        self.buyer = User.objects.create_user(username="buyer")
+        BuyerProfile.objects.create(user=self.buyer, organization="Org", country="JP")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.buyer)
+        self.requirement = BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="tuna",
+            min_volume=1000,
+            max_volume=1200,
+            allowed_contaminants={"mercury": 0.5},
+            shipping_window_start=date(2025, 6, 1),
+            shipping_window_end=date(2025, 6, 10),
+        )
+        self.cheap = self._listing(600, "0.1", "10")
+        self.second = self._listing(500, "0.2", "11")
+        self._listing(700, "0.2", "30")
+        self._listing(900, "0.9", "1")  # over the mercury limit
+        self._listing(900, "0.1", "1", ready=date(2025, 7, 1))  # outside the window
+
+    def _listing(self, quantity, mercury, price, ready=date(2025, 6, 2)):
+        batch = ProductBatch.objects.create(
+            batch_code=f"A-{next(self.codes)}",
+            product_name="Tuna",
+            quantity=quantity,
+            qc_status="brin_verified_pass",
+            is_allowed_for_catalog=True,
+        )
+        return BatchMarketInfo.objects.create(
+            batch=batch,
+            species="Tuna",
+            ready_date=ready,
+            contaminant_mercury_ppm=Decimal(mercury),
+            price_per_unit=Decimal(price),
+        )
+
+    def _url(self):
+        return f"/api/buyer/requirements/{self.requirement.pk}/allocation/"
+
+    def test_combines_batches_that_are_each_below_min_volume(self):
+        response = self.client.get(self._url())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["feasible"])
+        self.assertEqual(response.data["candidates"], 3)
+        self.assertEqual(
+            [row["batch_id"] for row in response.data["batches"]],
+            [self.cheap.batch_id, self.second.batch_id],
+        )
+        self.assertEqual(response.data["total_volume"], 1100)
+        self.assertEqual(response.data["total_price"], "11500.00")
+
+    def test_time_budget_is_validated(self):
+        self.assertEqual(self.client.get(self._url(), {"time_budget_ms": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(self._url(), {"time_budget_ms": 10**6}).status_code, 400)
+        self.assertEqual(self.client.get(self._url(), {"time_budget_ms": 50}).status_code, 200)
@@ -0,0 +1,181 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from archive.archiver import archive_cold_rows
+from archive.history import qc_chain_intact, qc_history
+from archive.models import ArchivedDeal, ArchivedQcRecord, ArchivedQualityCheckLog, ArchivedRequirement
+from buyers.models import BatchMarketInfo, BuyerProfile, BuyerRequirement, QualityCheckLog
+from buyers.services import create_quality_check
+from exporter.assignment import _Codes, load_batches
+from exporter.models import Deal, DealRollup
+from exporter.rollups import rebuild_rollups
+from suppliers.models import ProductBatch, QcRecord
+
+
+User = get_user_model()
+
+
+def rollups(exporter):
+    return sorted(
+        (r.status, r.month, r.product_name, r.deal_count, r.total_quantity, r.total_price)
+        for r in DealRollup.objects.filter(exporter=exporter, deal_count__gt=0)
+    )
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.old = timezone.now() - timedelta(days=400)
+        self.buyer = User.objects.create_user(username="buyer")
+        BuyerProfile.objects.create(user=self.buyer, organization="Org", country="JP")
+        self.exporter = User.objects.create_user(username="exporter")
+        self.batch = ProductBatch.objects.create(batch_code="A-1", product_name="Tuna", quantity=100)
+
+        for score in (10, 20, 30):
+            QcRecord.objects.create(batch=self.batch, passed=True, contamination_score=score)
+        QcRecord.objects.update(created_at=self.old)
+
+        self.settled = self._requirement(BuyerRequirement.STATUS_DONE)
+        create_quality_check(self.settled)
+        create_quality_check(self.settled)
+        self.open = self._requirement(BuyerRequirement.STATUS_OPEN)
+        self.completed = self._deal(self.settled, "completed")
+        self.pending = self._deal(self.open, "pending")
+        BuyerRequirement.objects.update(updated_at=self.old)
+        Deal.objects.update(updated_at=self.old)
+
+    def _requirement(self, status):
+        return BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="tuna",
+            min_volume=10,
+            status=status,
+            shipping_window_start=date(2024, 6, 1),
+            shipping_window_end=date(2024, 6, 30),
+        )
+
+    def _deal(self, requirement, status):
+        return Deal.objects.create(
+            exporter=self.exporter,
+            buyer_requirement=requirement,
+            product_batch=self.batch,
+            status=status,
+            quantity=Decimal("10"),
+            total_price=Decimal("120"),
+        )
+
+    def test_moves_only_cold_final_rows_in_batches(self):
+        before = rollups(self.exporter)
+        moved = archive_cold_rows(batch_size=1)
+        self.assertEqual(moved, {"deals": 1, "qc_records": 2, "requirements": 1})
+
+        self.assertEqual(list(Deal.objects.values_list("pk", flat=True)), [self.pending.pk])
+        self.assertTrue(ArchivedDeal.objects.filter(pk=self.completed.pk, product_name="Tuna").exists())
+        self.assertEqual(list(BuyerRequirement.objects.values_list("pk", flat=True)), [self.open.pk])
+        self.assertTrue(ArchivedRequirement.objects.filter(pk=self.settled.pk).exists())
+        self.assertEqual(QualityCheckLog.objects.filter(requirement_id=self.settled.pk).count(), 0)
+        self.assertEqual(ArchivedQualityCheckLog.objects.filter(requirement_id=self.settled.pk).count(), 2)
+        self.assertEqual(QcRecord.objects.count(), 1)
+        self.assertEqual(ArchivedQcRecord.objects.count(), 2)
+
+        # dashboard totals still count archived deals, before and after a rebuild
+        self.assertEqual(rollups(self.exporter), before)
+        rebuild_rollups()
+        self.assertEqual(rollups(self.exporter), before)
+
+        self.assertEqual(archive_cold_rows(), {"deals": 0, "qc_records": 0, "requirements": 0})
+
+    def test_hash_chain_continues_across_tiers(self):
+        archive_cold_rows()
+        head = QcRecord.objects.get()
+        new = QcRecord.objects.create(batch=self.batch, passed=False, contamination_score=90)
+        self.assertEqual(new.previous_hash, head.record_hash)
+
+        records = qc_history(self.batch.pk)
+        self.assertEqual([row["archived"] for row in records], [True, True, False, False])
+        self.assertEqual([row["contamination_score"] for row in records], [10, 20, 30, 90])
+        self.assertTrue(qc_chain_intact(records))
+
+        response = APIClient().get(f"/api/supplier/batches/{self.batch.pk}/qc-history/")
+        self.assertEqual(len(response.json()["records"]), 4)
+        self.assertTrue(response.json()["chain_intact"])
+
+    def test_history_endpoints_cover_both_tiers(self):
+        archive_cold_rows()
+        client = APIClient()
+        client.force_authenticate(user=self.buyer)
+        rows = client.get("/api/buyer/requirements/history/").json()["results"]
+        self.assertEqual(
+            {(row["id"], row["archived"]) for row in rows},
+            {(self.settled.pk, True), (self.open.pk, False)},
+        )
+        self.assertEqual(rows[0]["commodity"], "tuna")
+
+        client.force_authenticate(user=self.exporter)
+        deals = client.get("/api/exporter/deals/history/").json()["results"]
+        self.assertEqual(
+            {(row["id"], row["status"], row["archived"]) for row in deals},
+            {(self.completed.pk, "completed", True), (self.pending.pk, "pending", False)},
+        )
+
+        # pages are cut from the union in SQL
+        page = client.get("/api/exporter/deals/history/", {"page_size": 1}).json()
+        self.assertEqual((page["count"], len(page["results"])), (2, 1))
+        self.assertEqual(page["results"][0]["id"], self.pending.pk)
+
+    def test_list_and_detail_endpoints_cover_both_tiers(self):
+        archive_cold_rows()
+        client = APIClient()
+        client.force_authenticate(user=self.buyer)
+        listing = client.get("/api/buyer/requirements/").json()
+        self.assertEqual(listing["count"], 2)
+        self.assertEqual(
+            [(row["id"], row["archived"]) for row in listing["results"]],
+            [(self.open.pk, False), (self.settled.pk, True)],
+        )
+        detail = client.get(f"/api/buyer/requirements/{self.settled.pk}/")
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual((detail.data["commodity"], detail.data["archived"]), ("tuna", True))
+        latest = ArchivedQualityCheckLog.objects.filter(requirement_id=self.settled.pk).last()
+        self.assertEqual(detail.data["quality_summary"]["hash"], latest.hash)
+        # archived rows are read-only
+        self.assertEqual(client.patch(f"/api/buyer/requirements/{self.settled.pk}/", {"notes": "x"}).status_code, 404)
+
+        client.force_authenticate(user=self.exporter)
+        deals = client.get("/api/exporter/deals/").json()
+        self.assertEqual(
+            [(row["id"], row["archived"]) for row in deals],
+            [(self.pending.pk, False), (self.completed.pk, True)],
+        )
+        detail = client.get(f"/api/exporter/deals/{self.completed.pk}/").json()
+        self.assertEqual((detail["product_name"], detail["status"]), ("Tuna", "completed"))
+        self.assertEqual(client.get("/api/exporter/deals/999/").status_code, 404)
+
+    def test_batches_of_archived_deals_stay_committed(self):
+        ProductBatch.objects.filter(pk=self.batch.pk).update(
+            is_allowed_for_catalog=True, qc_status="brin_verified_pass"
+        )
+        BatchMarketInfo.objects.create(
+            batch=self.batch, species="Tuna", ready_date=date(2024, 6, 10), price_per_unit=Decimal("5")
+        )
+        self.pending.delete()
+        archive_cold_rows()
+        self.assertFalse(Deal.objects.exists())
+        self.assertEqual(list(load_batches(_Codes())["id"]), [])
+
+    def test_dry_run_and_command(self):
+        out = StringIO()
+        call_command("archive_cold_data", "--dry-run", stdout=out)
+        self.assertIn("[dry run] archived 1 deals, 2 qc records", out.getvalue())
+        self.assertEqual(Deal.objects.count(), 2)
+
+        call_command("archive_cold_data", "--days", "500", stdout=StringIO())
+        self.assertFalse(ArchivedDeal.objects.exists())
+        call_command("archive_cold_data", stdout=StringIO())
+        self.assertEqual(ArchivedDeal.objects.count(), 1)
@@ -0,0 +1,148 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from itertools import count
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from buyers.models import BatchMarketInfo, BuyerRequirement
+from exporter.assignment import solve
+from exporter.models import AssignmentProposal, AssignmentRun, Deal, ExporterProfile
+from suppliers.models import ProductBatch
+
+
+User = get_user_model()
+
+
+class AssignmentSolverTests(SimpleTestCase):
+    def test_scarce_requirement_is_served_before_a_flexible_one(self):
+        # requirement 0 can use every batch, requirement 1 only batch 0;
+        # serving 0 first would take batch 0 and leave 1 unfilled
+        compatible = np.array([[True, True, True], [True, False, False]])
+        owner = solve(
+            compatible,
+            quantity=np.array([100, 100, 100]),
+            price=np.array([1.0, 2.0, 3.0]),
+            minimum=np.array([200, 100]),
+            maximum=np.array([300, 100]),
+        )
+        self.assertEqual(owner.tolist(), [1, 0, 0])
+
+    def test_requirement_that_cannot_reach_minimum_gets_nothing(self):
+        compatible = np.array([[True, True]])
+        owner = solve(
+            compatible, np.array([100, 100]), np.array([1.0, 1.0]), np.array([300]), np.array([400])
+        )
+        self.assertEqual(owner.tolist(), [-1, -1])
+
+    def test_skips_batches_that_would_overshoot_the_maximum(self):
+        compatible = np.array([[True, True, True]])
+        owner = solve(
+            compatible,
+            np.array([100, 500, 100]),
+            np.array([1.0, 2.0, 3.0]),
+            np.array([200]),
+            np.array([250]),
+        )
+        self.assertEqual(owner.tolist(), [0, -1, 0])
+
+
+class AssignmentRunTests(TestCase):
+    codes = count(1)
+
+    def setUp(self):
+        self.exporter = User.objects.create_user(username="exporter")
+        ExporterProfile.objects.create(
+            user=self.exporter, company_name="PT Ekspor", license_number="EXP-1", phone="1", address="x"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.exporter)
+        self.tuna = self._requirement("tuna", 500, 800, {"mercury": 0.5})
+        self.shrimp = self._requirement("shrimp", 200, 0, {})
+        self.cheap = self._listing("Tuna", 300, "10", mercury="0.1")
+        self.second = self._listing("Tuna", 300, "12", mercury="0.2")
+        self._listing("Tuna", 300, "5", mercury="0.9")  # over the mercury limit
+        self._listing("Tuna", 300, "20", mercury="0.1")
+        self.prawn = self._listing("Shrimp", 250, "7")
+        committed = self._listing("Shrimp", 250, "3")
+        Deal.objects.create(
+            exporter=self.exporter,
+            buyer_requirement=self.shrimp,
+            product_batch=committed.batch,
+            quantity=250,
+            total_price=750,
+        )
+
+    def _requirement(self, product, minimum, maximum, contaminants):
+        return BuyerRequirement.objects.create(
+            product_type=product,
+            min_volume=minimum,
+            max_volume=maximum,
+            allowed_contaminants=contaminants,
+            shipping_window_start=date(2025, 6, 1),
+            shipping_window_end=date(2025, 6, 30),
+        )
+
+    def _listing(self, species, quantity, price, mercury=None):
+        batch = ProductBatch.objects.create(
+            batch_code=f"G-{next(self.codes)}",
+            product_name=species,
+            quantity=quantity,
+            qc_status="brin_verified_pass",
+            is_allowed_for_catalog=True,
+        )
+        return BatchMarketInfo.objects.create(
+            batch=batch,
+            species=species,
+            ready_date=date(2025, 6, 10),
+            price_per_unit=Decimal(price),
+            contaminant_mercury_ppm=Decimal(mercury) if mercury else None,
+        )
+
+    def test_post_runs_optimizer_and_writes_proposals(self):
+        response = self.client.post("/api/exporter/assignments/")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["filled_count"], 2)
+        self.assertEqual(response.data["requirement_count"], 2)
+        self.assertEqual(response.data["batch_count"], 5)  # committed batch left out
+        self.assertEqual(response.data["assigned_volume"], 850)
+        self.assertEqual(Decimal(response.data["total_price"]), Decimal("8350"))
+
+        run = AssignmentRun.objects.get()
+        self.assertEqual(run.created_by, self.exporter)
+        self.assertEqual(
+            set(AssignmentProposal.objects.values_list("requirement_id", "batch_id")),
+            {
+                (self.tuna.pk, self.cheap.batch_id),
+                (self.tuna.pk, self.second.batch_id),
+                (self.shrimp.pk, self.prawn.batch_id),
+            },
+        )
+
+        listing = self.client.get(f"/api/exporter/assignments/{run.pk}/proposals/", {"requirement": self.shrimp.pk})
+        self.assertEqual([row["batch_code"] for row in listing.data], [self.prawn.batch.batch_code])
+        self.assertEqual(len(self.client.get("/api/exporter/assignments/").data), 1)
+
+    def test_runs_are_private_to_their_creator(self):
+        run = AssignmentRun.objects.create(created_by=User.objects.create_user(username="other"))
+        self.assertEqual(self.client.get(f"/api/exporter/assignments/{run.pk}/").status_code, 404)
+
+    def test_only_exporters_start_runs(self):
+        self.client.force_authenticate(user=User.objects.create_user(username="buyer"))
+        self.assertEqual(self.client.post("/api/exporter/assignments/").status_code, 403)
+        self.assertFalse(AssignmentRun.objects.exists())
+
+    def test_non_numeric_requirement_filter_is_rejected(self):
+        run = AssignmentRun.objects.create(created_by=self.exporter)
+        response = self.client.get(f"/api/exporter/assignments/{run.pk}/proposals/", {"requirement": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_reports_run(self):
+        out = StringIO()
+        call_command("propose_assignments", stdout=out)
+        self.assertIn("filled 2 of 2 requirements", out.getvalue())
+        self.assertIsNone(AssignmentRun.objects.get().created_by)
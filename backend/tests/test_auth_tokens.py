@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import AuthToken, UserProfile
+from buyers.models import BuyerProfile
+
+
+User = get_user_model()
+
+LOGIN_URL = "/api/auth/login/"
+LOGOUT_URL = "/api/auth/logout/"
+REQUIREMENTS_URL = "/api/buyer/requirements/"
+
+
+class BearerTokenTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="tokenbuyer",
+            email="tokenbuyer@example.com",
+            password="pass12345",
+        )
+        UserProfile.objects.create(user=self.user, role="buyer", identity_type="ID_CARD")
+        BuyerProfile.objects.create(user=self.user, organization="Token Org", country="JP")
+
+    def _login(self, identifier="tokenbuyer"):
+        response = self.client.post(
+            LOGIN_URL,
+            {"identifier": identifier, "password": "pass12345"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json()
+
+    def test_login_issues_bearer_token_usable_on_api(self):
+        body = self._login()
+        self.assertEqual(body["token_type"], "Bearer")
+        token = AuthToken.objects.get(user=self.user)
+        self.assertNotEqual(token.digest, body["token"])
+        self.assertEqual(token.digest, AuthToken.digest_for(body["token"]))
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {body['token']}")
+        with self.assertNumQueries(2):
+            # token lookup (with user and profiles), count; the role check is free
+            response = self.client.get(REQUIREMENTS_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_accepts_email_identifier_and_rejects_bad_password(self):
+        self.assertIn("token", self._login("tokenbuyer@example.com"))
+        bad = self.client.post(
+            LOGIN_URL,
+            {"identifier": "tokenbuyer", "password": "wrong"},
+            format="json",
+        )
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_and_revoked_tokens_are_rejected(self):
+        token, key = AuthToken.issue(self.user)
+        AuthToken.objects.filter(pk=token.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+        expired = self.client.get(REQUIREMENTS_URL)
+        self.assertEqual(expired.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(expired.json()["detail"], "Token has expired.")
+
+        token, key = AuthToken.issue(self.user)
+        token.revoke()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+        revoked = self.client.get(REQUIREMENTS_URL)
+        self.assertEqual(revoked.json()["detail"], "Token has been revoked.")
+
+    def test_logout_revokes_current_token(self):
+        key = self._login()["token"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+        response = self.client.post(LOGOUT_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(AuthToken.objects.get(user=self.user).is_revoked)
+        self.assertEqual(self.client.get(REQUIREMENTS_URL).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import AuthToken, UserProfile
+from buyers.models import BuyerProfile, BuyerRequirement
+from config import replicas
+from config.replicas import PIN_COOKIE
+
+
+User = get_user_model()
+
+BATCH_URL = "/api/batch/"
+REQUIREMENT = {
+    "commodity": "tuna",
+    "min_volume": 100,
+    "shipping_window_start": "2025-06-01",
+    "shipping_window_end": "2025-06-30",
+}
+
+
+class BatchEndpointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="batchbuyer", first_name="Batch")
+        UserProfile.objects.create(user=self.user, role="buyer", identity_type="ID_CARD")
+        BuyerProfile.objects.create(user=self.user, organization="Org", country="JP")
+        _, key = AuthToken.issue(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+
+    def _batch(self, requests, client=None, **extra):
+        return (client or self.client).post(BATCH_URL, {"requests": requests, **extra}, format="json")
+
+    def test_runs_sub_requests_in_order_with_one_authentication(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._batch(
+                [
+                    {"method": "GET", "path": "/api/auth/me/"},
+                    {"method": "POST", "path": "/api/buyer/requirements/", "body": REQUIREMENT},
+                    {"method": "GET", "path": "/api/buyer/requirements/?page_size=5"},
+                    {"method": "GET", "path": "/api/user/"},
+                ]
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        me, created, listing, settings_doc = response.json()["responses"]
+
+        self.assertEqual(me["status"], 200)
+        self.assertEqual(me["body"]["user"]["role"], "buyer")
+        self.assertEqual(created["status"], 201)
+        self.assertEqual(created["body"]["commodity"], "tuna")
+        self.assertEqual(listing["body"]["count"], 1)
+        self.assertTrue(listing["headers"]["Content-Type"].startswith("application/json"))
+        self.assertIn("user", settings_doc["body"])
+        self.assertEqual(BuyerRequirement.objects.count(), 1)
+
+        token_lookups = [q for q in queries if '"accounts_authtoken"' in q["sql"]]
+        self.assertEqual(len(token_lookups), 1)
+
+    def test_failures_are_reported_per_sub_request(self):
+        response = self._batch(
+            [
+                {"method": "GET", "path": "/api/does-not-exist/"},
+                {"method": "GET", "path": "/admin/"},
+                {"method": "POST", "path": BATCH_URL, "body": {"requests": []}},
+                {"method": "TRACE", "path": "/api/auth/me/"},
+                {"method": "POST", "path": "/api/buyer/requirements/", "body": {}},
+                {"method": "GET", "path": "/api/auth/me/"},
+            ]
+        )
+        statuses = [item["status"] for item in response.json()["responses"]]
+        self.assertEqual(statuses, [404, 400, 400, 400, 400, 200])
+
+    def test_sub_requests_keep_their_permission_checks(self):
+        response = self._batch([{"method": "GET", "path": "/api/buyer/requirements/"}], client=APIClient())
+        self.assertIn(response.json()["responses"][0]["status"], (401, 403))
+
+    def test_concurrent_reads(self):
+        response = self._batch(
+            [{"method": "GET", "path": "/api/auth/me/"}] * 3,
+            concurrent=True,
+        )
+        bodies = [item["body"]["user"]["username"] for item in response.json()["responses"]]
+        self.assertEqual(bodies, ["batchbuyer"] * 3)
+
+    def test_only_successful_writes_pin_the_client(self):
+        marketplace = {"method": "GET", "path": "/api/buyer/marketplace/"}
+        create = {"method": "POST", "path": "/api/buyer/requirements/", "body": REQUIREMENT}
+        with mock.patch.object(replicas, "healthy_replica", return_value=None) as chosen:
+            reads = self._batch([marketplace])
+            self.assertNotIn(PIN_COOKIE, reads.cookies)
+            self.assertTrue(chosen.called)
+
+            chosen.reset_mock()
+            failed = self._batch([{**create, "body": {}}, marketplace])
+            self.assertNotIn(PIN_COOKIE, failed.cookies)
+            self.assertTrue(chosen.called)
+
+            chosen.reset_mock()
+            wrote = self._batch([create, marketplace])
+            self.assertEqual(wrote.cookies[PIN_COOKIE]["max-age"], 5)
+            # the read after the write went to the primary
+            self.assertFalse(chosen.called)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_rejects_empty_and_oversized_batches(self):
+        self.assertEqual(self._batch([]).status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = [{"method": "GET", "path": "/api/auth/me/"}] * 3
+        self.assertEqual(self._batch(too_many).status_code, status.HTTP_400_BAD_REQUEST)
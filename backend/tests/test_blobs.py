@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from accounts.models import UserProfile
+from blobs.gc import collect_garbage
+from blobs.models import Blob
+from blobs.storage import blob_storage
+
+
+User = get_user_model()
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=self.media_root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def _profile(self, username):
+        user = User.objects.create_user(username=username, password="x")
+        return UserProfile.objects.create(user=user, role="supplier", identity_type="ID_CARD")
+
+    def test_identical_uploads_are_stored_once(self):
+        first = self._profile("a")
+        second = self._profile("b")
+        first.photo.save("me.PNG", ContentFile(b"same-bytes"))
+        second.photo.save("other-name.png", ContentFile(b"same-bytes"))
+
+        self.assertEqual(first.photo.name, second.photo.name)
+        self.assertRegex(first.photo.name, r"^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$")
+        self.assertEqual(Blob.objects.get(name=first.photo.name).refcount, 2)
+        blob_dir = os.path.dirname(blob_storage.path(first.photo.name))
+        self.assertEqual(os.listdir(blob_dir), [os.path.basename(first.photo.name)])
+
+    def test_blob_urls_are_served_with_immutable_cache_headers(self):
+        profile = self._profile("a")
+        profile.photo.save("me.png", ContentFile(b"bytes"))
+
+        response = self.client.get(profile.photo.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"bytes")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(self.client.get("/media/cas/00/00/missing.png").status_code, 404)
+
+    def test_gc_recounts_and_removes_orphaned_blobs(self):
+        kept = self._profile("a")
+        kept.photo.save("keep.png", ContentFile(b"keep"))
+        dropped = self._profile("b")
+        dropped.photo.save("drop.png", ContentFile(b"drop"))
+        orphan_name = dropped.photo.name
+        # replacing a photo never deletes the old file, so the count drifts
+        dropped.photo.save("new.png", ContentFile(b"new"))
+        self.assertEqual(Blob.objects.get(name=orphan_name).refcount, 1)
+
+        stats = collect_garbage(grace_seconds=0)
+
+        self.assertEqual(stats["deleted_blobs"], 1)
+        self.assertFalse(Blob.objects.filter(name=orphan_name).exists())
+        self.assertFalse(blob_storage.exists(orphan_name))
+        self.assertTrue(blob_storage.exists(kept.photo.name))
+        self.assertTrue(blob_storage.exists(dropped.photo.name))
+
+    def test_gc_respects_grace_period(self):
+        profile = self._profile("a")
+        profile.photo.save("x.png", ContentFile(b"x"))
+        name = profile.photo.name
+        UserProfile.objects.filter(pk=profile.pk).update(photo="")
+
+        self.assertEqual(collect_garbage(grace_seconds=3600)["deleted_blobs"], 0)
+        self.assertTrue(blob_storage.exists(name))
+
+    def test_upload_racing_a_purge_keeps_its_file(self):
+        profile = self._profile("a")
+        profile.photo.save("x.png", ContentFile(b"same"))
+        name = profile.photo.name
+        UserProfile.objects.filter(pk=profile.pk).update(photo="")
+
+        # an identical upload lands between gc's row delete and the purge
+        def upload_meanwhile():
+            self._profile("b").photo.save("y.png", ContentFile(b"same"))
+            return Blob.objects.filter(name=name).exists()
+
+        Blob.objects.filter(name=name).delete()
+        blob_storage.purge(name, keep_if=upload_meanwhile)
+        self.assertTrue(blob_storage.exists(name))
+        self.assertEqual(Blob.objects.get(name=name).refcount, 1)
+
+    def test_upload_after_a_purge_writes_the_file_again(self):
+        profile = self._profile("a")
+        profile.photo.save("x.png", ContentFile(b"same"))
+        name = profile.photo.name
+        # gc moved the file away just before this upload referenced the row
+        os.replace(blob_storage.path(name), blob_storage.path(name) + ".purging")
+
+        self._profile("b").photo.save("y.png", ContentFile(b"same"))
+        with blob_storage.open(name) as handle:
+            self.assertEqual(handle.read(), b"same")
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.bulk import bulk_register
+from accounts.hashing import hash_passwords
+from accounts.models import UserProfile
+
+
+User = get_user_model()
+
+BULK_URL = "/api/auth/register/bulk/"
+
+
+def member(n, **overrides):
+    row = {
+        "full_name": f"Nelayan {n}",
+        "username": f"nelayan{n}",
+        "email": f"nelayan{n}@koperasi.example",
+        "password": "laut-biru-123",
+        "role": "supplier",
+        "identity_type": "ID_CARD",
+        "domicile": "Banyuwangi",
+    }
+    row.update(overrides)
+    return row
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BulkRegisterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.staff = User.objects.create_user(username="admin", password="x", is_staff=True)
+        User.objects.create_user(username="taken", email="taken@example.com", password="x")
+
+    def test_bulk_register_reports_per_row_results(self):
+        rows = [
+            member(1),
+            member(2, username="taken"),
+            member(3, email="taken@example.com"),
+            member(4, role="pirate"),
+            member(5),
+            member(6, username="nelayan5"),
+        ]
+        # 2 uniqueness checks + 1 insert per table, inside a savepoint
+        with self.assertNumQueries(6):
+            results = bulk_register(rows)
+
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["created", "error", "error", "error", "created", "error"],
+        )
+        self.assertIn("Username already taken.", results[1]["errors"]["non_field_errors"])
+        self.assertIn("Email already registered.", results[2]["errors"]["non_field_errors"])
+        self.assertIn("role", results[3]["errors"])
+
+        user = User.objects.get(username="nelayan1")
+        self.assertEqual(results[0]["id"], user.pk)
+        self.assertTrue(user.check_password("laut-biru-123"))
+        self.assertEqual(user.profile.role, "supplier")
+        self.assertEqual(user.profile.domicile, "Banyuwangi")
+
+    def test_endpoint_is_staff_only(self):
+        anonymous = self.client.post(BULK_URL, {"users": [member(1)]}, format="json")
+        self.assertEqual(anonymous.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.post(BULK_URL, {"users": [member(1), member(2)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual(UserProfile.objects.filter(role="supplier").count(), 2)
+
+        empty = self.client.post(BULK_URL, {"users": []}, format="json")
+        self.assertEqual(empty.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_management_command_reads_json_file(self):
+        path = self._tmp_file([member(1), member(2)])
+        call_command("bulk_register", path)
+        self.assertEqual(User.objects.filter(username__startswith="nelayan").count(), 2)
+
+    def _tmp_file(self, rows):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        self.addCleanup(os.unlink, handle.name)
+        with handle:
+            json.dump(rows, handle)
+        return handle.name
+
+
+class HashPoolTests(TestCase):
+    @override_settings(BULK_REGISTER_POOL_MIN_ROWS=2)
+    def test_process_pool_hashes_match_inline_hashing(self):
+        from django.contrib.auth.hashers import check_password
+
+        hashes = hash_passwords(["a-secret", "b-secret", "c-secret"], workers=2)
+        self.assertEqual(len(hashes), 3)
+        self.assertTrue(check_password("b-secret", hashes[1]))
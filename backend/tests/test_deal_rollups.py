@@ -0,0 +1,94 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from buyers.models import BuyerRequirement
+from exporter.models import Deal, DealRollup
+from exporter.rollups import rebuild_rollups
+from exporter.transitions import bulk_transition
+from suppliers.models import ProductBatch
+
+
+User = get_user_model()
+
+
+def snapshot(exporter):
+    return sorted(
+        (r.status, r.month, r.product_name, r.deal_count, r.total_quantity, r.total_price)
+        for r in DealRollup.objects.filter(exporter=exporter, deal_count__gt=0)
+    )
+
+
+class DealRollupTests(TestCase):
+    def setUp(self):
+        self.exporter = User.objects.create_user(username="exporter")
+        buyer = User.objects.create_user(username="buyer")
+        self.requirement = BuyerRequirement.objects.create(
+            buyer=buyer,
+            product_type="shrimp",
+            shipping_window_start=date(2025, 1, 1),
+            shipping_window_end=date(2025, 1, 31),
+        )
+        self.shrimp = ProductBatch.objects.create(batch_code="S-1", product_name="Shrimp", quantity=10)
+        self.tuna = ProductBatch.objects.create(batch_code="T-1", product_name="Tuna", quantity=10)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.exporter)
+
+    def _deal(self, batch, quantity, price, status="pending"):
+        return Deal.objects.create(
+            exporter=self.exporter,
+            buyer_requirement=self.requirement,
+            product_batch=batch,
+            status=status,
+            quantity=Decimal(quantity),
+            total_price=Decimal(price),
+        )
+
+    def test_incremental_updates_match_a_full_rebuild(self):
+        first = self._deal(self.shrimp, "10", "100")
+        second = self._deal(self.shrimp, "5", "60")
+        third = self._deal(self.tuna, "2", "40")
+        # a raw backdate bypasses the rollups; that is what the rebuild is for
+        Deal.objects.filter(pk=third.pk).update(created_at=datetime(2024, 12, 5, tzinfo=dt_timezone.utc))
+        rebuild_rollups()
+
+        self.client.post(f"/api/exporter/deals/{first.pk}/update_status/", {"status": "buyer_approved"})
+        bulk_transition(self.exporter, [second.pk, third.pk], "cancelled")
+        # stale instance: this save also reverts the status the API just set
+        first.total_price = Decimal("120")
+        first.save()
+        self._deal(self.tuna, "1", "15").delete()
+
+        incremental = snapshot(self.exporter)
+        call_command("rebuild_deal_rollups", stdout=StringIO())
+        self.assertEqual(incremental, snapshot(self.exporter))
+        self.assertIn(
+            ("cancelled", date(2024, 12, 1), "Tuna", 1, Decimal("2.00"), Decimal("40.00")),
+            incremental,
+        )
+
+    def test_dashboard_reads_only_the_rollup_table(self):
+        self._deal(self.shrimp, "10", "100")
+        self._deal(self.shrimp, "5", "50", status="completed")
+        self._deal(self.tuna, "3", "90")
+        self._deal(self.tuna, "50", "900", status="cancelled")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/exporter/dashboard/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["status"], row["deal_count"], row["total_price"]) for row in response.data["by_status"]],
+            [("pending", 2, "190.00"), ("completed", 1, "50.00"), ("cancelled", 1, "900.00")],
+        )
+        self.assertEqual(
+            [(row["product"], row["quantity"]) for row in response.data["by_product"]],
+            [("Shrimp", "15.00"), ("Tuna", "3.00")],
+        )
+        self.assertEqual(len(response.data["monthly"]), 1)
+        self.assertEqual(response.data["monthly"][0]["deal_count"], 3)
@@ -0,0 +1,138 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from buyers.models import BuyerRequirement
+from exporter.models import Deal
+from exporter.transitions import bulk_transition
+from suppliers.models import ProductBatch
+from webhooks.models import OutboxEvent, WebhookEndpoint
+
+
+User = get_user_model()
+
+
+class BulkDealTransitionTests(TestCase):
+    def setUp(self):
+        self.exporter = User.objects.create_user(username="exporter")
+        self.other = User.objects.create_user(username="other")
+        self.buyer = User.objects.create_user(username="buyer")
+        self.requirement = BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="shrimp",
+            shipping_window_start=date(2025, 1, 1),
+            shipping_window_end=date(2025, 1, 31),
+        )
+        self.batch = ProductBatch.objects.create(batch_code="B-1", product_name="Shrimp", quantity=10)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.exporter)
+
+    def _deal(self, status="pending", exporter=None):
+        return Deal.objects.create(
+            exporter=exporter or self.exporter,
+            buyer_requirement=self.requirement,
+            product_batch=self.batch,
+            status=status,
+            quantity=Decimal("1"),
+            total_price=Decimal("10"),
+        )
+
+    def test_outcomes_follow_the_transition_graph(self):
+        pending = self._deal()
+        approved = self._deal("buyer_approved")
+        done = self._deal("completed")
+        foreign = self._deal(exporter=self.other)
+
+        response = self.client.post(
+            "/api/exporter/deals/bulk_update_status/",
+            {"deal_ids": [pending.pk, approved.pk, done.pk, foreign.pk, 999], "status": "buyer_approved"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(
+            [(r["id"], r["result"]) for r in response.data["results"]],
+            [
+                (pending.pk, "updated"),
+                (approved.pk, "unchanged"),
+                (done.pk, "invalid_transition"),
+                (foreign.pk, "not_found"),
+                (999, "not_found"),
+            ],
+        )
+        pending.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual((pending.status, foreign.status), ("buyer_approved", "pending"))
+
+    def test_expected_status_rejects_deals_that_moved_on(self):
+        pending = self._deal()
+        approved = self._deal("buyer_approved")
+        results = bulk_transition(
+            self.exporter, [pending.pk, approved.pk], "cancelled", expected_status="pending"
+        )
+        self.assertEqual([r["result"] for r in results], ["updated", "conflict"])
+        self.assertEqual(results[1]["status"], "buyer_approved")
+
+    def test_concurrent_change_is_reported_not_overwritten(self):
+        first = self._deal()
+        second = self._deal()
+        real_now = timezone.now
+
+        def operator_cancels_second():
+            # runs between the status read and the conditional UPDATE
+            Deal.objects.filter(pk=second.pk).update(status="cancelled")
+            return real_now()
+
+        with mock.patch("exporter.transitions.timezone.now", side_effect=operator_cancels_second):
+            results = bulk_transition(self.exporter, [first.pk, second.pk], "buyer_approved")
+
+        self.assertEqual(
+            [(r["result"], r["status"]) for r in results],
+            [("updated", "buyer_approved"), ("conflict", "cancelled")],
+        )
+        second.refresh_from_db()
+        self.assertEqual(second.status, "cancelled")
+
+    def test_many_deals_cost_a_constant_number_of_queries(self):
+        WebhookEndpoint.objects.create(user=self.buyer, url="http://127.0.0.1:9/hook")
+        ids = [self._deal().pk for _ in range(30)] + [self._deal("buyer_approved").pk for _ in range(30)]
+
+        # select, one UPDATE per source status, one per touched rollup bucket
+        # (+ savepoint/insert/release for the new "cancelled" bucket),
+        # endpoints, bulk insert, and the outer savepoint pair; none of it
+        # grows with the number of deals
+        with self.assertNumQueries(13):
+            results = bulk_transition(self.exporter, ids, "cancelled")
+
+        self.assertTrue(all(r["result"] == "updated" for r in results))
+        self.assertEqual(OutboxEvent.objects.count(), 60)
+
+    def test_request_is_validated(self):
+        response = self.client.post(
+            "/api/exporter/deals/bulk_update_status/", {"deal_ids": [], "status": "bogus"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"deal_ids", "status"})
+
+    def test_single_update_follows_the_transition_graph(self):
+        done = self._deal("completed")
+        response = self.client.post(
+            f"/api/exporter/deals/{done.pk}/update_status/", {"status": "pending"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        done.refresh_from_db()
+        self.assertEqual(done.status, "completed")
+
+        pending = self._deal()
+        response = self.client.post(
+            f"/api/exporter/deals/{pending.pk}/update_status/", {"status": "buyer_approved"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "buyer_approved")
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import AuthToken, UserProfile
+from buyers.models import BuyerProfile, BuyerRequirement, QualityCheckLog
+from idempotency.middleware import request_owner
+from idempotency.models import IdempotencyKey
+
+
+User = get_user_model()
+
+REQUIREMENTS_URL = "/api/buyer/requirements/"
+PAYLOAD = {
+    "commodity": "tuna",
+    "min_volume": 100,
+    "shipping_window_start": "2025-06-01",
+    "shipping_window_end": "2025-06-30",
+}
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        self.client = self._client("buyer")
+
+    def _client(self, username):
+        user = User.objects.create_user(username=username)
+        BuyerProfile.objects.create(user=user, organization="Org", country="JP")
+        _, key = AuthToken.issue(user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+        return client
+
+    def _post(self, key, client=None, payload=PAYLOAD):
+        return (client or self.client).post(
+            REQUIREMENTS_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_stored_response_without_running_the_view(self):
+        first = self._post("req-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(1):
+            retry = self._post("req-1")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Content-Type"], first["Content-Type"])
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(BuyerRequirement.objects.count(), 1)
+        self.assertEqual(QualityCheckLog.objects.count(), 1)
+
+        self.assertEqual(self._post("req-2").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(BuyerRequirement.objects.count(), 2)
+
+    def test_key_reused_for_a_different_request_is_rejected(self):
+        self._post("req-1")
+        response = self._post("req-1", payload={**PAYLOAD, "min_volume": 200})
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(BuyerRequirement.objects.count(), 1)
+
+    def test_keys_are_scoped_per_client(self):
+        self._post("shared")
+        self.assertEqual(self._post("shared", client=self._client("other")).status_code, 201)
+        self.assertEqual(BuyerRequirement.objects.count(), 2)
+        self.assertEqual(IdempotencyKey.objects.values("owner").distinct().count(), 2)
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0)
+    def test_duplicate_of_a_running_request_gets_409(self):
+        self._post("req-1")
+        IdempotencyKey.objects.update(locked_at=timezone.now(), response_status=None)
+        response = self._post("req-1")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response["Retry-After"], "1")
+
+        # an abandoned claim is taken over by the next retry
+        IdempotencyKey.objects.update(locked_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self._post("req-1").status_code, status.HTTP_201_CREATED)
+        self.assertEqual(BuyerRequirement.objects.count(), 2)
+
+    def test_expired_keys_run_again_and_are_purged(self):
+        self._post("req-1")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertNotIn("Idempotent-Replayed", self._post("req-1"))
+        self.assertEqual(BuyerRequirement.objects.count(), 2)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command("purge_idempotency_keys", stdout=out)
+        self.assertIn("deleted 1", out.getvalue())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_requests_without_a_key_are_untouched(self):
+        self.client.post(REQUIREMENTS_URL, PAYLOAD, format="json")
+        self.client.post(REQUIREMENTS_URL, PAYLOAD, format="json")
+        self.assertEqual(BuyerRequirement.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_handlers_that_do_not_opt_in_are_untouched(self):
+        user = User.objects.create_user(username="loginuser", password="pass12345")
+        UserProfile.objects.create(user=user, role="buyer", identity_type="ID_CARD")
+        credentials = {"identifier": "loginuser", "password": "pass12345"}
+        first = self.client.post("/api/auth/login/", credentials, format="json", HTTP_IDEMPOTENCY_KEY="login-1")
+        second = self.client.post("/api/auth/login/", credentials, format="json", HTTP_IDEMPOTENCY_KEY="login-1")
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        self.assertNotIn("Idempotent-Replayed", second)
+        self.assertNotEqual(first.json()["token"], second.json()["token"])
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_owner_is_session_user_then_credentials_then_address(self):
+        user = User.objects.get(username="buyer")
+        request = RequestFactory().post("/", HTTP_AUTHORIZATION="Bearer abc", REMOTE_ADDR="10.0.0.1")
+        request.user = AnonymousUser()
+        self.assertTrue(request_owner(request).startswith("auth:"))
+        request.user = user
+        self.assertEqual(request_owner(request), f"user:{user.pk}")
+        request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(request_owner(request), "ip:10.0.0.1")
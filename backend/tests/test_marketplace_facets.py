@@ -0,0 +1,87 @@
+from decimal import Decimal
+from itertools import count
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from buyers.models import BatchMarketInfo
+from suppliers.models import ProductBatch
+
+
+class MarketplaceFacetTests(TestCase):
+    codes = count(1)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self._listing("Tuna", "Maluku", "ID", "JP", "0.2")
+        self._listing("Tuna", "Bali", "ID", "US", "0.6")
+        self._listing("Shrimp", "Java", "ID", "JP", None)
+        self._listing("Shrimp", "Java", "VN", "JP", "0.05")
+        self._listing("Shrimp", "Java", "ID", "JP", "0.05", listed=False)
+
+    def _listing(self, species, region, origin, destination, mercury, listed=True):
+        batch = ProductBatch.objects.create(
+            batch_code=f"F-{next(self.codes)}",
+            product_name=species,
+            quantity=100,
+            qc_status="brin_verified_pass" if listed else "submitted",
+            is_allowed_for_catalog=listed,
+        )
+        return BatchMarketInfo.objects.create(
+            batch=batch,
+            species=species,
+            region=region,
+            country_of_origin=origin,
+            destination_country=destination,
+            contaminant_mercury_ppm=Decimal(mercury) if mercury else None,
+        )
+
+    def _facets(self, **params):
+        response = self.client.get("/api/buyer/marketplace/facets/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_each_facet_ignores_only_its_own_filter(self):
+        facets = self._facets(species="tuna", destination_country="JP")
+
+        # species counts ignore species=tuna but keep destination=JP
+        self.assertEqual(
+            facets["species"], [{"value": "Shrimp", "count": 2}, {"value": "Tuna", "count": 1}]
+        )
+        # destination counts ignore destination=JP but keep species=tuna
+        self.assertEqual(
+            facets["destination_country"],
+            [{"value": "JP", "count": 1}, {"value": "US", "count": 1}],
+        )
+        self.assertEqual(facets["region"], [{"value": "Maluku", "count": 1}])
+
+    def test_contaminant_buckets_count_listings_at_or_below_each_bound(self):
+        mercury = self._facets()["contaminants"]["mercury"]
+        self.assertEqual(mercury["param"], "max_mercury")
+        self.assertEqual((mercury["total"], mercury["unknown"]), (4, 1))
+        self.assertEqual(
+            [(bucket["max"], bucket["count"]) for bucket in mercury["buckets"]],
+            [("0.1", 1), ("0.3", 2), ("0.5", 2), ("1.0", 3)],
+        )
+        # the mercury facet ignores max_mercury, the others respect it
+        facets = self._facets(max_mercury="0.1")
+        self.assertEqual(facets["contaminants"]["mercury"]["total"], 4)
+        self.assertEqual(facets["contaminants"]["cesium"]["total"], 1)
+
+    def test_facets_are_cached_per_catalog_version(self):
+        with self.assertNumQueries(5):
+            first = self._facets()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._facets(), first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._listing("Tuna", "Bali", "ID", "US", "0.1")
+        refreshed = self._facets()
+        self.assertGreater(refreshed["catalog_version"], first["catalog_version"])
+        self.assertEqual(refreshed["species"][0], {"value": "Tuna", "count": 3})
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get("/api/buyer/marketplace/facets/", {"max_mercury": "lots"})
+        self.assertEqual(response.status_code, 400)
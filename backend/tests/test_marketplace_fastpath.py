@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from buyers.models import BatchMarketInfo
+from buyers.serializers import FastMarketplaceSerializer, MarketplaceBatchSerializer
+from buyers.services import get_marketplace_queryset
+from suppliers.models import ProductBatch, QcRecord
+
+
+User = get_user_model()
+
+
+@override_settings(TIME_ZONE="Asia/Jakarta")
+class FastMarketplaceSerializerTests(TestCase):
+    def setUp(self):
+        named = User.objects.create_user(username="sari", first_name="Sari", last_name="Dewi")
+        plain = User.objects.create_user(username="budi")
+        suppliers = [named, plain, None]
+        for index in range(9):
+            batch = ProductBatch.objects.create(
+                supplier=suppliers[index % 3],
+                batch_code=f"F-{index}",
+                product_name="Tuna",
+                quantity=100 + index,
+                unit="kg" if index % 2 else "ton",
+                qc_status="brin_verified_pass",
+                is_allowed_for_catalog=True,
+            )
+            BatchMarketInfo.objects.create(
+                batch=batch,
+                species="Tuna",
+                region="Maluku" if index % 2 else "",
+                harvest_date=date(2025, 5, 1) + timedelta(days=index) if index % 4 else None,
+                ready_date=date(2025, 6, 1) + timedelta(days=index),
+                size_min_mm=Decimal("12.5") if index % 2 else None,
+                size_max_mm=Decimal("40") if index % 2 else None,
+                price_per_unit=Decimal("10.005") + index if index != 3 else None,
+                contaminant_mercury_ppm=Decimal("0.1234") if index % 3 else None,
+                contaminant_ecoli_cfu=Decimal("15"),
+            )
+            for offset in range(index % 3):
+                record = QcRecord.objects.create(
+                    batch=batch, passed=bool(offset), contamination_score=12.5 + offset
+                )
+                QcRecord.objects.filter(pk=record.pk).update(
+                    created_at=timezone.now() - timedelta(hours=5 - offset)
+                )
+
+    def test_rendered_json_is_byte_identical(self):
+        queryset = get_marketplace_queryset({})
+        expected = JSONRenderer().render(MarketplaceBatchSerializer(queryset, many=True).data)
+        rows = list(FastMarketplaceSerializer.rows(queryset))
+        actual = JSONRenderer().render(FastMarketplaceSerializer.serialize(rows))
+        self.assertEqual(actual, expected)
+
+    def test_marketplace_page_uses_three_queries(self):
+        client = APIClient()
+        with self.assertNumQueries(3):  # count, page, latest QC records
+            response = client.get("/api/buyer/marketplace/", {"page_size": 5, "ordering": "price"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 9)
+        queryset = get_marketplace_queryset({"ordering": "price"})[:5]
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(MarketplaceBatchSerializer(queryset, many=True).data),
+        )
@@ -0,0 +1,92 @@
+from datetime import date
+from decimal import Decimal
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from buyers.models import BatchMarketInfo, BuyerProfile, BuyerRequirement
+from suppliers.models import ProductBatch
+
+
+User = get_user_model()
+
+
+class MatchRankingTests(TestCase):
+    codes = count(1)
+
+    def setUp(self):
+        self.buyer = User.objects.create_user(username="buyer")
+        BuyerProfile.objects.create(user=self.buyer, organization="Org", country="JP")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.buyer)
+        self.requirement = BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="tuna",
+            min_volume=100,
+            max_volume=1000,
+            allowed_contaminants={"mercury": 0.5},
+            shipping_window_start=date(2025, 6, 1),
+            shipping_window_end=date(2025, 6, 10),
+        )
+        self.best = self._listing(1000, date(2025, 6, 1), "0.0", "10")
+        self.worst = self._listing(500, date(2025, 6, 6), "0.25", "20")
+        self.middle = self._listing(800, date(2025, 6, 2), "0.1", "15")
+        self._listing(1000, date(2025, 6, 1), "0.6", "10")  # over the mercury limit
+
+    def _listing(self, quantity, ready, mercury, price):
+        batch = ProductBatch.objects.create(
+            batch_code=f"R-{next(self.codes)}",
+            product_name="Tuna",
+            quantity=quantity,
+            qc_status="brin_verified_pass",
+            is_allowed_for_catalog=True,
+        )
+        return BatchMarketInfo.objects.create(
+            batch=batch,
+            species="Tuna",
+            ready_date=ready,
+            contaminant_mercury_ppm=Decimal(mercury),
+            price_per_unit=Decimal(price),
+        )
+
+    def _url(self):
+        return f"/api/buyer/requirements/{self.requirement.pk}/matches/"
+
+    def test_matches_are_ordered_by_score_with_explain(self):
+        response = self.client.get(self._url(), {"explain": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["batch_id"], row["match_score"]) for row in response.data],
+            [(self.best.batch_id, 100.0), (self.middle.batch_id, 76.0), (self.worst.batch_id, 40.0)],
+        )
+        components = response.data[1]["score_components"]
+        self.assertEqual(
+            {name: part["value"] for name, part in components.items()},
+            {"contaminants": 0.8, "volume": 0.8, "ready_date": 0.9, "price": 0.5},
+        )
+        self.assertEqual(components["contaminants"]["points"], 28.0)
+        self.assertNotIn("score_components", self.client.get(self._url()).data[0])
+
+    def test_cursor_pages_walk_the_ranking_without_gaps(self):
+        seen = []
+        url, params = self._url(), {"limit": 1}
+        for _ in range(5):
+            response = self.client.get(url, params)
+            seen += [row["batch_id"] for row in response.data]
+            if "Link" not in response:
+                break
+            params = {"limit": 1, "cursor": response["X-Next-Cursor"]}
+            self.assertIn(f"cursor={response['X-Next-Cursor']}", response["Link"])
+        self.assertEqual(seen, [self.best.batch_id, self.middle.batch_id, self.worst.batch_id])
+
+    def test_page_cost_does_not_grow_with_depth(self):
+        first = self.client.get(self._url(), {"limit": 1})
+        # price bounds, page, latest-QC prefetch (+ requirement and profile lookups)
+        with self.assertNumQueries(5):
+            self.client.get(self._url(), {"limit": 1, "cursor": first["X-Next-Cursor"]})
+
+    def test_bad_paging_parameters_are_rejected(self):
+        self.assertEqual(self.client.get(self._url(), {"cursor": "%%%"}).status_code, 400)
+        self.assertEqual(self.client.get(self._url(), {"limit": 0}).status_code, 400)
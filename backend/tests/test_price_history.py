@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from itertools import count
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from buyers.models import BatchMarketInfo, DailyPriceRollup, PriceObservation
+from suppliers.models import ProductBatch
+
+
+DAY_ONE = datetime(2025, 3, 3, 9, tzinfo=dt_timezone.utc)
+
+
+class PriceHistoryTests(TestCase):
+    codes = count(1)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _listing(self, species, region, price, quantity):
+        batch = ProductBatch.objects.create(
+            batch_code=f"P-{next(self.codes)}", product_name=species, quantity=quantity
+        )
+        return BatchMarketInfo.objects.create(
+            batch=batch,
+            species=species,
+            region=region,
+            country_of_origin="ID",
+            price_per_unit=Decimal(price) if price is not None else None,
+        )
+
+    def _at(self, moment):
+        return mock.patch("django.utils.timezone.now", return_value=moment)
+
+    def test_price_changes_are_appended_and_rolled_up(self):
+        with self._at(DAY_ONE):
+            tuna = self._listing("Tuna", "Maluku", "10.00", 100)
+            self._listing("Tuna", "Bali", "14.00", 300)
+            self._listing("Tuna", "Bali", None, 50)
+            tuna.notes = "no price change"
+            tuna.save()
+        with self._at(DAY_ONE + timedelta(days=1)):
+            tuna.price_per_unit = Decimal("12.00")
+            tuna.save()
+
+        history = list(PriceObservation.objects.values_list("price_per_unit", "previous_price"))
+        self.assertEqual(
+            history,
+            [(Decimal("10.00"), None), (Decimal("14.00"), None), (Decimal("12.00"), Decimal("10.00"))],
+        )
+        with self.assertRaises(ValueError):
+            PriceObservation.objects.first().save()
+
+        response = self.client.get(
+            "/api/buyer/marketplace/prices/", {"species": "TUNA", "start": "2025-03-01", "end": "2025-03-31"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["points"],
+            [
+                # (10*100 + 14*300) / 400 = 13.00
+                {"period": "2025-03-03", "count": 2, "min": "10.00", "max": "14.00", "avg": "12.00", "vwap": "13.00"},
+                {"period": "2025-03-04", "count": 1, "min": "12.00", "max": "12.00", "avg": "12.00", "vwap": "12.00"},
+            ],
+        )
+
+        bali = self.client.get(
+            "/api/buyer/marketplace/prices/",
+            {"species": "tuna", "region": "bali", "start": "2025-03-01", "end": "2025-03-31", "interval": "month"},
+        )
+        self.assertEqual(
+            [(p["period"], p["count"], p["avg"]) for p in bali.data["points"]], [("2025-03-01", 1, "14.00")]
+        )
+
+    def test_series_is_answered_from_rollups_and_rebuild_matches(self):
+        with self._at(DAY_ONE):
+            for price in ("9.50", "10.50", "11.00"):
+                self._listing("Shrimp", "Java", price, 10)
+
+        with self.assertNumQueries(1):
+            series = self.client.get(
+                "/api/buyer/marketplace/prices/", {"species": "shrimp", "start": "2025-03-01", "end": "2025-03-05"}
+            ).data
+
+        before = list(DailyPriceRollup.objects.values())
+        call_command("rebuild_price_rollups", stdout=open("/dev/null", "w"))
+        self.assertEqual(
+            [{k: v for k, v in row.items() if k != "id"} for row in before],
+            [{k: v for k, v in row.items() if k != "id"} for row in DailyPriceRollup.objects.values()],
+        )
+        self.assertEqual(series["points"][0]["count"], 3)
+
+    def test_bad_parameters_are_rejected(self):
+        response = self.client.get("/api/buyer/marketplace/prices/", {"start": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/api/buyer/marketplace/prices/", {"interval": "hour"})
+        self.assertEqual(response.status_code, 400)
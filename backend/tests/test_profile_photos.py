@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from accounts.photos import generate_variants, limit_upload_size, variant_name
+
+
+User = get_user_model()
+
+PHOTO_URL = "/api/auth/profile/photo/"
+
+
+def png_upload(name="avatar.png", size=(600, 400)):
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 80, 40)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class ProfilePhotoTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=self.media_root,
+            PROFILE_PHOTO_VARIANTS_SYNC=True,
+            PROFILE_PHOTO_VARIANT_SIZES=[40, 96],
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="photo", password="x")
+        UserProfile.objects.create(user=self.user, role="supplier", identity_type="ID_CARD")
+        self.client.force_authenticate(self.user)
+
+    def test_upload_returns_variant_urls_and_renders_thumbnails(self):
+        response = self.client.post(PHOTO_URL, {"file": png_upload()}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        body = response.json()
+        self.assertEqual(set(body["photoVariants"]), {"40", "96"})
+        self.assertTrue(body["photoVariants"]["40"]["webp"].endswith("_40.webp"))
+
+        name = UserProfile.objects.get(user=self.user).photo.name
+        for size in (40, 96):
+            for fmt in ("webp", "jpeg"):
+                with default_storage.open(variant_name(name, size, fmt)) as handle:
+                    self.assertEqual(Image.open(handle).size, (size, size))
+
+        profile = self.client.get("/api/auth/profile/").json()["user"]
+        self.assertEqual(profile["photoVariants"], body["photoVariants"])
+
+    @override_settings(PROFILE_PHOTO_MAX_BYTES=1024)
+    def test_oversized_upload_is_rejected(self):
+        response = self.client.post(
+            PHOTO_URL, {"file": png_upload(size=(800, 800))}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(UserProfile.objects.get(user=self.user).photo)
+
+    @override_settings(PROFILE_PHOTO_MAX_BYTES=1024)
+    def test_upload_handler_stops_parsing_past_the_cap(self):
+        # passes the Content-Length pre-check (which allows for multipart framing)
+        upload = SimpleUploadedFile("big.bin", b"x" * 8192)
+        request = RequestFactory().post(PHOTO_URL, {"file": upload})
+        self.assertLess(int(request.META["CONTENT_LENGTH"]), 1024 + 64 * 1024)
+        handler = limit_upload_size(request)
+        self.assertNotIn("file", request.FILES)
+        self.assertTrue(handler.exceeded)
+
+        response = self.client.post(PHOTO_URL, {"file": SimpleUploadedFile("big.png", b"x" * 8192)})
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_unreadable_image_is_stored_without_variants(self):
+        name = default_storage.save("profile_photos/broken.png", SimpleUploadedFile("x", b"not-an-image"))
+        self.assertEqual(generate_variants(default_storage, name), [])
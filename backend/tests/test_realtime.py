@@ -0,0 +1,152 @@
+import asyncio
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models import AuthToken
+from buyers.models import BatchMarketInfo, BuyerRequirement
+from realtime.broker import EventBroker, broker
+from suppliers.models import ProductBatch
+
+
+User = get_user_model()
+
+
+class EventBrokerTests(SimpleTestCase):
+    def test_publish_from_another_thread_reaches_only_that_users_streams(self):
+        events = EventBroker()
+
+        async def scenario():
+            mine = events.subscribe(1)
+            theirs = events.subscribe(2)
+            worker = threading.Thread(
+                target=events.publish, args=([1], "qc_status", {"batch_id": 7})
+            )
+            worker.start()
+            worker.join()
+            event = await asyncio.wait_for(mine.queue.get(), timeout=1)
+            self.assertTrue(theirs.queue.empty())
+            events.unsubscribe(mine)
+            events.unsubscribe(theirs)
+            return event
+
+        event = asyncio.run(scenario())
+        self.assertEqual(event.type, "qc_status")
+        self.assertEqual(
+            event.encode(), f'id: {event.id}\nevent: qc_status\ndata: {{"batch_id":7}}\n\n'
+        )
+        self.assertEqual(events.subscriber_count(), 0)
+
+    def test_slow_subscriber_drops_oldest_events(self):
+        events = EventBroker(queue_size=2)
+
+        async def scenario():
+            subscription = events.subscribe(1)
+            for n in range(3):
+                events.publish([1], "tick", {"n": n})
+            await asyncio.sleep(0)
+            received = [subscription.queue.get_nowait().data["n"] for _ in range(2)]
+            return received, subscription.dropped
+
+        self.assertEqual(asyncio.run(scenario()), ([1, 2], 1))
+
+
+class EventPublishingTests(TestCase):
+    def setUp(self):
+        self.supplier = User.objects.create_user(username="supplier", password="x")
+        self.buyer = User.objects.create_user(username="buyer", password="x")
+        self.batch = ProductBatch.objects.create(
+            supplier=self.supplier, batch_code="B-1", product_name="Tuna", quantity=500
+        )
+        BatchMarketInfo.objects.create(
+            batch=self.batch,
+            species="Tuna",
+            ready_date=date(2025, 3, 10),
+            contaminant_mercury_ppm=Decimal("0.2"),
+        )
+        self.requirement = BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="tuna",
+            min_volume=100,
+            max_volume=1000,
+            allowed_contaminants={"mercury": 0.5},
+            shipping_window_start=date(2025, 3, 1),
+            shipping_window_end=date(2025, 3, 31),
+        )
+        BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="tuna",
+            allowed_contaminants={"mercury": 0.1},
+            shipping_window_start=date(2025, 3, 1),
+            shipping_window_end=date(2025, 3, 31),
+        )
+
+    def test_qc_transition_and_new_match_are_published_after_commit(self):
+        with mock.patch.object(broker, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.batch.qc_status = "brin_verified_pass"
+                self.batch.is_allowed_for_catalog = True
+                self.batch.save()
+            publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        calls = [(c.args[0], c.args[1], c.args[2]) for c in publish.call_args_list]
+        self.assertEqual(len(calls), 2)
+        user_ids, event_type, data = calls[0]
+        self.assertEqual((user_ids, event_type), ([self.supplier.pk], "qc_status"))
+        self.assertEqual((data["from"], data["to"]), ("not_submitted", "brin_verified_pass"))
+        user_ids, event_type, data = calls[1]
+        self.assertEqual((user_ids, event_type), ([self.buyer.pk], "match"))
+        self.assertEqual(data["requirement_id"], self.requirement.pk)
+
+    def test_saving_without_a_status_change_publishes_nothing(self):
+        with mock.patch.object(broker, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.batch.description = "updated"
+                self.batch.save()
+        publish.assert_not_called()
+
+
+class EventStreamViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="supplier", password="x")
+        _token, self.raw_key = AuthToken.issue(self.user)
+
+    async def test_stream_requires_authentication(self):
+        response = await self.async_client.get("/api/events/stream/")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_delivers_published_events(self):
+        response = await self.async_client.get(
+            "/api/events/stream/", {"access_token": self.raw_key}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+        self.assertTrue((await anext(chunks)).startswith(b"retry:"))
+        self.assertEqual(await anext(chunks), b": connected\n\n")
+        self.assertEqual(broker.subscriber_count(self.user.pk), 1)
+
+        broker.publish([self.user.pk], "qc_status", {"batch_id": 1, "to": "submitted"})
+        frame = (await asyncio.wait_for(anext(chunks), timeout=1)).decode()
+        self.assertIn("event: qc_status\n", frame)
+        payload = json.loads(frame.split("data: ", 1)[1])
+        self.assertEqual(payload, {"batch_id": 1, "to": "submitted"})
+
+        # a client disconnect cancels the pending read, which must unsubscribe
+        pending = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(broker.subscriber_count(self.user.pk), 0)
+
+    def test_wsgi_requests_are_refused(self):
+        response = self.client.get("/api/events/stream/", {"access_token": self.raw_key})
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,97 @@
+import io
+import uuid
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from buyers.models import BuyerProfile
+from config.parsers import MessagePackParser, ORJSONParser
+from config.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+User = get_user_model()
+
+PAYLOAD = {
+    "price": Decimal("12.50"),
+    "harvested": date(2025, 6, 1),
+    "checked_at": datetime(2025, 6, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+    "local": datetime(2025, 6, 1, 8, 30),
+    "slot": time(8, 30),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "name": "Ikan tongkol – segar",
+    "separator": "a b",
+    "label": gettext_lazy("Unassigned"),
+    "counts": {1: 2},
+    "rows": [{"n": None, "ok": True, "score": 1.5}],
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_json_bytes(self):
+        self.assertEqual(ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_values_orjson_writes_differently_fall_back_to_stdlib(self):
+        for data in ({"a": 1e16}, {"a": 1e-7}, [0.00001], {"a": 2**70}, {"a": Decimal("1e-7")}):
+            with self.subTest(data=data):
+                self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        for value in (float("nan"), float("inf")):
+            with self.subTest(value=value), self.assertRaisesMessage(ValueError, "not JSON compliant"):
+                ORJSONRenderer().render({"a": [value]})
+
+    def test_indent_falls_back_to_stdlib(self):
+        rendered = ORJSONRenderer().render({"a": [1]}, "application/json; indent=4")
+        self.assertEqual(rendered, JSONRenderer().render({"a": [1]}, "application/json; indent=4"))
+
+    def test_parser_round_trip_and_errors(self):
+        body = ORJSONRenderer().render({"volume": 10, "name": "Udang"})
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), {"volume": 10, "name": "Udang"})
+        latin = io.BytesIO("{\"name\": \"caf\xe9\"}".encode("latin-1"))
+        self.assertEqual(ORJSONParser().parse(latin, parser_context={"encoding": "latin-1"}), {"name": "caf\xe9"})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b"{nope"))
+
+
+class MessagePackTests(TestCase):
+    def test_renderer_uses_json_representations(self):
+        decoded = msgpack.unpackb(MessagePackRenderer().render(PAYLOAD), raw=False, strict_map_key=False)
+        self.assertEqual(decoded["price"], 12.5)
+        self.assertEqual(decoded["checked_at"], "2025-06-01T08:30:15.123456Z")
+        self.assertEqual(decoded["counts"], {1: 2})
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+    def test_negotiated_by_accept_header_both_ways(self):
+        buyer = User.objects.create_user(username="buyer")
+        BuyerProfile.objects.create(user=buyer, organization="Org", country="JP")
+        client = APIClient()
+        client.force_authenticate(user=buyer)
+        body = msgpack.packb(
+            {
+                "commodity": "tuna",
+                "min_volume": 100,
+                "allowed_contaminants": {"mercury": 0.5},
+                "shipping_window_start": "2025-06-01",
+                "shipping_window_end": "2025-06-30",
+            }
+        )
+        response = client.post(
+            "/api/buyer/requirements/",
+            body,
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        created = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(created["commodity"], "tuna")
+        self.assertEqual(created["allowed_contaminants"], {"mercury": "0.500"})
+
+        listing = client.get("/api/buyer/requirements/")
+        self.assertEqual(listing["Content-Type"], "application/json")
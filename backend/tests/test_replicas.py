@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from buyers.models import BatchMarketInfo
+from config import replicas
+from config.replicas import PIN_COOKIE, healthy_replica, lag_probe, replica_reads
+
+
+User = get_user_model()
+
+REPLICA = {**connections.settings["default"], "TEST": {"MIRROR": "default"}}
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        lag_probe.reset()
+        self.addCleanup(lag_probe.reset)
+        patcher = mock.patch.dict(connections.settings, {"replica": REPLICA})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_use_replica_only_inside_replica_reads(self):
+        with mock.patch.object(replicas, "replica_lag", return_value=0.0):
+            self.assertEqual(router.db_for_read(BatchMarketInfo), "default")
+            with replica_reads():
+                self.assertEqual(router.db_for_read(BatchMarketInfo), "replica")
+                self.assertEqual(router.db_for_write(BatchMarketInfo), "default")
+                # read your own writes
+                self.assertEqual(router.db_for_read(BatchMarketInfo), "default")
+            with replica_reads(pinned=True):
+                self.assertEqual(router.db_for_read(BatchMarketInfo), "default")
+
+    @override_settings(REPLICA_MAX_LAG_SECONDS=10)
+    def test_lagging_or_unreachable_replica_falls_back_to_primary(self):
+        for lag, expected in [(3.0, "replica"), (30.0, None), (None, None)]:
+            lag_probe.reset()
+            with mock.patch.object(replicas, "replica_lag", return_value=lag):
+                self.assertEqual(healthy_replica(), expected)
+
+    def test_lag_is_probed_once_per_interval(self):
+        with mock.patch.object(replicas, "replica_lag", return_value=0.0) as probe:
+            with replica_reads():
+                for _ in range(5):
+                    router.db_for_read(BatchMarketInfo)
+        self.assertEqual(probe.call_count, 1)
+
+    def test_without_replica_alias_everything_stays_on_default(self):
+        del connections.settings["replica"]
+        with replica_reads():
+            self.assertEqual(router.db_for_read(BatchMarketInfo), "default")
+
+
+class ReplicaViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_marketplace_reads_are_routed_unless_pinned(self):
+        with mock.patch.object(replicas, "healthy_replica", return_value=None) as chosen:
+            self.assertEqual(self.client.get("/api/buyer/marketplace/").status_code, 200)
+            self.assertTrue(chosen.called)
+
+            chosen.reset_mock()
+            self.client.cookies[PIN_COOKIE] = "1"
+            self.client.get("/api/buyer/marketplace/")
+            self.assertFalse(chosen.called)
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        user = User.objects.create_user(username="seller", password="pw-123456")
+        UserProfile.objects.create(user=user, role="supplier")
+        response = self.client.post(
+            "/api/auth/login/", {"identifier": "seller", "password": "pw-123456"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 5)
+
+        failed = APIClient().post("/api/auth/login/", {"identifier": "seller", "password": "x"}, format="json")
+        self.assertNotIn(PIN_COOKIE, failed.cookies)
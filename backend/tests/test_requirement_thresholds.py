@@ -0,0 +1,83 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+
+from buyers.models import BatchMarketInfo, BuyerRequirement
+from buyers.services import find_requirements_for_batch
+from suppliers.models import ProductBatch
+
+
+def _requirement(**overrides):
+    fields = {
+        "product_type": "Tuna",
+        "min_volume": 100,
+        "shipping_window_start": date(2025, 6, 1),
+        "shipping_window_end": date(2025, 6, 30),
+        "allowed_contaminants": {},
+    }
+    fields.update(overrides)
+    return BuyerRequirement.objects.create(**fields)
+
+
+class RequirementThresholdTests(TestCase):
+    def test_thresholds_follow_the_json(self):
+        requirement = _requirement(allowed_contaminants={"mercury": 0.5, "total_ppm": 30.0})
+        self.assertEqual(requirement.max_mercury_ppm, Decimal("0.5"))
+        self.assertEqual(requirement.max_total_ppm, Decimal("30.0"))
+        self.assertIsNone(requirement.max_cesium_ppm)
+
+        requirement.allowed_contaminants = {"cesium": 0.02}
+        requirement.save(update_fields=["allowed_contaminants"])
+        requirement.refresh_from_db()
+        self.assertIsNone(requirement.max_mercury_ppm)
+        self.assertEqual(requirement.max_cesium_ppm, Decimal("0.020"))
+
+
+class ReverseMatchTests(TestCase):
+    def setUp(self):
+        batch = ProductBatch.objects.create(
+            batch_code="REV-1",
+            product_name="Tuna",
+            quantity=500,
+            qc_status="brin_verified_pass",
+            is_allowed_for_catalog=True,
+        )
+        self.info = BatchMarketInfo.objects.create(
+            batch=batch,
+            species="tuna",
+            ready_date=date(2025, 6, 10),
+            destination_country="JP",
+            contaminant_mercury_ppm=Decimal("0.3"),
+        )
+
+    def test_one_indexed_statement_applies_every_constraint(self):
+        accepted = {
+            _requirement(allowed_contaminants={"mercury": 0.3}).pk,
+            _requirement(product_type="TUNA", destination_country="jp").pk,
+            _requirement(max_volume=800, allowed_contaminants={"total_ppm": 1}).pk,
+        }
+        _requirement(allowed_contaminants={"mercury": 0.29})
+        # the listing has no cesium measurement, so a cesium limit can't be met
+        _requirement(allowed_contaminants={"cesium": 1})
+        _requirement(destination_country="US")
+        _requirement(min_volume=600)
+        _requirement(max_volume=400)
+        _requirement(shipping_window_start=date(2025, 6, 11))
+        _requirement(product_type="Shrimp")
+        _requirement(status=BuyerRequirement.STATUS_MATCHED)
+
+        with self.assertNumQueries(1):
+            found = find_requirements_for_batch(self.info)
+        self.assertEqual({requirement.pk for requirement in found}, accepted)
+
+    def test_query_uses_the_match_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("query plan text is SQLite-specific")
+        with self.assertNumQueries(1) as captured:
+            find_requirements_for_batch(self.info)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {captured.captured_queries[0]['sql']}")
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn("requirement_match_idx", plan)
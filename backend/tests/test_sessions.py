@@ -0,0 +1,92 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.sessions import SessionStore, clear_expired_sessions, local_cache
+
+
+class CachedSessionStoreTests(TestCase):
+    def setUp(self):
+        local_cache.clear()
+
+    def test_saved_session_is_read_back_without_queries(self):
+        store = SessionStore()
+        store["cart"] = [1, 2]
+        store.save()
+
+        reader = SessionStore(session_key=store.session_key)
+        with self.assertNumQueries(0):
+            self.assertEqual(reader["cart"], [1, 2])
+
+        # the cached copy is isolated from mutations of the reader
+        reader["cart"].append(3)
+        self.assertEqual(SessionStore(session_key=store.session_key)["cart"], [1, 2])
+
+    def test_cache_miss_falls_back_to_database(self):
+        store = SessionStore()
+        store["k"] = "v"
+        store.save()
+        local_cache.clear()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(SessionStore(session_key=store.session_key)["k"], "v")
+        with self.assertNumQueries(0):
+            self.assertEqual(SessionStore(session_key=store.session_key)["k"], "v")
+
+    def test_delete_evicts_cached_session(self):
+        store = SessionStore()
+        store["k"] = "v"
+        store.save()
+        key = store.session_key
+        store.delete()
+
+        self.assertFalse(Session.objects.filter(session_key=key).exists())
+        self.assertNotIn("k", SessionStore(session_key=key))
+
+    @override_settings(SESSION_LOCAL_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        store = SessionStore()
+        store["k"] = "v"
+        store.save()
+        with self.assertNumQueries(1):
+            SessionStore(session_key=store.session_key)["k"]
+
+
+class SessionSweepTests(TestCase):
+    def _make_sessions(self, count, expired):
+        delta = timedelta(days=-1 if expired else 1)
+        Session.objects.bulk_create(
+            Session(
+                session_key=f"{'old' if expired else 'new'}{i:037d}",
+                session_data="",
+                expire_date=timezone.now() + delta,
+            )
+            for i in range(count)
+        )
+
+    def test_sweep_deletes_only_expired_sessions_in_batches(self):
+        self._make_sessions(7, expired=True)
+        self._make_sessions(2, expired=False)
+
+        self.assertEqual(clear_expired_sessions(batch_size=3, max_batches=2), 6)
+        self.assertEqual(Session.objects.count(), 3)
+
+        self.assertEqual(SessionStore.clear_expired(batch_size=3), 1)
+        self.assertEqual(Session.objects.count(), 2)
+
+    def test_sweep_keeps_a_session_renewed_after_the_select(self):
+        self._make_sessions(2, expired=True)
+        renewed = Session.objects.order_by("session_key").first().session_key
+        select_then_delete = Session.objects.filter
+
+        def filter(*args, **kwargs):
+            if "session_key__in" in kwargs:
+                Session.objects.filter(session_key=renewed).update(expire_date=timezone.now() + timedelta(days=1))
+            return select_then_delete(*args, **kwargs)
+
+        with mock.patch.object(Session.objects, "filter", side_effect=filter):
+            self.assertEqual(clear_expired_sessions(), 1)
+        self.assertTrue(Session.objects.filter(session_key=renewed).exists())
@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from config.sqlite import WriteQueue, single_writer, write_queue
+from suppliers.models import ProductBatch
+
+
+User = get_user_model()
+
+
+class WriteQueueTests(SimpleTestCase):
+    def test_writers_take_turns_in_arrival_order(self):
+        queue = WriteQueue()
+        order, active, overlaps = [], [], []
+
+        def writer(name, arrived):
+            with queue.turn():
+                arrived.set()
+                active.append(name)
+                overlaps.append(len(active))
+                time.sleep(0.01)
+                order.append(name)
+                active.remove(name)
+
+        threads = []
+        for name in range(5):
+            arrived = threading.Event()
+            thread = threading.Thread(target=writer, args=(name, arrived))
+            thread.start()
+            threads.append(thread)
+            # let this thread take its ticket before the next one starts
+            while queue.waiting <= name and not arrived.is_set():
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+        self.assertEqual(max(overlaps), 1)
+
+    def test_turn_is_reentrant(self):
+        queue = WriteQueue()
+        with queue.turn():
+            with queue.turn():
+                pass
+        self.assertEqual(queue.waiting, 0)
+
+
+@override_settings(SQLITE_PRODUCTION=True, SQLITE_WRITE_RETRIES=4)
+class SingleWriterTests(TransactionTestCase):
+    def _flaky(self, failures, message="database is locked"):
+        calls = []
+
+        @single_writer
+        def write():
+            calls.append(connection.in_atomic_block)
+            if len(calls) <= failures:
+                raise OperationalError(message)
+            return "done"
+
+        return write, calls
+
+    @mock.patch("config.sqlite.time.sleep")
+    def test_lock_errors_are_retried_in_a_fresh_transaction(self, sleep):
+        write, calls = self._flaky(failures=2)
+        self.assertEqual(write(), "done")
+        self.assertEqual(calls, [True, True, True])
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch("config.sqlite.time.sleep")
+    def test_gives_up_after_configured_attempts(self, sleep):
+        write, calls = self._flaky(failures=10)
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 4)
+
+    def test_other_errors_are_not_retried(self):
+        write, calls = self._flaky(failures=1, message="no such table: x")
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(SQLITE_PRODUCTION=False)
+    def test_disabled_mode_calls_straight_through(self):
+        write, calls = self._flaky(failures=0)
+        write()
+        self.assertEqual(calls, [False])
+
+
+@override_settings(SQLITE_PRODUCTION=True)
+class QueuedEndpointTests(TestCase):
+    def test_process_brin_runs_through_the_queue(self):
+        supplier = User.objects.create_user(username="supplier")
+        batch = ProductBatch.objects.create(
+            supplier=supplier,
+            batch_code="SAFE-1",
+            product_name="Tuna",
+            quantity=10,
+            qc_status="submitted",
+            brin_request_payload={"batch_code": "SAFE-1"},
+        )
+        client = APIClient()
+        client.force_authenticate(user=supplier)
+        with mock.patch.object(write_queue, "turn", wraps=write_queue.turn) as turn:
+            response = client.post(f"/api/supplier/batches/{batch.pk}/process-brin/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(turn.call_count, 1)
+        batch.refresh_from_db()
+        self.assertEqual(batch.qc_status, "brin_verified_pass")
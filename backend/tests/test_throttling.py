@@ -0,0 +1,100 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from buyers.models import BuyerProfile, BuyerRequirement
+from config.throttling import TokenBucketThrottle
+
+
+User = get_user_model()
+
+REGISTER_URL = "/api/auth/register/"
+
+
+@override_settings(THROTTLE_BUCKETS={"user": (10, 1.0), "ip": (12, 2.0)})
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        clock = mock.patch.object(TokenBucketThrottle, "timer", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.client = APIClient()
+
+    def _register(self):
+        # invalid payloads still pay for the request
+        return self.client.post(REGISTER_URL, {}, format="json")
+
+    def test_costed_endpoint_returns_429_with_retry_after_then_refills(self):
+        self.assertEqual(self._register().status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._register().status_code, status.HTTP_400_BAD_REQUEST)
+
+        limited = self._register()
+        self.assertEqual(limited.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # 2 tokens left, 5 needed at 2 tokens/s
+        self.assertEqual(limited["Retry-After"], "2")
+
+        self.now += 1.5
+        self.assertEqual(self._register().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_endpoints_without_a_cost_are_not_throttled(self):
+        for _ in range(30):
+            self.assertEqual(self.client.get("/api/buyer/marketplace/").status_code, status.HTTP_200_OK)
+
+    def test_user_scope_is_per_user(self):
+        requirements = []
+        clients = []
+        for name in ("first", "second"):
+            buyer = User.objects.create_user(username=name)
+            BuyerProfile.objects.create(user=buyer, organization="Org", country="JP")
+            requirements.append(
+                BuyerRequirement.objects.create(
+                    buyer=buyer,
+                    product_type="tuna",
+                    min_volume=100,
+                    shipping_window_start=date(2025, 6, 1),
+                    shipping_window_end=date(2025, 6, 10),
+                )
+            )
+            client = APIClient()
+            client.force_authenticate(user=buyer)
+            clients.append(client)
+
+        first_url = f"/api/buyer/requirements/{requirements[0].pk}/matches/"
+        second_url = f"/api/buyer/requirements/{requirements[1].pk}/matches/"
+        self.assertEqual(clients[0].get(first_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(clients[0].get(first_url).status_code, status.HTTP_200_OK)
+        limited = clients[0].get(first_url)
+        self.assertEqual(limited.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # user bucket is empty and refills at 1 token/s
+        self.assertEqual(limited["Retry-After"], "5")
+
+        self.now += 6  # the shared IP bucket (12 tokens, 2/s) has room again
+        self.assertEqual(clients[1].get(second_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(clients[0].get(first_url).status_code, status.HTTP_200_OK)
+
+    @override_settings(THROTTLE_BUCKETS={"user": (10, 1.0), "ip": (100, 2.0)})
+    def test_a_refusal_in_one_scope_charges_no_other(self):
+        buyer = User.objects.create_user(username="buyer")
+        BuyerProfile.objects.create(user=buyer, organization="Org", country="JP")
+        requirement = BuyerRequirement.objects.create(
+            buyer=buyer,
+            product_type="tuna",
+            min_volume=100,
+            shipping_window_start=date(2025, 6, 1),
+            shipping_window_end=date(2025, 6, 10),
+        )
+        self.client.force_authenticate(user=buyer)
+        url = f"/api/buyer/requirements/{requirement.pk}/matches/"
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        ip_balance = cache.get("throttle:ip:127.0.0.1")
+        self.assertEqual(ip_balance, (90, self.now))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(cache.get("throttle:ip:127.0.0.1"), ip_balance)
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import AuthToken, UserProfile
+from accounts.sessions import local_cache
+from accounts.users import cache_key, cached_user
+from buyers.models import BuyerProfile
+
+
+User = get_user_model()
+
+REQUIREMENTS_URL = "/api/buyer/requirements/"
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.user = User.objects.create_user(username="cachedbuyer", password="pass12345")
+        UserProfile.objects.create(user=self.user, role="buyer", identity_type="ID_CARD")
+        BuyerProfile.objects.create(user=self.user, organization="Cache Org", country="JP")
+        self.client = APIClient()
+
+    def _user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(REQUIREMENTS_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return [query["sql"] for query in queries if '"auth_user"' in query["sql"]]
+
+    def test_session_user_is_loaded_joined_once_then_cached(self):
+        self.client.force_login(self.user)
+
+        first = self._user_queries()
+        self.assertEqual(len(first), 1)
+        self.assertIn('"buyers_buyerprofile"', first[0])
+        self.assertIn('"exporter_exporterprofile"', first[0])
+        self.assertEqual(self._user_queries(), [])
+
+    def test_missing_profiles_are_remembered(self):
+        user = cached_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.profile.role, "buyer")
+            self.assertTrue(hasattr(user, "buyer_profile"))
+            self.assertFalse(hasattr(user, "exporter_profile"))
+
+    def test_profile_and_user_saves_invalidate(self):
+        cached_user(self.user.pk)
+        BuyerProfile.objects.get(user=self.user).delete()
+        self.assertIsNone(cache.get(cache_key(self.user.pk)))
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(REQUIREMENTS_URL).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertIn(
+            self.client.get(REQUIREMENTS_URL).status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+    def test_cache_holds_no_password_hash(self):
+        cached_user(self.user.pk)
+        self.assertNotIn(self.user.password, repr(cache.get(cache_key(self.user.pk))))
+
+        user = cached_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_session_auth_hash(), self.user.get_session_auth_hash())
+        user.first_name = "Renamed"
+        user.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Renamed")
+        self.assertTrue(self.user.check_password("pass12345"))
+
+    def test_sessions_from_the_plain_model_backend_still_resolve(self):
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(REQUIREMENTS_URL).status_code, status.HTTP_200_OK)
+
+    def test_failed_login_runs_the_hasher_once(self):
+        hasher = type(get_hasher())
+        for username in ("cachedbuyer", "nobody"):
+            with mock.patch.object(hasher, "encode", autospec=True, side_effect=hasher.encode) as encode:
+                self.assertIsNone(authenticate(username=username, password="wrong"))
+            self.assertEqual(encode.call_count, 1)
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        cached_user(self.user.pk)
+        self.assertIsNone(cache.get(cache_key(self.user.pk)))
+
+    def test_bearer_token_joins_profiles_into_token_lookup(self):
+        _, key = AuthToken.issue(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {key}")
+        with self.assertNumQueries(2):
+            # token + user + profiles, count (empty page); the role check is free
+            response = self.client.get(REQUIREMENTS_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1,122 +1,138 @@
-import copy
 import json
-import os
-
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
-
-import django  # noqa: E402
-from django.conf import settings  # noqa: E402
-from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
-from django.test import Client, override_settings  # noqa: E402
-
-django.setup()
-
-import pytest  # noqa: E402
-
-from user_settings.views import DEMO_USER  # noqa: E402
-
-
-@pytest.fixture(autouse=True)
-def reset_demo_user():
-    snapshot = copy.deepcopy(DEMO_USER)
-    try:
-        yield
-    finally:
-        DEMO_USER.clear()
-        DEMO_USER.update(copy.deepcopy(snapshot))
-
-
-@pytest.fixture(autouse=True)
-def allow_test_host():
-    original = list(settings.ALLOWED_HOSTS)
-    if "testserver" not in settings.ALLOWED_HOSTS:
-        settings.ALLOWED_HOSTS.append("testserver")
-    yield
-    settings.ALLOWED_HOSTS = original
-
-
-def test_user_view_get_returns_demo_payload():
-    client = Client()
-    response = client.get("/api/user/")
-    assert response.status_code == 200
-    body = response.json()
-    assert "user" in body
-    assert body["user"]["email"] == DEMO_USER["email"]
-
-
-def test_user_view_put_updates_demo_payload():
-    client = Client()
-    payload = {"user": {"name": "New Demo", "notes": "Updated"}}
-    response = client.put(
-        "/api/user/",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
-    assert response.status_code == 200
-    assert response.json()["user"]["name"] == "New Demo"
-    assert DEMO_USER["name"] == "New Demo"
-    assert DEMO_USER["notes"] == "Updated"
-
-
-def test_change_password_view_handles_success_and_failure():
-    client = Client()
-    bad = client.post(
-        "/api/change-password/",
-        data=json.dumps({"currentPassword": "wrong", "newPassword": "abc"}),
-        content_type="application/json",
-    )
-    assert bad.status_code == 401
-    good = client.post(
-        "/api/change-password/",
-        data=json.dumps({"currentPassword": "oldpass", "newPassword": "abc"}),
-        content_type="application/json",
-    )
-    assert good.status_code == 200
-    assert good.json()["success"] is True
-
-
-def test_profile_view_get_and_put_roundtrip():
-    client = Client()
-    response = client.get("/api/profile/")
-    assert response.status_code == 200
-    assert response.json()["profile"]["email"] == DEMO_USER["email"]
-
-    payload = {"profile": {"phone": "+62 800-1111"}}
-    update = client.put(
-        "/api/profile/",
-        data=json.dumps(payload),
-        content_type="application/json",
-    )
-    assert update.status_code == 200
-    assert update.json()["profile"]["phone"] == "+62 800-1111"
-    assert DEMO_USER["phone"] == "+62 800-1111"
-
-
-def test_user_view_put_invalid_payload_returns_400():
-    client = Client()
-    response = client.put(
-        "/api/user/",
-        data="[]",
-        content_type="application/json",
-    )
-    assert response.status_code == 400
-
-
-def test_profile_photo_upload_and_missing_file(tmp_path):
-    uploads = tmp_path / "uploads"
-    uploads.mkdir()
-    media_root = tmp_path
-
-    @override_settings(MEDIA_ROOT=str(media_root), MEDIA_URL="/media/")
-    def run_upload():
-        client = Client()
-        upload = SimpleUploadedFile("avatar.png", b"fake-bytes", content_type="image/png")
-        response = client.post("/api/profile/photo/", {"file": upload})
-        assert response.status_code == 200
-        assert response.json()["photoUrl"].startswith("/media/")
-        assert DEMO_USER["photoUrl"].startswith("/media/")
-
-        missing = client.post("/api/profile/photo/", {})
-        assert missing.status_code == 400
-
-    run_upload()
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from user_settings import store
+from user_settings.models import UserSettings
+from user_settings.store import DEMO_DEFAULTS, get_settings, merge_patch, update_settings
+
+
+User = get_user_model()
+
+
+@override_settings(ALLOWED_HOSTS=["testserver"])
+class UserSettingsViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _put(self, url, payload):
+        return self.client.put(url, data=json.dumps(payload), content_type="application/json")
+
+    def test_user_view_get_returns_demo_payload(self):
+        response = self.client.get("/api/user/")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertIn("user", body)
+        self.assertEqual(body["user"]["email"], DEMO_DEFAULTS["email"])
+
+    def test_user_view_put_updates_persisted_document(self):
+        response = self._put("/api/user/", {"user": {"name": "New Demo", "notes": "Updated"}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"]["name"], "New Demo")
+
+        stored = UserSettings.objects.get(key="demo").data
+        self.assertEqual(stored["name"], "New Demo")
+        self.assertEqual(stored["notes"], "Updated")
+        self.assertEqual(stored["company"], DEMO_DEFAULTS["company"])
+
+    def test_put_merges_nested_objects_and_null_removes_keys(self):
+        self._put(
+            "/api/user/",
+            {"certifications": {"ASC": True}, "bankName": None},
+        )
+        document = self.client.get("/api/user/").json()["user"]
+        self.assertEqual(document["certifications"], {"HACCP": True, "ASC": True, "BAP": True})
+        self.assertNotIn("bankName", document)
+
+    def test_steady_state_get_does_not_query_database(self):
+        self.client.get("/api/user/")
+        with self.assertNumQueries(0):
+            self.client.get("/api/user/")
+
+        # a write invalidates the cached copy; the next read sees it
+        self._put("/api/user/", {"phone": "+62 811"})
+        self.assertEqual(self.client.get("/api/user/").json()["user"]["phone"], "+62 811")
+
+    def test_stale_read_miss_does_not_overwrite_a_fresher_entry(self):
+        load_row = store._load_row
+        raced = []
+
+        def load_then_race(user, **kwargs):
+            row = load_row(user, **kwargs)
+            if not raced:
+                # an update commits after this reader loaded the old row
+                raced.append(True)
+                with self.captureOnCommitCallbacks(execute=True):
+                    update_settings(None, {"notes": "fresh"})
+            return row
+
+        with mock.patch.object(store, "_load_row", side_effect=load_then_race):
+            self.assertEqual(get_settings()["notes"], DEMO_DEFAULTS["notes"])
+        self.assertEqual(get_settings()["notes"], "fresh")
+
+    def test_documents_are_per_user(self):
+        user = User.objects.create_user(username="sari", email="sari@example.com", password="x")
+        self.client.force_login(user)
+        self._put("/api/user/", {"company": "CV. Sari Laut"})
+        self.client.logout()
+
+        self.assertEqual(get_settings(user)["company"], "CV. Sari Laut")
+        self.assertEqual(get_settings(user)["email"], "sari@example.com")
+        self.assertEqual(self.client.get("/api/user/").json()["user"]["company"], DEMO_DEFAULTS["company"])
+
+    def test_user_view_put_invalid_payload_returns_400(self):
+        response = self.client.put("/api/user/", data="[]", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_change_password_view_handles_success_and_failure(self):
+        bad = self.client.post(
+            "/api/change-password/",
+            data=json.dumps({"currentPassword": "wrong", "newPassword": "abc"}),
+            content_type="application/json",
+        )
+        self.assertEqual(bad.status_code, 401)
+        good = self.client.post(
+            "/api/change-password/",
+            data=json.dumps({"currentPassword": "oldpass", "newPassword": "abc"}),
+            content_type="application/json",
+        )
+        self.assertEqual(good.status_code, 200)
+        self.assertIs(good.json()["success"], True)
+
+    def test_profile_view_get_and_put_roundtrip(self):
+        response = self.client.get("/api/profile/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["profile"]["email"], DEMO_DEFAULTS["email"])
+
+        update = self._put("/api/profile/", {"profile": {"phone": "+62 800-1111"}})
+        self.assertEqual(update.status_code, 200)
+        self.assertEqual(update.json()["profile"]["phone"], "+62 800-1111")
+        self.assertEqual(get_settings()["phone"], "+62 800-1111")
+
+    def test_profile_photo_upload_and_missing_file(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media_root, MEDIA_URL="/media/"):
+            upload = SimpleUploadedFile("avatar.png", b"fake-bytes", content_type="image/png")
+            response = self.client.post("/api/profile/photo/", {"file": upload})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()["photoUrl"].startswith("/media/"))
+            self.assertTrue(get_settings()["photoUrl"].startswith("/media/"))
+
+            missing = self.client.post("/api/profile/photo/", {})
+            self.assertEqual(missing.status_code, 400)
+
+
+class MergePatchTests(TestCase):
+    def test_merge_patch_follows_rfc_7386(self):
+        target = {"a": "b", "c": {"d": "e", "f": "g"}}
+        patch = {"a": "z", "c": {"f": None}}
+        self.assertEqual(merge_patch(target, patch), {"a": "z", "c": {"d": "e"}})
+        self.assertEqual(merge_patch({"a": [1]}, {"a": [2]}), {"a": [2]})
+        self.assertEqual(target["c"], {"d": "e", "f": "g"})
@@ -0,0 +1,228 @@
+import json
+import socket
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from buyers.models import BatchMarketInfo, BuyerRequirement
+from exporter.models import Deal
+from suppliers.models import ProductBatch
+from webhooks.delivery import (
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    deliver_pending,
+    verify_signature,
+)
+from webhooks.models import OutboxEvent, WebhookEndpoint
+from webhooks.outbox import BATCH_VERIFIED, DEAL_STATUS_CHANGED
+
+
+User = get_user_model()
+
+
+class StubReceiver:
+    """Local HTTP server that records webhook POSTs and answers ``status``."""
+
+    def __init__(self):
+        self.requests = []
+        self.status = 200
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((dict(self.headers), body))
+                self.send_response(receiver.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# the stub receiver is plain http on loopback
+@override_settings(
+    DEBUG=True,
+    WEBHOOK_ALLOW_PRIVATE_ADDRESSES=True,
+    WEBHOOK_BACKOFF_BASE_SECONDS=10,
+    WEBHOOK_MAX_ATTEMPTS=2,
+)
+class WebhookOutboxTests(TestCase):
+    def setUp(self):
+        self.receiver = StubReceiver()
+        self.addCleanup(self.receiver.close)
+        self.client = APIClient()
+        self.supplier = User.objects.create_user(username="supplier")
+        self.buyer = User.objects.create_user(username="buyer")
+        self.exporter = User.objects.create_user(username="exporter")
+        self.endpoint = WebhookEndpoint.objects.create(user=self.buyer, url=self.receiver.url)
+
+        self.batch = ProductBatch.objects.create(
+            supplier=self.supplier,
+            batch_code="SAFE-HOOK-1",
+            product_name="Shrimp",
+            quantity=500,
+            qc_status="submitted",
+            brin_request_payload={"batch_code": "SAFE-HOOK-1"},
+        )
+        BatchMarketInfo.objects.create(
+            batch=self.batch,
+            species="Shrimp",
+            ready_date=date(2025, 5, 10),
+            contaminant_mercury_ppm=Decimal("0.1"),
+        )
+        self.requirement = BuyerRequirement.objects.create(
+            buyer=self.buyer,
+            product_type="shrimp",
+            max_volume=1000,
+            allowed_contaminants={"mercury": 0.3},
+            shipping_window_start=date(2025, 5, 1),
+            shipping_window_end=date(2025, 5, 31),
+        )
+
+    def test_process_brin_writes_outbox_rows_for_matching_buyers(self):
+        self.client.force_authenticate(user=self.supplier)
+        response = self.client.post(f"/api/supplier/batches/{self.batch.pk}/process-brin/")
+        self.assertEqual(response.status_code, 200)
+
+        event = OutboxEvent.objects.get()
+        self.assertEqual((event.endpoint, event.event_type), (self.endpoint, BATCH_VERIFIED))
+        self.assertEqual(event.payload["requirement_id"], self.requirement.pk)
+        self.assertEqual(event.payload["batch_code"], "SAFE-HOOK-1")
+        self.assertEqual(self.receiver.requests, [])
+
+    def test_deal_status_change_is_queued_for_both_parties(self):
+        exporter_hook = WebhookEndpoint.objects.create(
+            user=self.exporter, url=self.receiver.url, event_types=[DEAL_STATUS_CHANGED]
+        )
+        deal = Deal.objects.create(
+            exporter=self.exporter,
+            buyer_requirement=self.requirement,
+            product_batch=self.batch,
+            quantity=Decimal("100"),
+            total_price=Decimal("1000"),
+        )
+        self.client.force_authenticate(user=self.exporter)
+        response = self.client.post(
+            f"/api/exporter/deals/{deal.pk}/update_status/", {"status": "buyer_approved"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        events = OutboxEvent.objects.order_by("endpoint_id")
+        self.assertEqual([e.endpoint for e in events], [self.endpoint, exporter_hook])
+        self.assertEqual(events[0].payload["from"], "pending")
+        self.assertEqual(events[0].payload["to"], "buyer_approved")
+
+    def test_delivery_batches_per_endpoint_and_signs_the_body(self):
+        for n in range(3):
+            OutboxEvent.objects.create(
+                endpoint=self.endpoint,
+                event_type=BATCH_VERIFIED,
+                payload={"n": n},
+                next_attempt_at=timezone.now(),
+            )
+
+        stats = deliver_pending()
+
+        self.assertEqual(stats, {"delivered": 3, "retrying": 0, "failed": 0})
+        self.assertEqual(len(self.receiver.requests), 1)
+        headers, body = self.receiver.requests[0]
+        self.assertTrue(
+            verify_signature(
+                self.endpoint.secret, headers[TIMESTAMP_HEADER], body, headers[SIGNATURE_HEADER]
+            )
+        )
+        self.assertFalse(
+            verify_signature("wrong", headers[TIMESTAMP_HEADER], body, headers[SIGNATURE_HEADER])
+        )
+        self.assertEqual([e["data"]["n"] for e in json.loads(body)["events"]], [0, 1, 2])
+        self.assertEqual(
+            OutboxEvent.objects.filter(status=OutboxEvent.STATUS_DELIVERED).count(), 3
+        )
+
+    def test_failed_delivery_backs_off_then_gives_up(self):
+        self.receiver.status = 503
+        event = OutboxEvent.objects.create(
+            endpoint=self.endpoint,
+            event_type=BATCH_VERIFIED,
+            payload={},
+            next_attempt_at=timezone.now(),
+        )
+
+        self.assertEqual(deliver_pending()["retrying"], 1)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts, event.last_error), ("pending", 1, "HTTP 503"))
+        self.assertGreater(event.next_attempt_at, timezone.now() + timedelta(seconds=5))
+        # not due yet, so nothing is sent
+        self.assertEqual(deliver_pending(), {"delivered": 0, "retrying": 0, "failed": 0})
+
+        OutboxEvent.objects.filter(pk=event.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_pending()["failed"], 1)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ("failed", 2))
+        self.assertEqual(len(self.receiver.requests), 2)
+
+    def test_endpoints_are_managed_per_user(self):
+        self.client.force_authenticate(user=self.exporter)
+        response = self.client.post(
+            "/api/webhooks/endpoints/",
+            {"url": "https://erp.example.com/hooks", "event_types": [DEAL_STATUS_CHANGED]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data["secret"])
+        listing = self.client.get("/api/webhooks/endpoints/")
+        self.assertEqual([row["url"] for row in listing.data], ["https://erp.example.com/hooks"])
+
+
+def resolves_to(*addresses):
+    infos = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (a, 443)) for a in addresses]
+    return mock.patch("webhooks.delivery.socket.getaddrinfo", return_value=infos)
+
+
+class WebhookDestinationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _register(self, url):
+        return self.client.post("/api/webhooks/endpoints/", {"url": url}, format="json")
+
+    def test_only_public_https_urls_are_accepted(self):
+        with resolves_to("93.184.216.34"):
+            self.assertEqual(self._register("https://erp.example.com/hooks").status_code, 201)
+            self.assertEqual(self._register("http://erp.example.com/hooks").status_code, 400)
+        for address in ["127.0.0.1", "10.0.0.5", "169.254.169.254", "::ffff:127.0.0.1"]:
+            with self.subTest(address=address), resolves_to("93.184.216.34", address):
+                response = self._register("https://internal.example.com/hooks")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("url", response.data)
+
+    def test_delivery_refuses_a_host_that_now_resolves_internally(self):
+        endpoint = WebhookEndpoint.objects.create(user=self.user, url="https://erp.example.com/hooks")
+        event = OutboxEvent.objects.create(
+            endpoint=endpoint, event_type=BATCH_VERIFIED, payload={}, next_attempt_at=timezone.now()
+        )
+        pool = mock.Mock()
+        with resolves_to("10.1.2.3"):
+            self.assertEqual(deliver_pending(pool=pool)["retrying"], 1)
+        pool.request.assert_not_called()
+        event.refresh_from_db()
+        self.assertTrue(event.last_error.startswith("Refused:"))
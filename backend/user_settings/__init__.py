@@ -1 +1 @@
-# Django app: user_settings (stub)
+# Django app: user_settings
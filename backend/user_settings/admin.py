@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# No models defined for the stub. This file exists so the app can be registered and extended later.
+from .models import UserSettings
+
+
+@admin.register(UserSettings)
+class UserSettingsAdmin(admin.ModelAdmin):
+    list_display = ("key", "user", "schema_version", "updated_at")
+    search_fields = ("key", "user__username")
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import models
+
+
+class UserSettings(models.Model):
+    """Per-user settings document (the JSON the settings page edits).
+
+    ``key`` is ``"user:<id>"`` for signed-in users and ``"demo"`` for the
+    shared anonymous demo document. ``schema_version`` lets stored documents
+    be upgraded lazily when the shape changes (see ``store.upgrade_document``).
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="settings_document",
+        null=True,
+        blank=True,
+    )
+    schema_version = models.PositiveSmallIntegerField(default=1)
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "user settings"
+
+    def __str__(self):
+        return f"Settings {self.key} (v{self.schema_version})"
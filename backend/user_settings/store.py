@@ -0,0 +1,171 @@
+"""Persistent per-user settings with a write-through cache.
+
+Documents live in ``UserSettings`` rows; reads are served from the Django
+cache (shared between workers when ``CACHES`` points at Redis), so a
+steady-state GET never touches the database. Updates lock the row, apply a
+JSON merge patch (RFC 7386: nested objects merge, ``null`` deletes a key),
+commit, and then refresh the cache entry.
+
+A read miss fills the cache with ``cache.add`` so a reader that loaded the
+row before a concurrent update cannot overwrite the fresher entry, and every
+entry expires after ``USER_SETTINGS_CACHE_TTL`` seconds so any stale copy
+that does slip through ages out.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UserSettings
+
+SCHEMA_VERSION = 1
+
+# Seed for the shared anonymous demo document.
+DEMO_DEFAULTS = {
+    "id": 1,
+    "name": "Dwi Santoso",
+    "email": "dwi@example.com",
+    "company": "UD. SeaHarvest",
+    "companyWebsite": "https://www.seaharvest.example",
+    "registrationNumber": "SIUP-2025-0001",
+    "taxId": "NPWP-01-23456789",
+    "businessType": "Shrimp Producer",
+    "yearsInBusiness": 12,
+    "annualVolumeTons": 250,
+    "phone": "+62 812-3456-7890",
+    "address": "Jl. Pantai No. 10, Surabaya",
+    "warehouseAddress": "Jl. Gudang No. 2, Surabaya",
+    "region": "East Java",
+    "farmLocation": "Banyuwangi",
+    "contactPerson": {"name": "Asep Rahmat", "phone": "+62 812-9988-7766", "email": "asep@seaharvest.example"},
+    # Certifications used by settings form
+    "certifications": {"HACCP": True, "ASC": False, "BAP": True},
+    # Certification dates (optional)
+    "certificationDates": {"HACCP": "2023-06-01", "BAP": "2022-11-15"},
+    # Payment / shipping preferences
+    "preferredPayment": "T/T",
+    "paymentTerms": "Net 30",
+    "preferredIncoterm": "FOB",
+    # The frontend uses a comma-separated input for preferred ports; provide a string
+    "preferredPorts": "Surabaya,Jakarta",
+    # Packaging specs
+    "packaging": {"type": "Insulated box", "kgPerBox": 10},
+    # Notification preferences
+    "notifyEmail": True,
+    "notifySMS": False,
+    # Masked bank account shown in settings (frontend renders as text)
+    "bankAccountMasked": "**** **** **** 1234",
+    "bankName": "Bank Nusantara",
+    # QC thresholds used by the settings form
+    "qcThresholds": {"mercury": 0.5, "antibiotics": 0.01},
+    # Contacts for quality/lab
+    "qualityManager": {"name": "Siti Aminah", "email": "siti@seaharvest.example"},
+    "labContact": {"name": "Lab PT. AquaTest", "phone": "+62 21-5566-7788"},
+    # API / integration tokens (masked)
+    "apiKeyMasked": "sk_****_abcd1234",
+    # Misc
+    "notes": "Demo account",
+}
+
+
+# {from_version: callable(data) -> data}; each step upgrades by one version.
+UPGRADES: dict[int, Any] = {}
+
+
+class InvalidSettings(ValueError):
+    pass
+
+
+def settings_key(user) -> str:
+    if user is not None and getattr(user, "is_authenticated", False):
+        return f"user:{user.pk}"
+    return "demo"
+
+
+def _cache_key(key: str) -> str:
+    return f"user_settings:v{SCHEMA_VERSION}:{key}"
+
+
+def _cache_ttl() -> int:
+    return getattr(settings, "USER_SETTINGS_CACHE_TTL", 300)
+
+
+def _initial_document(user) -> dict[str, Any]:
+    if user is None or not getattr(user, "is_authenticated", False):
+        return copy.deepcopy(DEMO_DEFAULTS)
+    return {
+        "id": user.pk,
+        "name": user.get_full_name() or user.get_username(),
+        "email": user.email,
+    }
+
+
+def upgrade_document(data: dict[str, Any], version: int) -> dict[str, Any]:
+    while version < SCHEMA_VERSION:
+        data = UPGRADES[version](data)
+        version += 1
+    return data
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7386 JSON merge patch and return the result."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for name, value in patch.items():
+        if value is None:
+            result.pop(name, None)
+        else:
+            result[name] = merge_patch(result.get(name), value)
+    return result
+
+
+def _load_row(user, *, for_update: bool = False) -> UserSettings:
+    key = settings_key(user)
+    queryset = UserSettings.objects.select_for_update() if for_update else UserSettings.objects
+    row, _ = queryset.get_or_create(
+        key=key,
+        defaults={
+            "user": user if key != "demo" else None,
+            "schema_version": SCHEMA_VERSION,
+            "data": _initial_document(user),
+        },
+    )
+    if row.schema_version < SCHEMA_VERSION:
+        row.data = upgrade_document(row.data, row.schema_version)
+        row.schema_version = SCHEMA_VERSION
+        if for_update:
+            row.save(update_fields=["data", "schema_version", "updated_at"])
+    return row
+
+
+def get_settings(user=None) -> dict[str, Any]:
+    key = settings_key(user)
+    data = cache.get(_cache_key(key))
+    if data is None:
+        data = _load_row(user).data
+        # add, not set: a concurrent update's fresher entry wins
+        cache.add(_cache_key(key), data, timeout=_cache_ttl())
+    return data
+
+
+def update_settings(user, patch: dict[str, Any]) -> dict[str, Any]:
+    if not isinstance(patch, dict):
+        raise InvalidSettings("settings patch must be an object")
+    key = settings_key(user)
+    with transaction.atomic():
+        row = _load_row(user, for_update=True)
+        row.data = merge_patch(row.data, patch)
+        row.save(update_fields=["data", "schema_version", "updated_at"])
+        # drop the old entry now; write the new one only once committed
+        cache.delete(_cache_key(key))
+        data = row.data
+        transaction.on_commit(
+            lambda: cache.set(_cache_key(key), data, timeout=_cache_ttl())
+        )
+    return row.data
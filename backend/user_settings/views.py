@@ -1,68 +1,38 @@
 from django.http import JsonResponse, HttpResponseBadRequest, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
-import os
-from django.conf import settings
+import posixpath
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
-
-# Simple in-memory demo user data for the stub backend
-DEMO_USER = {
-    "id": 1,
-    "name": "Dwi Santoso",
-    "email": "dwi@example.com",
-    "company": "UD. SeaHarvest",
-    "companyWebsite": "https://www.seaharvest.example",
-    "registrationNumber": "SIUP-2025-0001",
-    "taxId": "NPWP-01-23456789",
-    "businessType": "Shrimp Producer",
-    "yearsInBusiness": 12,
-    "annualVolumeTons": 250,
-    "phone": "+62 812-3456-7890",
-    "address": "Jl. Pantai No. 10, Surabaya",
-    "warehouseAddress": "Jl. Gudang No. 2, Surabaya",
-    "region": "East Java",
-    "farmLocation": "Banyuwangi",
-    "contactPerson": {"name": "Asep Rahmat", "phone": "+62 812-9988-7766", "email": "asep@seaharvest.example"},
-    # Certifications used by settings form
-    "certifications": {"HACCP": True, "ASC": False, "BAP": True},
-    # Certification dates (optional)
-    "certificationDates": {"HACCP": "2023-06-01", "BAP": "2022-11-15"},
-    # Payment / shipping preferences
-    "preferredPayment": "T/T",
-    "paymentTerms": "Net 30",
-    "preferredIncoterm": "FOB",
-    # The frontend uses a comma-separated input for preferred ports; provide a string
-    "preferredPorts": "Surabaya,Jakarta",
-    # Packaging specs
-    "packaging": {"type": "Insulated box", "kgPerBox": 10},
-    # Notification preferences
-    "notifyEmail": True,
-    "notifySMS": False,
-    # Masked bank account shown in settings (frontend renders as text)
-    "bankAccountMasked": "**** **** **** 1234",
-    "bankName": "Bank Nusantara",
-    # QC thresholds used by the settings form
-    "qcThresholds": {"mercury": 0.5, "antibiotics": 0.01},
-    # Contacts for quality/lab
-    "qualityManager": {"name": "Siti Aminah", "email": "siti@seaharvest.example"},
-    "labContact": {"name": "Lab PT. AquaTest", "phone": "+62 21-5566-7788"},
-    # API / integration tokens (masked)
-    "apiKeyMasked": "sk_****_abcd1234",
-    # Misc
-    "notes": "Demo account — data reset when server restarts",
-}
 
+from accounts.photos import (
+    PhotoTooLarge,
+    check_request_size,
+    check_upload_size,
+    limit_upload_size,
+    max_photo_bytes,
+    schedule_variants,
+    variant_urls,
+)
+
+from .store import get_settings, update_settings
+
+PROFILE_KEYS = ("name", "email", "phone", "photoUrl")
+
+
+def _profile_subset(document):
+    return {key: document.get(key) for key in PROFILE_KEYS}
 
 
 @csrf_exempt
 def user_view(request):
-    """GET returns demo user JSON. PUT accepts JSON and updates the in-memory demo user.
+    """GET returns the settings document of the current user (or the shared demo document
+    when anonymous). PUT merges the JSON body into it (RFC 7386: nested objects merge,
+    null removes a key).
 
-    This is a simple stub for frontend integration and testing.
+    Documents are persisted in UserSettings and read through the cache (see store.py).
     """
     if request.method == "GET":
-        return JsonResponse({"user": DEMO_USER})
+        return JsonResponse({"user": get_settings(request.user)})
 
     if request.method == "PUT":
         try:
@@ -72,10 +42,7 @@ def user_view(request):
             new_user = data.get("user") if isinstance(data, dict) and data.get("user") else data
             if not isinstance(new_user, dict):
                 return HttpResponseBadRequest(json.dumps({"error": "invalid payload"}), content_type="application/json")
-            # Update allowed keys
-            for k, v in new_user.items():
-                DEMO_USER[k] = v
-            return JsonResponse({"user": DEMO_USER})
+            return JsonResponse({"user": update_settings(request.user, new_user)})
         except Exception as e:
             return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
 
@@ -109,13 +76,7 @@ def change_password_view(request):
 def profile_view(request):
     """GET returns a small profile subset. PUT accepts updates (e.g. phone, photoUrl)."""
     if request.method == "GET":
-        profile = {
-            "name": DEMO_USER.get("name"),
-            "email": DEMO_USER.get("email"),
-            "phone": DEMO_USER.get("phone"),
-            "photoUrl": DEMO_USER.get("photoUrl"),
-        }
-        return JsonResponse({"profile": profile})
+        return JsonResponse({"profile": _profile_subset(get_settings(request.user))})
 
     if request.method == "PUT":
         try:
@@ -125,40 +86,43 @@ def profile_view(request):
             if not isinstance(new_profile, dict):
                 return HttpResponseBadRequest(json.dumps({"error": "invalid payload"}), content_type="application/json")
             # update allowed small set
-            for k in ("phone", "photoUrl", "name", "email"):
-                if k in new_profile:
-                    DEMO_USER[k] = new_profile[k]
-            return JsonResponse({"profile": {"name": DEMO_USER.get("name"), "email": DEMO_USER.get("email"), "phone": DEMO_USER.get("phone"), "photoUrl": DEMO_USER.get("photoUrl")}})
+            patch = {k: new_profile[k] for k in PROFILE_KEYS if k in new_profile}
+            document = update_settings(request.user, patch) if patch else get_settings(request.user)
+            return JsonResponse({"profile": _profile_subset(document)})
         except Exception as e:
             return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
 
 
 @csrf_exempt
 def profile_photo_view(request):
-    """Accepts multipart/form-data with a file field 'file'. Saves to MEDIA_ROOT/uploads and returns photoUrl."""
+    """Accepts multipart/form-data with a file field 'file'. Saves to MEDIA_ROOT/uploads and returns photoUrl
+    plus photoVariants (resized thumbnails rendered in the background)."""
     if request.method != "POST":
         return HttpResponse(status=405)
+    too_large = JsonResponse({"error": f"file too large (max {max_photo_bytes()} bytes)"}, status=413)
+    upload_limit = limit_upload_size(request)
     try:
-        # ensure uploads dir exists
-        media_root = getattr(settings, "MEDIA_ROOT", None)
-        media_url = getattr(settings, "MEDIA_URL", "/media/")
-        if not media_root:
-            media_root = os.path.join(settings.BASE_DIR, "media")
-        uploads_dir = os.path.join(media_root, "uploads")
-        os.makedirs(uploads_dir, exist_ok=True)
+        check_request_size(request)
 
         # handle file
         uploaded_file = request.FILES.get("file")
+        if upload_limit.exceeded:
+            raise PhotoTooLarge()
         if not uploaded_file:
             return HttpResponseBadRequest(json.dumps({"error": "no file uploaded"}), content_type="application/json")
+        check_upload_size(uploaded_file)
 
-        filename = default_storage.get_available_name(os.path.join("uploads", uploaded_file.name))
-        path = default_storage.save(filename, ContentFile(uploaded_file.read()))
-        photo_url = media_url + os.path.basename(path)
+        # storage copies the upload chunk by chunk; never read() it into memory
+        path = default_storage.save(posixpath.join("uploads", uploaded_file.name), uploaded_file)
+        photo_url = default_storage.url(path)
+        schedule_variants(default_storage, path)
 
-        # Save to demo user
-        DEMO_USER["photoUrl"] = photo_url
+        # Save to the user's settings document
+        variants = variant_urls(default_storage, path)
+        update_settings(request.user, {"photoUrl": photo_url, "photoVariants": variants})
 
-        return JsonResponse({"photoUrl": photo_url})
+        return JsonResponse({"photoUrl": photo_url, "photoVariants": variants})
+    except PhotoTooLarge:
+        return too_large
     except Exception as e:
         return HttpResponseBadRequest(json.dumps({"error": str(e)}), content_type="application/json")
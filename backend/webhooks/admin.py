@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from .models import OutboxEvent, WebhookEndpoint
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ("url", "user", "is_active", "created_at")
+    list_filter = ("is_active",)
+    search_fields = ("url", "user__username")
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("event_type", "endpoint", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status", "event_type")
+    readonly_fields = ("created_at", "delivered_at")
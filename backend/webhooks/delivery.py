@@ -0,0 +1,239 @@
+"""Drain the outbox: batch per endpoint, sign, POST, retry with backoff.
+
+Receivers verify ``X-IndoXport-Signature`` as
+``sha256=HMAC_SHA256(secret, "<X-IndoXport-Timestamp>." + body)``; see
+``verify_signature``. A request body is ``{"events": [...]}`` and event ids
+are stable across retries, so receivers can de-duplicate.
+
+Endpoint URLs must be https (http only with ``DEBUG``) and resolve to public
+addresses; ``check_destination`` runs when an endpoint is saved through the
+API and again before every delivery, so a hostname re-pointed at an internal
+address later is refused too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import random
+import socket
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import urllib3
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEvent, WebhookEndpoint
+
+SIGNATURE_HEADER = "X-IndoXport-Signature"
+TIMESTAMP_HEADER = "X-IndoXport-Timestamp"
+
+_pool: urllib3.PoolManager | None = None
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def get_pool() -> urllib3.PoolManager:
+    """Process-wide keep-alive connection pool shared by all deliveries."""
+    global _pool
+    if _pool is None:
+        timeout = _setting("WEBHOOK_TIMEOUT_SECONDS", 5)
+        _pool = urllib3.PoolManager(
+            num_pools=_setting("WEBHOOK_POOL_HOSTS", 50),
+            maxsize=_setting("WEBHOOK_DELIVERY_WORKERS", 4),
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            retries=False,
+        )
+    return _pool
+
+
+class UnsafeDestination(ValueError):
+    pass
+
+
+def _is_public(address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    return address.is_global and not (
+        address.is_loopback
+        or address.is_private
+        or address.is_link_local
+        or address.is_reserved
+        or address.is_multicast
+        or address.is_unspecified
+    )
+
+
+def check_destination(url: str) -> None:
+    """Raise ``UnsafeDestination`` unless ``url`` may receive webhooks."""
+    parts = urlsplit(url)
+    schemes = ("https", "http") if settings.DEBUG else ("https",)
+    if parts.scheme not in schemes:
+        raise UnsafeDestination("Webhook URLs must use https.")
+    try:
+        host, port = parts.hostname, parts.port
+    except ValueError:
+        raise UnsafeDestination("Webhook URL has an invalid port.")
+    if not host:
+        raise UnsafeDestination("Webhook URL has no host.")
+    if _setting("WEBHOOK_ALLOW_PRIVATE_ADDRESSES", False):
+        return
+    try:
+        infos = socket.getaddrinfo(host, port or 443, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError):
+        raise UnsafeDestination(f"Could not resolve {host}.")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not _is_public(address):
+            raise UnsafeDestination(f"{host} resolves to a non-public address.")
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    mac = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256)
+    return f"sha256={mac.hexdigest()}"
+
+
+def verify_signature(
+    secret: str, timestamp: str, body: bytes, signature: str, tolerance: int = 300
+) -> bool:
+    try:
+        age = abs(time.time() - int(timestamp))
+    except (TypeError, ValueError):
+        return False
+    return age <= tolerance and hmac.compare_digest(sign(secret, timestamp, body), signature)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter: base * 2**(attempts - 1), capped."""
+    base = _setting("WEBHOOK_BACKOFF_BASE_SECONDS", 30)
+    cap = _setting("WEBHOOK_BACKOFF_MAX_SECONDS", 6 * 60 * 60)
+    delay = min(base * 2 ** max(attempts - 1, 0), cap)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.0))
+
+
+def claim_due_events(batch_size: int, now: datetime) -> list[OutboxEvent]:
+    """Lease due events so concurrent workers don't deliver them twice."""
+    lease = timedelta(seconds=_setting("WEBHOOK_LEASE_SECONDS", 60))
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .select_related("endpoint")
+            .filter(status=OutboxEvent.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        if events:
+            OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+                next_attempt_at=now + lease
+            )
+    return events
+
+
+def _encode(events: list[OutboxEvent]) -> bytes:
+    return json.dumps(
+        {
+            "events": [
+                {
+                    "id": event.pk,
+                    "type": event.event_type,
+                    "created_at": event.created_at.isoformat(),
+                    "data": event.payload,
+                }
+                for event in events
+            ]
+        },
+        separators=(",", ":"),
+    ).encode()
+
+
+def post_events(
+    pool: urllib3.PoolManager, endpoint: WebhookEndpoint, events: list[OutboxEvent]
+) -> str | None:
+    """POST one signed batch; returns an error message, or None on success."""
+    try:
+        check_destination(endpoint.url)
+    except UnsafeDestination as exc:
+        return f"Refused: {exc}"
+    body = _encode(events)
+    timestamp = str(int(time.time()))
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "IndoXport-Webhooks/1",
+        TIMESTAMP_HEADER: timestamp,
+        SIGNATURE_HEADER: sign(endpoint.secret, timestamp, body),
+    }
+    try:
+        response = pool.request("POST", endpoint.url, body=body, headers=headers)
+    except urllib3.exceptions.HTTPError as exc:
+        return f"{type(exc).__name__}: {exc}"
+    if 200 <= response.status < 300:
+        return None
+    return f"HTTP {response.status}"
+
+
+def _chunks(events: list[OutboxEvent], size: int):
+    for start in range(0, len(events), size):
+        yield events[start : start + size]
+
+
+def deliver_pending(
+    batch_size: int | None = None, pool: urllib3.PoolManager | None = None
+) -> dict[str, int]:
+    """Deliver one round of due events. Returns counts for logging."""
+    batch_size = batch_size or _setting("WEBHOOK_BATCH_SIZE", 200)
+    per_request = _setting("WEBHOOK_EVENTS_PER_REQUEST", 50)
+    max_attempts = _setting("WEBHOOK_MAX_ATTEMPTS", 8)
+    pool = pool or get_pool()
+
+    events = claim_due_events(batch_size, timezone.now())
+    by_endpoint: dict[int, list[OutboxEvent]] = defaultdict(list)
+    for event in events:
+        by_endpoint[event.endpoint_id].append(event)
+    requests = [
+        (group[0].endpoint, chunk)
+        for group in by_endpoint.values()
+        for chunk in _chunks(group, per_request)
+    ]
+
+    # only the HTTP calls run on worker threads; the bookkeeping below stays
+    # on this thread and its DB connection
+    workers = max(1, min(_setting("WEBHOOK_DELIVERY_WORKERS", 4), len(requests)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        errors = list(
+            executor.map(lambda request: post_events(pool, *request), requests)
+        )
+
+    now = timezone.now()
+    stats = {"delivered": 0, "retrying": 0, "failed": 0}
+    changed = []
+    for (_endpoint, chunk), error in zip(requests, errors):
+        for event in chunk:
+            event.attempts += 1
+            if error is None:
+                event.status = OutboxEvent.STATUS_DELIVERED
+                event.delivered_at = now
+                event.last_error = ""
+                stats["delivered"] += 1
+            elif event.attempts >= max_attempts:
+                event.status = OutboxEvent.STATUS_FAILED
+                event.last_error = error
+                stats["failed"] += 1
+            else:
+                event.next_attempt_at = now + backoff_delay(event.attempts)
+                event.last_error = error
+                stats["retrying"] += 1
+            changed.append(event)
+    OutboxEvent.objects.bulk_update(
+        changed,
+        ["status", "attempts", "next_attempt_at", "last_error", "delivered_at"],
+        batch_size=500,
+    )
+    return stats
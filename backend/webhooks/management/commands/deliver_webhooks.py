@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from webhooks.delivery import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver pending webhook events from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="keep polling instead of delivering a single round",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="seconds to sleep when a round found nothing to do (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            stats = deliver_pending(options["batch_size"])
+            if any(stats.values()) or not options["loop"]:
+                self.stdout.write(
+                    f"delivered {stats['delivered']}, retrying {stats['retrying']}, "
+                    f"failed {stats['failed']}"
+                )
+            if not options["loop"]:
+                break
+            if not any(stats.values()):
+                time.sleep(options["interval"])
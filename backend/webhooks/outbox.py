@@ -0,0 +1,134 @@
+"""Write webhook events into the outbox.
+
+Call ``enqueue`` inside the transaction that makes the change; nothing
+here talks to the network.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import OutboxEvent, WebhookEndpoint
+
+BATCH_VERIFIED = "batch.verified"
+DEAL_STATUS_CHANGED = "deal.status_changed"
+
+
+def _jsonable(payload: dict[str, Any]) -> dict[str, Any]:
+    # dates and decimals become strings now, not at delivery time
+    return json.loads(json.dumps(payload, cls=DjangoJSONEncoder))
+
+
+def enqueue(
+    user_ids: Iterable[int | None], event_type: str, payload: dict[str, Any]
+) -> list[OutboxEvent]:
+    return enqueue_many([(user_ids, event_type, payload)])
+
+
+def enqueue_many(
+    messages: Iterable[tuple[Iterable[int | None], str, dict[str, Any]]],
+) -> list[OutboxEvent]:
+    """Queue several ``(user_ids, event_type, payload)`` messages in two queries."""
+    messages = [
+        ({user_id for user_id in user_ids if user_id is not None}, event_type, payload)
+        for user_ids, event_type, payload in messages
+    ]
+    all_user_ids = set().union(*(user_ids for user_ids, _, _ in messages))
+    if not all_user_ids:
+        return []
+    endpoints_by_user: dict[int, list[WebhookEndpoint]] = {}
+    for endpoint in WebhookEndpoint.objects.filter(
+        user_id__in=all_user_ids, is_active=True
+    ):
+        endpoints_by_user.setdefault(endpoint.user_id, []).append(endpoint)
+    if not endpoints_by_user:
+        return []
+
+    now = timezone.now()
+    events = []
+    for user_ids, event_type, payload in messages:
+        body = _jsonable(payload)
+        for user_id in user_ids:
+            for endpoint in endpoints_by_user.get(user_id, ()):
+                if endpoint.wants(event_type):
+                    events.append(
+                        OutboxEvent(
+                            endpoint=endpoint,
+                            event_type=event_type,
+                            payload=body,
+                            next_attempt_at=now,
+                        )
+                    )
+    return OutboxEvent.objects.bulk_create(events)
+
+
+def enqueue_batch_verified(batch) -> list[OutboxEvent]:
+    """Tell the buyers whose open requirements a freshly verified batch satisfies."""
+    from buyers.models import BatchMarketInfo
+    from buyers.services import find_requirements_for_batch
+
+    try:
+        info = batch.market_info
+    except BatchMarketInfo.DoesNotExist:
+        return []
+    created = []
+    for requirement in find_requirements_for_batch(info):
+        created += enqueue(
+            [requirement.buyer_id],
+            BATCH_VERIFIED,
+            {
+                "requirement_id": requirement.pk,
+                "batch_id": batch.pk,
+                "batch_code": batch.batch_code,
+                "species": info.species,
+                "ready_date": info.ready_date,
+                "price_per_unit": info.price_per_unit,
+                "verified_at": batch.last_qc_at,
+            },
+        )
+    return created
+
+
+def deal_status_message(
+    deal_id: int,
+    exporter_id: int | None,
+    buyer_id: int | None,
+    requirement_id: int,
+    batch_id: int,
+    previous_status: str,
+    status: str,
+    changed_at,
+) -> tuple[list[int | None], str, dict[str, Any]]:
+    return (
+        [exporter_id, buyer_id],
+        DEAL_STATUS_CHANGED,
+        {
+            "deal_id": deal_id,
+            "requirement_id": requirement_id,
+            "batch_id": batch_id,
+            "from": previous_status,
+            "to": status,
+            "changed_at": changed_at,
+        },
+    )
+
+
+def enqueue_deal_status_changed(deal, previous_status: str) -> list[OutboxEvent]:
+    return enqueue_many(
+        [
+            deal_status_message(
+                deal.pk,
+                deal.exporter_id,
+                deal.buyer_requirement.buyer_id,
+                deal.buyer_requirement_id,
+                deal.product_batch_id,
+                previous_status,
+                deal.status,
+                deal.updated_at,
+            )
+        ]
+    )
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from .delivery import UnsafeDestination, check_destination
+from .models import WebhookEndpoint
+from .outbox import BATCH_VERIFIED, DEAL_STATUS_CHANGED
+
+EVENT_TYPES = [BATCH_VERIFIED, DEAL_STATUS_CHANGED]
+
+
+class WebhookEndpointSerializer(serializers.ModelSerializer):
+    event_types = serializers.ListField(
+        child=serializers.ChoiceField(choices=EVENT_TYPES), required=False
+    )
+
+    class Meta:
+        model = WebhookEndpoint
+        fields = ["id", "url", "secret", "event_types", "is_active", "created_at"]
+        read_only_fields = ["id", "secret", "created_at"]
+
+    def validate_url(self, value):
+        try:
+            check_destination(value)
+        except UnsafeDestination as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
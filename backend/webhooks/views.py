@@ -0,0 +1,17 @@
+from rest_framework import permissions, viewsets
+
+from .models import WebhookEndpoint
+from .serializers import WebhookEndpointSerializer
+
+
+class WebhookEndpointViewSet(viewsets.ModelViewSet):
+    """Register the URLs your own systems want events delivered to."""
+
+    serializer_class = WebhookEndpointSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return WebhookEndpoint.objects.filter(user=self.request.user).order_by("pk")
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)